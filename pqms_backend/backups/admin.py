@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import Backup
+
+@admin.register(Backup)
+class BackupAdmin(admin.ModelAdmin):
+    list_display = ("id","name","status","trigger","engine","database_bytes","media_new_files","started_at","finished_at")
+    list_filter = ("status","trigger")
+    readonly_fields = [f.name for f in Backup._meta.fields]
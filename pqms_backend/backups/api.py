@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import viewsets, routers, status
+from rest_framework.permissions import AllowAny
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+
+from jobs.api import job_accepted
+from . import engine
+from .jobs import backup_queued, enqueue_backup
+from .models import Backup
+from .serializers import BackupSerializer
+
+
+class BackupViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Backup.objects.all().order_by("-started_at")
+    serializer_class = BackupSerializer
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["status","trigger"]
+
+    @action(detail=False, methods=["post"])
+    def run(self, request):
+        if backup_queued():
+            return Response({"detail": "バックアップは既に実行待ちまたは実行中です。"}, status=status.HTTP_409_CONFLICT)
+        return job_accepted(enqueue_backup(trigger="manual"))
+
+    @action(detail=False, methods=["get"])
+    def schedule(self, request):
+        config = request.system_settings
+        last_success = Backup.objects.filter(status="succeeded").order_by("-started_at").first()
+        due = engine.next_due(config.backup_frequency) if config.auto_backup else None
+        return Response({
+            "auto_backup": config.auto_backup,
+            "backup_frequency": config.backup_frequency,
+            "window": settings.BACKUP_WINDOW,
+            "in_window": engine.in_window(),
+            "next_due": (due or timezone.now()) if config.auto_backup else None,
+            "queued": backup_queued(),
+            "last_success": BackupSerializer(last_success).data if last_success else None,
+        })
+
+
+router = routers.DefaultRouter()
+router.register(r"backups", BackupViewSet, basename="backup")
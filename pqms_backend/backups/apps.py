@@ -0,0 +1,2 @@
+from django.apps import AppConfig
+class BackupsConfig(AppConfig): name = 'backups'
@@ -0,0 +1,255 @@
+"""Online backups of the database and MEDIA_ROOT.
+
+A backup is a directory ``BACKUP_DIR/<name>/`` holding the compressed database dump and a
+compressed media manifest (relative path -> size, mtime, sha256). Media files themselves are
+stored once per content hash in ``BACKUP_DIR/media/``, so a run only copies files that are new
+or changed since the previous backup.
+
+Inspectors keep working while a backup runs:
+
+- SQLite is copied with the online backup API a few pages at a time (BACKUP_SQLITE_PAGES), pausing
+  BACKUP_STEP_SLEEP between steps, so writers only ever wait for one short step. If writers keep
+  restarting the copy, it is finished in one step instead (a read snapshot, which does not block
+  writers in WAL mode).
+- PostgreSQL is dumped with ``pg_dump`` (a repeatable-read snapshot, no locks on writers) at a
+  lower CPU priority.
+- Dumps are gzipped while they stream, without a second uncompressed copy for PostgreSQL.
+- Scheduled backups only start inside BACKUP_WINDOW (e.g. ``22-6``), outside shift hours.
+
+Restore: ``gunzip db.sqlite3.gz`` (SQLite) or ``gunzip -c db.dump.gz | pg_restore -d <db>``, and
+copy media back with ``python manage.py run_backup --restore-media <name> <target dir>``.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .models import Backup
+
+CHUNK = 1024 * 1024
+# every backup_frequency of SystemSettings
+INTERVALS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(days=7),
+    "monthly": timedelta(days=30),
+}
+MEDIA_MANIFEST = "media.json.gz"
+
+
+class BackupError(Exception):
+    pass
+
+
+class _Restarted(Exception):
+    pass
+
+
+def backup_dir():
+    return Path(settings.BACKUP_DIR)
+
+
+def blob_path(digest):
+    return backup_dir() / "media" / digest[:2] / digest
+
+
+def _gzip_file(source, target):
+    with open(source, "rb") as src, gzip.open(target, "wb", compresslevel=settings.BACKUP_GZIP_LEVEL) as out:
+        shutil.copyfileobj(src, out, CHUNK)
+
+
+def dump_sqlite(target):
+    source = connections["default"].settings_dict["NAME"]
+    with tempfile.TemporaryDirectory(dir=backup_dir()) as tmp:
+        copy = Path(tmp) / "db.sqlite3"
+        src = sqlite3.connect(f"{Path(source).resolve().as_uri()}?mode=ro", uri=True)
+        dst = sqlite3.connect(copy)
+        seen = {"remaining": None, "restarts": 0}
+
+        def step(status, remaining, total):
+            # the backup API starts over when another connection writes to the source
+            if seen["remaining"] is not None and remaining > seen["remaining"]:
+                seen["restarts"] += 1
+                if seen["restarts"] > settings.BACKUP_MAX_RESTARTS:
+                    raise _Restarted
+            seen["remaining"] = remaining
+            time.sleep(settings.BACKUP_STEP_SLEEP)
+
+        try:
+            try:
+                src.backup(dst, pages=settings.BACKUP_SQLITE_PAGES, progress=step)
+            except _Restarted:
+                src.backup(dst, pages=-1)
+            if dst.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                raise BackupError("quick_check of the copy failed")
+        finally:
+            dst.close()
+            src.close()
+        _gzip_file(copy, target)
+
+
+def dump_postgres(target):
+    db = connections["default"].settings_dict
+    command = ["pg_dump", "--format=custom", "--compress=0", "--no-owner",
+               "--host", db["HOST"], "--port", str(db["PORT"]), "--username", db["USER"], db["NAME"]]
+    if shutil.which("nice"):
+        command = ["nice", "-n", "10", *command]
+    env = {**os.environ, "PGPASSWORD": db["PASSWORD"]}
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors, env=env)
+        with gzip.open(target, "wb", compresslevel=settings.BACKUP_GZIP_LEVEL) as out:
+            shutil.copyfileobj(process.stdout, out, CHUNK)
+        if process.wait():
+            errors.seek(0)
+            raise BackupError(f"pg_dump failed: {errors.read().decode(errors='replace')[-2000:]}")
+
+
+def _read_manifest(backup):
+    path = backup_dir() / backup.name / MEDIA_MANIFEST
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_media(backup, previous):
+    """Store new media content by hash and write this backup's manifest; returns (files, new, new_bytes)."""
+    known = _read_manifest(previous) if previous else {}
+    root = Path(settings.MEDIA_ROOT)
+    manifest, new_files, new_bytes = {}, 0, 0
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = Path(directory) / filename
+            name = path.relative_to(root).as_posix()
+            stat = path.stat()
+            entry = known.get(name)
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                digest = entry[2]  # unchanged since the last backup: no need to read it again
+            else:
+                digest = _hash(path)
+            blob = blob_path(digest)
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                partial = blob.with_suffix(".partial")
+                shutil.copyfile(path, partial)
+                partial.replace(blob)
+                new_files += 1
+                new_bytes += stat.st_size
+            manifest[name] = [stat.st_size, stat.st_mtime_ns, digest]
+    with gzip.open(backup_dir() / backup.name / MEDIA_MANIFEST, "wt", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    return len(manifest), new_files, new_bytes
+
+
+def restore_media(backup, target):
+    """Copy the media files of ``backup`` into ``target`` (e.g. a fresh MEDIA_ROOT)."""
+    target = Path(target)
+    for name, (_, _, digest) in _read_manifest(backup).items():
+        destination = target / name
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(blob_path(digest), destination)
+
+
+def apply_retention():
+    """Keep the newest BACKUP_RETENTION successful backups; drop older runs and unreferenced media."""
+    keep = list(Backup.objects.filter(status="succeeded").order_by("-started_at")[:settings.BACKUP_RETENTION])
+    if len(keep) < settings.BACKUP_RETENTION:
+        return 0
+    expired = Backup.objects.filter(started_at__lt=keep[-1].started_at).exclude(status="running")
+    removed = 0
+    for backup in expired:
+        shutil.rmtree(backup_dir() / backup.name, ignore_errors=True)
+        backup.delete()
+        removed += 1
+    if removed:
+        referenced = {entry[2] for backup in keep for entry in _read_manifest(backup).values()}
+        for blob in (backup_dir() / "media").glob("*/*"):
+            if blob.name not in referenced:
+                blob.unlink(missing_ok=True)
+    return removed
+
+
+def run(trigger="scheduled", progress=None):
+    """Take one backup; returns the Backup row (status succeeded or failed)."""
+    stale = timezone.now() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    # a run whose worker died is never finished; give up on it so that it does not block the next one
+    Backup.objects.filter(status="running", started_at__lt=stale).update(
+        status="failed", error="interrupted", finished_at=timezone.now(), updated_at=timezone.now(),
+    )
+    if Backup.objects.filter(status="running").exists():
+        raise BackupError("別のバックアップが実行中です。")
+    vendor = connections["default"].vendor
+    now = timezone.now()
+    backup = Backup.objects.create(
+        name=timezone.localtime(now).strftime("%Y%m%d-%H%M%S"), trigger=trigger, engine=vendor, started_at=now,
+    )
+    previous = Backup.objects.filter(status="succeeded").order_by("-started_at").first()
+    directory = backup_dir() / backup.name
+    # progress is only reported between stages: on SQLite every write to the database (job progress
+    # included) makes the online copy start over
+    if progress:
+        progress(5, "database")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        if vendor == "sqlite":
+            backup.database_file = "db.sqlite3.gz"
+            dump_sqlite(directory / backup.database_file)
+        elif vendor == "postgresql":
+            backup.database_file = "db.dump.gz"
+            dump_postgres(directory / backup.database_file)
+        else:
+            raise BackupError(f"unsupported database: {vendor}")
+        backup.database_bytes = (directory / backup.database_file).stat().st_size
+        if progress:
+            progress(80, "media")
+        backup.media_files, backup.media_new_files, backup.media_new_bytes = copy_media(backup, previous)
+        backup.status = "succeeded"
+    except Exception as exc:
+        backup.status = "failed"
+        backup.error = f"{type(exc).__name__}: {exc}"
+    backup.finished_at = timezone.now()
+    backup.save()
+    if backup.status == "succeeded":
+        apply_retention()
+    return backup
+
+
+def in_window(now=None, window=None):
+    """Whether ``now`` (local time) falls into a ``"start-end"`` hour window such as ``22-6``."""
+    window = settings.BACKUP_WINDOW if window is None else window
+    if not window:
+        return True
+    start, end = (int(h) for h in window.split("-"))
+    hour = timezone.localtime(now).hour
+    return start <= hour < end if start <= end else hour >= start or hour < end
+
+
+def next_due(frequency, now=None):
+    """When the next scheduled backup is due (``None``: right away)."""
+    interval = INTERVALS.get(frequency, INTERVALS["daily"])
+    last = Backup.objects.exclude(status="running").order_by("-started_at").values("status", "started_at").first()
+    if last is None:
+        return None
+    # a failed run is retried sooner, but not on every scheduler tick
+    wait = interval if last["status"] == "succeeded" else min(interval, timedelta(hours=1))
+    return last["started_at"] + wait
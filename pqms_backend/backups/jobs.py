@@ -0,0 +1,45 @@
+import time
+
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import enqueue, job, scheduler
+from master.system import system_settings
+
+from . import engine
+
+# the scheduler runs on every worker poll; checking the schedule once a minute is plenty
+CHECK_INTERVAL = 60
+_last_check = 0.0
+
+
+@job("backups.run")
+def run_backup(job):
+    backup = engine.run(trigger=job.payload.get("trigger", "scheduled"), progress=job.set_progress)
+    if backup.status == "failed":
+        # max_attempts=1: the next run is the scheduler's decision, not the retry backoff's
+        raise engine.BackupError(backup.error)
+    return {"backup_id": backup.id, "name": backup.name, "database_bytes": backup.database_bytes,
+            "media_new_files": backup.media_new_files}
+
+
+def backup_queued():
+    return Job.objects.filter(name="backups.run", status__in=["queued", "running"]).exists()
+
+
+def enqueue_backup(trigger="scheduled"):
+    return enqueue("backups.run", {"trigger": trigger}, max_attempts=1)
+
+
+@scheduler
+def schedule_backups():
+    global _last_check
+    if time.monotonic() - _last_check < CHECK_INTERVAL:
+        return
+    _last_check = time.monotonic()
+    config = system_settings()
+    if not config.auto_backup or not engine.in_window():
+        return
+    due = engine.next_due(config.backup_frequency)
+    if (due is None or due <= timezone.now()) and not backup_queued():
+        enqueue_backup()
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from backups.engine import BackupError, restore_media, run
+from backups.models import Backup
+
+
+class Command(BaseCommand):
+    help = "Take an online backup of the database and MEDIA_ROOT into BACKUP_DIR."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--restore-media", nargs=2, metavar=("BACKUP", "TARGET_DIR"), dest="restore",
+                            help="copy the media files of a backup (by name) into TARGET_DIR")
+
+    def handle(self, *args, restore, **options):
+        if restore:
+            name, target = restore
+            backup = Backup.objects.filter(name=name, status="succeeded").first()
+            if backup is None:
+                raise CommandError(f"no successful backup named {name}")
+            restore_media(backup, target)
+            self.stdout.write(self.style.SUCCESS(f"restored media of {name} into {target}"))
+            return
+        try:
+            backup = run(trigger="manual")
+        except BackupError as exc:
+            raise CommandError(str(exc))
+        if backup.status == "failed":
+            raise CommandError(f"backup {backup.name} failed: {backup.error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"backup {backup.name}: database {backup.database_bytes} bytes, "
+            f"{backup.media_new_files}/{backup.media_files} media files copied"
+        ))
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Backup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=50, unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "実行中"),
+                            ("succeeded", "成功"),
+                            ("failed", "失敗"),
+                        ],
+                        default="running",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "trigger",
+                    models.CharField(
+                        choices=[("scheduled", "定期"), ("manual", "手動")],
+                        default="scheduled",
+                        max_length=20,
+                    ),
+                ),
+                ("engine", models.CharField(max_length=20)),
+                ("database_file", models.CharField(blank=True, max_length=255)),
+                ("database_bytes", models.BigIntegerField(default=0)),
+                ("media_files", models.PositiveIntegerField(default=0)),
+                ("media_new_files", models.PositiveIntegerField(default=0)),
+                ("media_new_bytes", models.BigIntegerField(default=0)),
+                ("started_at", models.DateTimeField()),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "started_at"],
+                        name="backups_bac_status_ea83cd_idx",
+                    )
+                ],
+            },
+        ),
+    ]
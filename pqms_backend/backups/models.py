@@ -0,0 +1,24 @@
+from django.db import models
+from common.models import TimeStampedModel
+
+class Backup(TimeStampedModel):
+    """One backup run: a compressed database dump plus a media manifest (see backups/engine.py)."""
+    STATUS_CHOICES = [("running","実行中"),("succeeded","成功"),("failed","失敗")]
+    TRIGGER_CHOICES = [("scheduled","定期"),("manual","手動")]
+    name = models.CharField(max_length=50, unique=True)  # directory under BACKUP_DIR
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    trigger = models.CharField(max_length=20, choices=TRIGGER_CHOICES, default="scheduled")
+    engine = models.CharField(max_length=20)  # sqlite / postgresql
+    database_file = models.CharField(max_length=255, blank=True)
+    database_bytes = models.BigIntegerField(default=0)  # compressed
+    media_files = models.PositiveIntegerField(default=0)
+    media_new_files = models.PositiveIntegerField(default=0)  # copied this run; the rest were already stored
+    media_new_bytes = models.BigIntegerField(default=0)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status","started_at"])]
+
+    def __str__(self): return f"{self.name} ({self.get_status_display()})"
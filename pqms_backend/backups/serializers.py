@@ -0,0 +1,10 @@
+from rest_framework import serializers
+from .models import Backup
+
+class BackupSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source="get_status_display", read_only=True)
+    class Meta:
+        model = Backup
+        fields = ["id","name","status","status_display","trigger","engine","database_file","database_bytes",
+                  "media_files","media_new_files","media_new_bytes","started_at","finished_at","error","created_at"]
+        read_only_fields = fields
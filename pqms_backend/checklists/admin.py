@@ -5,8 +5,11 @@ from .models import Checklist, ChecklistItem
 class ChecklistItemInline(admin.TabularInline):
     model = ChecklistItem
     extra = 0
+    autocomplete_fields = ("check_item",)
 
 @admin.register(Checklist)
 class ChecklistAdmin(admin.ModelAdmin):
     inlines = [ChecklistItemInline]
     list_display = ("id","name","category","created_at","updated_at")
+    list_select_related = ("category",)
+    search_fields = ("name",)
@@ -6,7 +6,13 @@ from .models import Checklist, ChecklistItem
 from .serializers import ChecklistSerializer, ChecklistItemReadSerializer
 
 class ChecklistViewSet(viewsets.ModelViewSet):
-    queryset = Checklist.objects.all().prefetch_related("items__check_item","category").order_by("-updated_at")
+    queryset = (
+        Checklist.objects
+        .select_related("category")
+        .prefetch_related("items__check_item__category")
+        .all()
+        .order_by("-updated_at")
+    )
     serializer_class = ChecklistSerializer
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend]
@@ -14,7 +20,7 @@ class ChecklistViewSet(viewsets.ModelViewSet):
     search_fields = ["name","description"]
 
 class ChecklistItemViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = ChecklistItem.objects.select_related("checklist","check_item").all()
+    queryset = ChecklistItem.objects.select_related("checklist","check_item__category").all()
     serializer_class = ChecklistItemReadSerializer
     permission_classes = [AllowAny]
     filterset_fields = ["checklist"]
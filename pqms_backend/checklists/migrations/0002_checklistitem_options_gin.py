@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from common.db import VendorRunSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("checklists", "0001_initial"),
+    ]
+
+    operations = [
+        # Postgres only: GIN index for containment lookups such as options__contains=["NG"].
+        VendorRunSQL(
+            "postgresql",
+            "CREATE INDEX IF NOT EXISTS checklists_checklistitem_options_gin ON checklists_checklistitem USING gin (options jsonb_path_ops)",
+            "DROP INDEX IF EXISTS checklists_checklistitem_options_gin",
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("checklists", "0002_checklistitem_options_gin"),
+        ("master", "0004_systemsettings_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="checklist",
+            index=models.Index(
+                fields=["updated_at"], name="checklists__updated_4e4efa_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="checklistitem",
+            index=models.Index(
+                fields=["updated_at"], name="checklists__updated_a02d06_idx"
+            ),
+        ),
+    ]
@@ -7,6 +7,8 @@ class Checklist(TimeStampedModel):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]  # delta sync
     def __str__(self): return self.name
 
 class ChecklistItem(TimeStampedModel):
@@ -20,3 +22,4 @@ class ChecklistItem(TimeStampedModel):
     class Meta:
         ordering = ["order","id"]
         unique_together = ("checklist","check_item")
+        indexes = [models.Index(fields=["updated_at"])]
@@ -1,2 +1,8 @@
 from django.apps import AppConfig
-class CommonConfig(AppConfig): name = 'common'
+
+class CommonConfig(AppConfig):
+    name = 'common'
+
+    def ready(self):
+        from .sync import connect_signals
+        connect_signals()
@@ -0,0 +1,175 @@
+import shutil
+import statistics
+import tempfile
+import time
+import urllib.request
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from checklists.models import Checklist
+from executions.models import Execution
+from processes.models import ProcessSheet
+from .renderers import ORJSONRenderer
+
+# (name, url template); ids are filled from the dataset being benchmarked
+SCENARIOS = [
+    ("executions-list", "/api/executions/"),
+    ("executions-detail", "/api/executions/{execution}/"),
+    ("executions-progress", "/api/executions/{execution}/progress/"),
+    ("executions-stats", "/api/executions/stats/"),
+    ("execution-item-results-list", "/api/execution-item-results/"),
+    ("checklists-list", "/api/checklists/"),
+    ("checklists-detail", "/api/checklists/{checklist}/"),
+    ("check-items-list", "/api/check-items/"),
+    ("process-sheets-list", "/api/process-sheets/"),
+    ("process-sheets-progress", "/api/process-sheets/{process_sheet}/progress/"),
+    ("tasks-list", "/api/tasks/"),
+]
+
+
+@contextmanager
+def throwaway_database():
+    """Point the default connection (and its mirrors) at a fresh, migrated database for the block.
+
+    The shared cache is swapped for a private in-memory one as well, so nothing computed from the
+    throwaway data (or its generation stamps) leaks into the real cache.
+    """
+    connection = connections["default"]
+    old_test_name = connection.settings_dict["TEST"].get("NAME")
+    directory = None
+    if connection.vendor == "sqlite":
+        # keep the throwaway database on disk so timings resemble the real thing
+        directory = tempfile.mkdtemp()
+        connection.settings_dict["TEST"]["NAME"] = str(Path(directory) / "benchmark.sqlite3")
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    for alias in connections:
+        if alias != "default":
+            connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+    try:
+        with override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "stamps": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "stamps"},
+        }):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        connection.settings_dict["TEST"]["NAME"] = old_test_name
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def scenario_ids():
+    execution = Execution.objects.order_by("-id").values_list("id", flat=True).first()
+    return {
+        "execution": execution,
+        "checklist": Checklist.objects.order_by("id").values_list("id", flat=True).first(),
+        "process_sheet": ProcessSheet.objects.filter(executions__isnull=False).values_list("id", flat=True).first(),
+    }
+
+
+def _percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * p)))]
+
+
+def _summarise(latencies, queries, sizes, cpu=None):
+    summary = {
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "queries": max(queries) if queries else None,
+        "bytes": int(statistics.median(sizes)),
+    }
+    if cpu:
+        summary["cpu_ms"] = round(statistics.median(cpu) * 1000, 3)
+    return summary
+
+
+class QueryCounter:
+    """execute_wrapper counting every statement (the debug query log is capped at 9000 entries)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def run_client(url, *, repeat, warmup, headers=None):
+    """Run ``url`` through the Django test client, counting queries on every database."""
+    client = Client(headers=headers or {})
+    latencies, queries, sizes, cpu = [], [], [], []
+    for n in range(warmup + repeat):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            started, cpu_started = time.perf_counter(), time.process_time()
+            response = client.get(url)
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+            elapsed, cpu_elapsed = time.perf_counter() - started, time.process_time() - cpu_started
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+        if n >= warmup:
+            latencies.append(elapsed)
+            cpu.append(cpu_elapsed)
+            queries.append(counter.count)
+            sizes.append(len(content))
+    return _summarise(latencies, queries, sizes, cpu)
+
+
+def compare_renderers(url, *, repeat):
+    """Time DRF's JSONRenderer against ORJSONRenderer on the data returned by ``url``."""
+    data = Client().get(url).data
+    timings = {}
+    for name, renderer in (("drf", JSONRenderer()), ("orjson", ORJSONRenderer())):
+        samples = []
+        for _ in range(repeat):
+            started = time.process_time()
+            renderer.render(data)
+            samples.append(time.process_time() - started)
+        timings[f"render_{name}_ms"] = round(statistics.median(samples) * 1000, 3)
+    return timings
+
+
+def run_http(base_url, url, *, repeat, warmup, headers=None):
+    """Run ``url`` against a live server; query counts come from X-Query-Count when it is sent."""
+    latencies, queries, sizes = [], [], []
+    for n in range(warmup + repeat):
+        request = urllib.request.Request(base_url.rstrip("/") + url, headers=headers or {})
+        started = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            count = response.headers.get("X-Query-Count")
+        elapsed = time.perf_counter() - started
+        if n >= warmup:
+            latencies.append(elapsed)
+            sizes.append(len(body))
+            if count is not None:
+                queries.append(int(count))
+    return _summarise(latencies, queries, sizes)
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of human-readable regressions against a stored baseline run."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+        if previous.get("queries") is not None and current.get("queries") is not None \
+                and current["queries"] > previous["queries"]:
+            regressions.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        if current["bytes"] > previous["bytes"] * (1 + tolerance):
+            regressions.append(f"{name}: bytes {previous['bytes']} -> {current['bytes']}")
+    return regressions
@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Counter
+
+
+def _apply(name, delta):
+    if not Counter.objects.filter(name=name).update(value=F("value") + delta, updated_at=timezone.now()):
+        Counter.objects.get_or_create(name=name)
+        Counter.objects.filter(name=name).update(value=F("value") + delta, updated_at=timezone.now())
+
+
+def bump(name, delta=1):
+    """Add ``delta`` to a counter once the surrounding transaction commits."""
+    if delta:
+        transaction.on_commit(lambda: _apply(name, delta))
+
+
+def set_value(name, value):
+    Counter.objects.update_or_create(name=name, defaults={"value": value})
+
+
+def values(*names):
+    found = dict(Counter.objects.filter(name__in=names).values_list("name", "value"))
+    return {name: found.get(name, 0) for name in names}
+
+
+def daily(name, day=None):
+    return f"{name}:{(day or timezone.localdate()).isoformat()}"
@@ -0,0 +1,260 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.utils import timezone
+
+from master.models import Category, CheckItem
+from checklists.models import Checklist, ChecklistItem
+from processes.models import ProcessSheet
+from executions.models import Execution, ExecutionItemResult
+from tasks.models import Task
+
+CATEGORY_NAMES = ["外観", "寸法", "電気特性", "機能", "梱包", "表示", "材料", "溶接", "塗装", "組立"]
+NUMBER_ITEMS = [("長さ", "mm", 100.0, 0.2), ("幅", "mm", 50.0, 0.1), ("厚み", "mm", 2.0, 0.05),
+                ("重量", "g", 250.0, 2.0), ("抵抗値", "Ω", 47.0, 0.5), ("電圧", "V", 12.0, 0.2),
+                ("トルク", "N·m", 5.0, 0.3), ("温度", "℃", 25.0, 1.5)]
+TEXT_ITEMS = ["備考", "異常内容", "作業メモ", "ロット確認"]
+SELECT_ITEMS = [("判定", ["OK", "NG", "保留"]), ("色調", ["良", "可", "不可"]), ("梱包状態", ["良好", "軽微な傷", "破損"])]
+BOOLEAN_ITEMS = ["キズの有無", "バリの有無", "汚れの有無", "ラベル貼付", "ネジ締め確認"]
+PHOTO_ITEMS = ["外観写真", "ラベル写真", "梱包写真"]
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for obj in iterable:
+        chunk.append(obj)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values we generate instead of "now"."""
+    fields = [f for m in models for f in m._meta.concrete_fields if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class DataGenerator:
+    """Synthetic, production-shaped data written in chunked bulk inserts.
+
+    Only primary keys and small per-checklist specs are kept between chunks, so memory stays
+    bounded by ``chunk_size`` no matter how many item results are generated.
+    """
+
+    def __init__(self, *, seed=0, chunk_size=5000, days=365, ng_rate=0.03, skip_rate=0.01, stdout=None):
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.days = days
+        self.ng_rate = ng_rate
+        self.skip_rate = skip_rate
+        self.stdout = stdout
+        self.now = timezone.now()
+        self.counts = {}
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def when(self, max_days=None):
+        return self.now - timedelta(seconds=self.rng.uniform(0, (max_days or self.days) * 86400))
+
+    def run(self, *, users=20, categories=10, check_items=200, checklists=30, items_per_checklist=25,
+            process_sheets=1000, executions=10000, tasks=2000):
+        with explicit_timestamps(Category, CheckItem, Checklist, ChecklistItem, ProcessSheet, Execution, ExecutionItemResult, Task):
+            self.users(users)
+            self.categories(categories)
+            self.check_items(check_items)
+            self.checklists(checklists, items_per_checklist)
+            self.process_sheets(process_sheets)
+            self.executions(executions)
+            self.tasks(tasks)
+        return self.counts
+
+    def users(self, count):
+        User = get_user_model()
+        prefix = f"inspector{self.rng.randrange(10**6):06d}_"
+        self.user_ids = [u.id for u in User.objects.bulk_create(
+            User(username=f"{prefix}{i:03d}", display_name=f"検査員{i:03d}", department=self.rng.choice(["製造1課", "製造2課", "品質保証"]),
+                 password="!") for i in range(count)
+        )]
+        self.counts["users"] = count
+
+    def categories(self, count):
+        suffix = f"-{self.rng.randrange(10**6):06d}"
+        rows = [Category(name=f"{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]}{i // len(CATEGORY_NAMES) or ''}{suffix}",
+                         description=f"{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]}検査", created_at=self.when(), updated_at=self.now)
+                for i in range(count)]
+        self.category_ids = [c.id for c in Category.objects.bulk_create(rows)]
+        self.counts["categories"] = count
+
+    def check_items(self, count):
+        types = [t for t, _ in CheckItem.TYPE_CHOICES]
+        rows = []
+        for i in range(count):
+            kind = types[i % len(types)]
+            item = CheckItem(type=kind, category_id=self.rng.choice(self.category_ids), required=self.rng.random() < 0.6,
+                             created_at=self.when(), updated_at=self.now)
+            if kind == "number":
+                name, unit, nominal, tol = self.rng.choice(NUMBER_ITEMS)
+                item.name, item.unit = f"{name}{i:04d}", unit
+                item.min_value, item.max_value = nominal - tol * 3, nominal + tol * 3
+                item.decimal_places = 2 if tol < 1 else 1
+                item.default_value = nominal
+                item.error_message = f"{item.min_value:g}〜{item.max_value:g}{unit} の範囲で入力してください"
+            elif kind == "select":
+                name, options = self.rng.choice(SELECT_ITEMS)
+                item.name, item.options = f"{name}{i:04d}", options
+            elif kind == "boolean":
+                item.name = f"{self.rng.choice(BOOLEAN_ITEMS)}{i:04d}"
+            elif kind == "photo":
+                item.name, item.allow_handwriting = f"{self.rng.choice(PHOTO_ITEMS)}{i:04d}", self.rng.random() < 0.3
+            else:
+                item.name = f"{self.rng.choice(TEXT_ITEMS)}{i:04d}"
+            rows.append(item)
+        created = CheckItem.objects.bulk_create(rows, batch_size=self.chunk_size)
+        # the only per-item state kept for result generation
+        self.item_specs = {c.id: (c.type, c.min_value, c.max_value, c.decimal_places, c.options) for c in created}
+        self.counts["check_items"] = count
+
+    def checklists(self, count, items_per_checklist):
+        rows = [Checklist(name=f"{self.rng.choice(CATEGORY_NAMES)}検査チェックリスト{i:03d}", description="定期検査",
+                          category_id=self.rng.choice(self.category_ids), created_at=self.when(), updated_at=self.now)
+                for i in range(count)]
+        self.checklist_ids = [c.id for c in Checklist.objects.bulk_create(rows)]
+        per_checklist = min(items_per_checklist, len(self.item_specs))
+        self.checklist_items = {}
+        total = 0
+        for checklist_id in self.checklist_ids:
+            items = ChecklistItem.objects.bulk_create(
+                ChecklistItem(checklist_id=checklist_id, check_item_id=ci, order=n, required=self.rng.random() < 0.5,
+                              created_at=self.now, updated_at=self.now)
+                for n, ci in enumerate(self.rng.sample(sorted(self.item_specs), per_checklist))
+            )
+            self.checklist_items[checklist_id] = [(ci.id, self.item_specs[ci.check_item_id]) for ci in items]
+            total += len(items)
+        self.counts["checklists"] = count
+        self.counts["checklist_items"] = total
+
+    def process_sheets(self, count):
+        statuses = [s for s, _ in ProcessSheet.STATUS_CHOICES]
+        self.sheet_refs = []
+        lot_base = self.rng.randrange(10**6)
+        for chunk in _chunks(range(count), self.chunk_size):
+            rows = []
+            for i in chunk:
+                start = self.when()
+                rows.append(ProcessSheet(
+                    name=f"工程{i:06d}", project_name=f"案件{i % 50:03d}", status=self.rng.choices(statuses, [1, 1, 2, 6])[0],
+                    priority=self.rng.randint(1, 5), assignee=f"担当{i % 25:02d}", inspector=f"検査員{i % 20:03d}",
+                    planned_start=start.date(), planned_end=(start + timedelta(days=self.rng.randint(1, 14))).date(),
+                    checklist_id=self.rng.choice(self.checklist_ids), lot_number=f"L{lot_base + i:08d}",
+                    created_at=start, updated_at=start,
+                ))
+            with transaction.atomic():
+                created = ProcessSheet.objects.bulk_create(rows)
+            self.sheet_refs.extend((s.id, s.checklist_id, s.created_at) for s in created)
+        self.counts["process_sheets"] = count
+
+    def item_value(self, spec):
+        """Return (status, value) for one item following the spec limits and configured NG rates."""
+        kind, low, high, places, options = spec
+        r = self.rng.random()
+        if r < self.skip_rate:
+            return "SKIP", ""
+        ng = r < self.skip_rate + self.ng_rate
+        if kind == "number" and low is not None and high is not None:
+            mid, sigma = (low + high) / 2, (high - low) / 6
+            value = mid + (self.rng.choice([-1, 1]) * self.rng.uniform(3.2, 4.5) if ng else self.rng.gauss(0, 0.8)) * sigma
+            value = min(max(value, mid - 3 * sigma), mid + 3 * sigma) if not ng else value
+            return ("NG" if ng else "OK"), f"{value:.{places}f}"
+        if kind == "select" and options:
+            return ("NG", options[-1]) if ng else ("OK", options[0])
+        if kind == "boolean":
+            return ("NG", "false") if ng else ("OK", "true")
+        if kind == "photo":
+            return ("NG" if ng else "OK"), ""
+        return ("NG", "要確認") if ng else ("OK", "")
+
+    def executions(self, count):
+        statuses = [s for s, _ in Execution.STATUS_CHOICES]
+        executions_per_chunk = max(1, self.chunk_size // max(1, max(len(v) for v in self.checklist_items.values())))
+        item_total = 0
+        for n, chunk in enumerate(_chunks(range(count), executions_per_chunk)):
+            rows, item_values = [], []
+            for _ in chunk:
+                sheet_id, checklist_id, sheet_created = self.rng.choice(self.sheet_refs)
+                started = min(sheet_created + timedelta(minutes=self.rng.randint(0, 7 * 24 * 60)), self.now)
+                status = "approved" if (self.now - started).days > 14 else self.rng.choice(statuses)
+                finished = started + timedelta(minutes=self.rng.randint(5, 90)) if status != "draft" else None
+                values = [(ci_id, *self.item_value(spec)) for ci_id, spec in self.checklist_items[checklist_id]]
+                result = "" if status == "draft" else "fail" if any(v[1] == "NG" for v in values) else "pass"
+                rows.append(Execution(process_sheet_id=sheet_id, checklist_id=checklist_id,
+                                      executor_id=self.rng.choice(self.user_ids) if self.user_ids else None,
+                                      started_at=started, finished_at=finished, status=status, result=result,
+                                      created_at=started, updated_at=finished or started))
+                item_values.append(values)
+            with transaction.atomic():
+                created = Execution.objects.bulk_create(rows)
+                item_total += self.insert_item_results(created, item_values)
+            if n % 20 == 0:
+                self.log(f"  executions {min(count, (n + 1) * executions_per_chunk)}/{count}, item results {item_total}")
+        self.counts["executions"] = count
+        self.counts["item_results"] = item_total
+
+    def insert_item_results(self, executions, item_values):
+        """Insert item results with executemany.
+
+        This is the one table that reaches tens of millions of rows. Compiling those rows through
+        bulk_create costs far more than the inserts themselves, so timestamps are adapted once per
+        execution and rows are passed to the driver as plain tuples.
+        """
+        connection = connections[ExecutionItemResult.objects.db]
+        adapt = connection.ops.adapt_datetimefield_value
+        table = connection.ops.quote_name(ExecutionItemResult._meta.db_table)
+        columns = ["execution_id", "checklist_item_id", "status", "value", "note", "created_at", "updated_at"]
+        sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+            table, ", ".join(connection.ops.quote_name(c) for c in columns), ", ".join(["%s"] * len(columns))
+        )
+        params = []
+        for execution, values in zip(executions, item_values):
+            created, updated = adapt(execution.created_at), adapt(execution.updated_at)
+            for checklist_item_id, status, value in values:
+                params.append((execution.id, checklist_item_id, status, value, "再検査要" if status == "NG" else "", created, updated))
+        with connection.cursor() as cursor:
+            for batch in _chunks(params, self.chunk_size):
+                cursor.executemany(sql, batch)
+        return len(params)
+
+    def tasks(self, count):
+        statuses = [s for s, _ in Task.STATUS_CHOICES]
+        priorities = [p for p, _ in Task.PRIORITY_CHOICES]
+        for chunk in _chunks(range(count), self.chunk_size):
+            rows = []
+            for i in chunk:
+                created = self.when()
+                rows.append(Task(title=f"{self.rng.choice(CATEGORY_NAMES)}検査 {i:05d}", description="定期検査の実施",
+                                 assignee=f"担当{i % 25:02d}", due_date=(created + timedelta(days=self.rng.randint(1, 30))).date(),
+                                 status=self.rng.choice(statuses), priority=self.rng.choice(priorities),
+                                 checklist_name=f"{self.rng.choice(CATEGORY_NAMES)}検査チェックリスト",
+                                 created_at=created, updated_at=created))
+            with transaction.atomic():
+                Task.objects.bulk_create(rows)
+        self.counts["tasks"] = count
+
+
+def generate(*, seed=0, chunk_size=5000, days=365, ng_rate=0.03, skip_rate=0.01, stdout=None, **counts):
+    return DataGenerator(seed=seed, chunk_size=chunk_size, days=days, ng_rate=ng_rate, skip_rate=skip_rate,
+                         stdout=stdout).run(**counts)
@@ -0,0 +1,26 @@
+from django.db import connections
+from django.db import migrations
+
+
+def is_postgres(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+class VendorRunSQL(migrations.RunSQL):
+    """RunSQL that is only applied on one database vendor (e.g. Postgres-only index types)."""
+
+    def __init__(self, vendor, sql, reverse_sql=None, **kwargs):
+        self.vendor = vendor
+        super().__init__(sql, reverse_sql, **kwargs)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        return name, [self.vendor, *args], kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,108 @@
+import json
+import platform
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from common import benchmark, datagen
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hot API endpoints (p50/p95 latency, queries per request, response size). "
+        "By default a throwaway database is seeded with the requested volumes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--executions", type=int, default=1000)
+        parser.add_argument("--process-sheets", type=int, default=200)
+        parser.add_argument("--checklists", type=int, default=20)
+        parser.add_argument("--items-per-checklist", type=int, default=20)
+        parser.add_argument("--tasks", type=int, default=500)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--only", nargs="*", help="Scenario names to run.")
+        parser.add_argument("--current-db", action="store_true",
+                            help="Benchmark the configured database as-is instead of seeding a throwaway one.")
+        parser.add_argument("--url", help="Benchmark a running server (e.g. http://localhost:8000) over HTTP.")
+        parser.add_argument("--header", action="append", default=[], help="Extra request header, 'Name: value'.")
+        parser.add_argument("--compare-renderers", action="store_true",
+                            help="Also time DRF's JSONRenderer against the orjson renderer on each response.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--baseline", default=str(Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"))
+        parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%).")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **opts):
+        headers = dict(h.split(":", 1) for h in opts["header"])
+        headers = {k.strip(): v.strip() for k, v in headers.items()}
+        scenarios = [s for s in benchmark.SCENARIOS if not opts["only"] or s[0] in opts["only"]]
+
+        counts = None
+        with ExitStack() as stack:
+            if not opts["url"] and not opts["current_db"]:
+                stack.enter_context(benchmark.throwaway_database())
+                counts = self._seed(opts)
+            ids = benchmark.scenario_ids()
+            results = {}
+            for name, template in scenarios:
+                url = template.format(**ids)
+                if opts["url"]:
+                    results[name] = benchmark.run_http(opts["url"], url, repeat=opts["repeat"], warmup=opts["warmup"], headers=headers)
+                else:
+                    results[name] = benchmark.run_client(url, repeat=opts["repeat"], warmup=opts["warmup"], headers=headers)
+                    if opts["compare_renderers"]:
+                        results[name].update(benchmark.compare_renderers(url, repeat=opts["repeat"]))
+                r = results[name]
+                line = (
+                    f"{name:<30} p50={r['p50_ms']:>8.2f}ms p95={r['p95_ms']:>8.2f}ms "
+                    f"queries={r['queries'] if r['queries'] is not None else '-':>4} bytes={r['bytes']}"
+                )
+                if "cpu_ms" in r:
+                    line += f" cpu={r['cpu_ms']:.2f}ms"
+                if "render_drf_ms" in r:
+                    line += f" render drf={r['render_drf_ms']:.2f}ms orjson={r['render_orjson_ms']:.2f}ms"
+                self.stdout.write(line)
+
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "vendor": connections["default"].vendor,
+                "python": platform.python_version(),
+                "dataset": counts,
+                "target": opts["url"] or ("current-db" if opts["current_db"] else "seeded"),
+                "headers": headers,
+            },
+            "results": results,
+        }
+        if opts["output"]:
+            Path(opts["output"]).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        baseline_path = Path(opts["baseline"])
+        if opts["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+            self.stdout.write(f"Baseline saved to {baseline_path}")
+        elif baseline_path.exists():
+            regressions = benchmark.compare(results, json.loads(baseline_path.read_text()), opts["tolerance"])
+            for line in regressions:
+                self.stdout.write(self.style.WARNING(f"REGRESSION {line}"))
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+            elif opts["fail_on_regression"]:
+                raise CommandError(f"{len(regressions)} regression(s) against {baseline_path}")
+
+    def _seed(self, opts):
+        self.stdout.write("Seeding benchmark dataset...")
+        counts = datagen.generate(
+            seed=opts["seed"], checklists=opts["checklists"], items_per_checklist=opts["items_per_checklist"],
+            check_items=max(50, opts["items_per_checklist"] * 2), process_sheets=opts["process_sheets"],
+            executions=opts["executions"], tasks=opts["tasks"],
+        )
+        self.stdout.write(", ".join(f"{k}={v}" for k, v in counts.items()))
+        return counts
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from common.schema import build, code_version, schema_path
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema files served by /api/schema/ (run at deploy time)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--if-missing", action="store_true",
+                            help="do nothing when the schema of the current code version already exists")
+
+    def handle(self, *args, if_missing, **options):
+        if if_missing and schema_path("yaml").exists() and schema_path("json").exists():
+            self.stdout.write(f"schema {code_version()} is up to date")
+            return
+        started = time.perf_counter()
+        paths = build()
+        self.stdout.write(self.style.SUCCESS(
+            f"schema {code_version()} built in {time.perf_counter() - started:.1f}s: "
+            + ", ".join(str(p) for p in paths)
+        ))
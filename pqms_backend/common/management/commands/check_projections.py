@@ -0,0 +1,88 @@
+import json
+import statistics
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common import benchmark, datagen
+from common.projection import ProjectedListMixin, projection_for
+from executions.models import ExecutionItemResult, ExecutionPhoto
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that every viewset using ProjectedListMixin returns exactly what its serializer returns, "
+        "and time both on pages of --rows rows. Runs on a throwaway database unless --current-db is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--current-db", action="store_true")
+
+    def handle(self, *args, rows, repeat, current_db, **options):
+        from pqms.urls import router
+
+        failures = 0
+        with ExitStack() as stack:
+            if not current_db:
+                stack.enter_context(benchmark.throwaway_database())
+                self._seed(rows)
+            request = Request(APIRequestFactory().get("/api/"))
+            context = {"request": request}
+            for prefix, viewset, basename in router.registry:
+                if not issubclass(viewset, ProjectedListMixin):
+                    continue
+                serializer_class = viewset.serializer_class
+                queryset = viewset.queryset.order_by("pk")[:rows]
+                projection = projection_for(serializer_class)
+
+                expected, serializer_query, serializer_time = self._time(
+                    repeat, lambda: list(queryset.all()), lambda objs: serializer_class(objs, many=True, context=context).data)
+                actual, projection_query, projection_time = self._time(
+                    repeat, lambda: list(projection.values(queryset)), lambda rows: projection.data(rows, context))
+
+                line = (
+                    f"{basename:<20} rows={len(actual):<5} serialize {serializer_time:7.1f}ms -> {projection_time:6.1f}ms "
+                    f"(x{serializer_time / max(projection_time, 1e-6):.1f}), query {serializer_query:6.1f}ms -> "
+                    f"{projection_query:6.1f}ms"
+                )
+                if json.loads(json.dumps(expected, default=str)) == json.loads(json.dumps(actual, default=str)):
+                    self.stdout.write(f"OK   {line}")
+                    continue
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"FAIL {line}"))
+                for want, got in zip(expected, actual):
+                    if dict(want) != got:
+                        self.stdout.write(f"       serializer: {json.dumps(want, default=str, ensure_ascii=False)[:500]}")
+                        self.stdout.write(f"       projection: {json.dumps(got, default=str, ensure_ascii=False)[:500]}")
+                        break
+        if failures:
+            raise CommandError(f"{failures} projection(s) differ from their serializer")
+
+    @staticmethod
+    def _time(repeat, fetch, serialize):
+        """Median query and serialization milliseconds over ``repeat`` runs, plus the last output."""
+        query_times, serialize_times = [], []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = fetch()
+            query_times.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            data = serialize(rows)
+            serialize_times.append(time.perf_counter() - started)
+        return data, statistics.median(query_times) * 1000, statistics.median(serialize_times) * 1000
+
+    def _seed(self, rows):
+        datagen.generate(
+            seed=0, checklists=10, items_per_checklist=20, check_items=rows, process_sheets=50,
+            executions=max(1, rows // 20), tasks=rows,
+        )
+        # every third item result gets a photo, some with an annotation
+        ExecutionPhoto.objects.bulk_create(
+            ExecutionPhoto(item_result_id=pk, image=f"execution_photos/p-{pk}.jpg", annotation="傷あり" if pk % 2 else "")
+            for pk in ExecutionItemResult.objects.values_list("pk", flat=True)[::3]
+        )
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from common import benchmark, querycount
+from common.pagination import _estimated_count
+
+
+class Command(BaseCommand):
+    help = (
+        "Query-count regression check: seeds a throwaway database in growing rounds and asserts that every "
+        "GET endpoint registered on the API router issues the same number of queries regardless of row count. "
+        "On PostgreSQL it also checks that ?count=estimate gets a planner estimate."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, nargs="+", default=[2, 6],
+                            help="Rows added per table in each round (later rounds also nest more items).")
+        parser.add_argument("--only", nargs="*", help="Only check endpoints whose name contains one of these.")
+
+    def handle(self, *args, rounds, only, **options):
+        with benchmark.throwaway_database():
+            report = querycount.check(rounds=rounds, only=only)
+            estimate = self.check_estimate()
+
+        failures = 0
+        for entry in report:
+            counts = " -> ".join(str(c) for c in entry["queries"])
+            if entry["ok"] is None:
+                self.stdout.write(f"SKIP {entry['endpoint']:<40} {entry['skipped']}")
+            elif entry["ok"]:
+                self.stdout.write(f"OK   {entry['endpoint']:<40} queries {counts}")
+            else:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"FAIL {entry['endpoint']:<40} queries {counts}"))
+                for statement in entry["repeated_sql"]:
+                    self.stdout.write(f"       x{statement['count']}: {statement['sql'][:300]}")
+        if estimate is None:
+            self.stdout.write(f"SKIP {'count-estimate':<40} no planner estimate on {connection.vendor}")
+        elif estimate[1]:
+            self.stdout.write(f"OK   {'count-estimate':<40} {estimate[0]}")
+        else:
+            failures += 1
+            self.stdout.write(self.style.ERROR(f"FAIL {'count-estimate':<40} {estimate[0]}"))
+        if failures:
+            raise CommandError(f"{failures} check(s) failed")
+
+    def check_estimate(self):
+        """``?count=estimate`` on a filtered list: needs the planner's estimate (PostgreSQL only)."""
+        from executions.models import ExecutionItemResult
+
+        if connection.vendor != "postgresql":
+            return None
+        try:
+            rows = _estimated_count(ExecutionItemResult.objects.filter(status="NG"))
+        except Exception as exc:
+            return f"{type(exc).__name__}: {exc}", False
+        return f"rows={rows}", isinstance(rows, int)
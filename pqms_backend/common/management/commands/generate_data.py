@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from common.datagen import generate
+
+
+class Command(BaseCommand):
+    help = "Generate a high-volume synthetic dataset (master data, process sheets, executions, item results, tasks)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--categories", type=int, default=10)
+        parser.add_argument("--check-items", type=int, default=200)
+        parser.add_argument("--checklists", type=int, default=30)
+        parser.add_argument("--items-per-checklist", type=int, default=25)
+        parser.add_argument("--process-sheets", type=int, default=1000)
+        parser.add_argument("--executions", type=int, default=10000)
+        parser.add_argument("--tasks", type=int, default=2000)
+        parser.add_argument("--ng-rate", type=float, default=0.03, help="Share of item results judged NG.")
+        parser.add_argument("--skip-rate", type=float, default=0.01, help="Share of item results skipped.")
+        parser.add_argument("--days", type=int, default=365, help="Spread timestamps over this many past days.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per bulk insert / transaction.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **opts):
+        started = time.monotonic()
+        counts = generate(
+            seed=opts["seed"], chunk_size=opts["chunk_size"], days=opts["days"], ng_rate=opts["ng_rate"],
+            skip_rate=opts["skip_rate"], stdout=self.stdout,
+            users=opts["users"], categories=opts["categories"], check_items=opts["check_items"],
+            checklists=opts["checklists"], items_per_checklist=opts["items_per_checklist"],
+            process_sheets=opts["process_sheets"], executions=opts["executions"], tasks=opts["tasks"],
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            ", ".join(f"{k}={v}" for k, v in counts.items()) + f" in {elapsed:.1f}s"
+        ))
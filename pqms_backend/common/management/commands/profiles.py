@@ -0,0 +1,43 @@
+import io
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common.profiling import profile_dir, stored_profiles
+
+
+class Command(BaseCommand):
+    help = "List, summarize or prune request profiles saved by ProfilingMiddleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["list", "show", "prune"])
+        parser.add_argument("profile_id", nargs="?", help="Profile to show (default: the newest).")
+        parser.add_argument("--path", help="Only profiles whose request path contains this.")
+        parser.add_argument("--limit", type=int, default=20, help="Rows to list / functions to show.")
+        parser.add_argument("--sort", default="cumulative", choices=["cumulative", "tottime", "calls"])
+        parser.add_argument("--keep", type=int, default=100, help="Profiles kept by prune.")
+
+    def handle(self, *args, action, profile_id, path, limit, sort, keep, **options):
+        profiles = [p for p in stored_profiles() if not path or path in p["path"]]
+        if action == "list":
+            for p in profiles[:limit]:
+                self.stdout.write(
+                    f"{p['id']}  {p['duration_ms']:>9.1f}ms  {p['status']}  {p['method']:<6} {p['path']}"
+                    f"{'?' + p['query_string'] if p['query_string'] else ''}  [{p['trigger']}, {p['user']}]"
+                )
+            if not profiles:
+                self.stdout.write("No stored profiles.")
+        elif action == "show":
+            meta = next((p for p in profiles if p["id"] == profile_id), None) if profile_id else (profiles[0] if profiles else None)
+            if meta is None:
+                raise CommandError("Profile not found.")
+            self.stdout.write(f"{meta['method']} {meta['path']} -> {meta['status']} in {meta['duration_ms']}ms ({meta['timestamp']})")
+            out = io.StringIO()
+            stats = pstats.Stats(str(profile_dir() / f"{meta['id']}.prof"), stream=out)
+            stats.strip_dirs().sort_stats(sort).print_stats(limit)
+            self.stdout.write(out.getvalue())
+        else:
+            for p in profiles[keep:]:
+                for suffix in (".prof", ".json"):
+                    (profile_dir() / f"{p['id']}{suffix}").unlink(missing_ok=True)
+            self.stdout.write(f"Removed {max(0, len(profiles) - keep)} profile(s).")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from common.sync import prune_tombstones, retention
+
+
+class Command(BaseCommand):
+    help = "Delete delta-sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(f"deleted {deleted} tombstones older than {retention().days} days")
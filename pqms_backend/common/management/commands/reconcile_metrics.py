@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from common import metrics
+from common.models import Counter
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the domain counters behind /metrics from the tables, drop old daily counters and fold "
+        "the metric files of exited worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-days", type=int, default=30)
+
+    def handle(self, *args, keep_days, **options):
+        metrics.reconcile()
+        folded = metrics.prune_dead()
+        if folded:
+            self.stdout.write(f"folded metric files of {folded} exited process(es)")
+        cutoff = (timezone.localdate() - timedelta(days=keep_days)).isoformat()
+        stale = [c.pk for c in Counter.objects.filter(name__contains=":") if c.name.rsplit(":", 1)[1] < cutoff]
+        Counter.objects.filter(pk__in=stale).delete()
+        for counter in Counter.objects.order_by("name"):
+            self.stdout.write(f"{counter.name} = {counter.value}")
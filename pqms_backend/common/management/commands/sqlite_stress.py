@@ -0,0 +1,103 @@
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction, OperationalError
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrency stress test for SQLite: N writer threads doing read-modify-write transactions "
+        "against a scratch database, with the default options and with SQLITE_CONCURRENT_OPTIONS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--mode", choices=["default", "concurrent", "both"], default="both")
+        parser.add_argument("--min-throughput", type=float, default=0,
+                            help="Fail if the concurrent mode commits fewer transactions per second.")
+
+    def handle(self, *args, writers, seconds, mode, min_throughput, **options):
+        modes = ["default", "concurrent"] if mode == "both" else [mode]
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in modes:
+                opts = settings.SQLITE_CONCURRENT_OPTIONS if name == "concurrent" else {}
+                results[name] = self._run(Path(tmp) / f"{name}.sqlite3", opts, writers, seconds)
+                r = results[name]
+                self.stdout.write(
+                    f"{name:>10}: writers={writers} commits={r['commits']} errors={r['errors']} "
+                    f"throughput={r['throughput']:.1f} tx/s p50={r['p50_ms']:.1f}ms p95={r['p95_ms']:.1f}ms"
+                )
+        concurrent = results.get("concurrent")
+        if concurrent and (concurrent["errors"] or concurrent["throughput"] < min_throughput):
+            raise CommandError("Concurrent SQLite mode did not sustain the requested write load.")
+
+    def _run(self, path, opts, writers, seconds):
+        alias = f"stress_{path.stem}"
+        connections.settings[alias] = {
+            **connections.settings["default"], "ENGINE": "django.db.backends.sqlite3", "NAME": str(path), "OPTIONS": opts,
+        }
+        with connections[alias].cursor() as cursor:
+            cursor.execute("CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)")
+            cursor.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, writer INTEGER, seq INTEGER, value TEXT)")
+            cursor.execute("INSERT INTO counter (id, value) VALUES (1, 0)")
+        connections[alias].close()
+
+        stop = time.monotonic() + seconds
+        lock = threading.Lock()
+        latencies, errors = [], [0]
+
+        def writer(n):
+            conn = connections[alias]
+            seq = 0
+            try:
+                while time.monotonic() < stop:
+                    started = time.perf_counter()
+                    try:
+                        # 自動保存と同じ「読んでから書く」トランザクション
+                        with transaction.atomic(using=alias):
+                            with conn.cursor() as cursor:
+                                cursor.execute("SELECT value FROM counter WHERE id = 1")
+                                value = cursor.fetchone()[0]
+                                cursor.execute("INSERT INTO item (writer, seq, value) VALUES (%s, %s, %s)", [n, seq, "x" * 64])
+                                cursor.execute("UPDATE counter SET value = %s WHERE id = 1", [value + 1])
+                    except OperationalError:
+                        with lock:
+                            errors[0] += 1
+                        continue
+                    seq += 1
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT value FROM counter WHERE id = 1")
+            counter = cursor.fetchone()[0]
+        connections[alias].close()
+        del connections.settings[alias]
+        if counter != len(latencies):
+            raise CommandError(f"Lost updates: counter={counter} commits={len(latencies)}")
+
+        latencies.sort()
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+        return {
+            "commits": len(latencies),
+            "errors": errors[0],
+            "throughput": len(latencies) / seconds,
+            "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+            "p95_ms": pct(0.95),
+        }
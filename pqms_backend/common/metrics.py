@@ -0,0 +1,271 @@
+import fcntl
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils import timezone
+
+from . import counters
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+HELP = {
+    "pqms_http_request_duration_seconds": ("histogram", "Request latency by view and method."),
+    "pqms_http_requests_total": ("counter", "Requests by view, method and status class."),
+    "pqms_db_queries_per_request": ("histogram", "Database queries issued per request."),
+    "pqms_cache_requests_total": ("counter", "Application cache lookups by cache and result."),
+}
+
+
+class Registry:
+    """Per-process metric values, periodically written to METRICS_DIR/<pid>.json.
+
+    Every worker process of a gunicorn/uvicorn deployment writes its own file and the scrape merges
+    them, so /metrics reports the whole server no matter which worker answers it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.last_flush = 0.0
+        self.pid = None
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] += value
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = {"buckets": list(buckets), "counts": [0] * (len(buckets) + 1), "sum": 0.0}
+            hist["counts"][bisect_left(buckets, value)] += 1
+            hist["sum"] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                "histograms": [[name, list(labels), dict(h, counts=list(h["counts"]))] for (name, labels), h in self.histograms.items()],
+            }
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0):
+            return
+        self.last_flush = now
+        if self.pid != os.getpid():
+            # first flush of this process: fold the files of exited workers (and of an earlier
+            # process with the same pid, which would otherwise be overwritten)
+            self.pid = os.getpid()
+            prune_dead(include_own=True)
+        directory = metrics_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / f".{os.getpid()}.json.tmp"
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, directory / f"{os.getpid()}.json")
+
+
+registry = Registry()
+
+
+def metrics_dir():
+    return Path(getattr(settings, "METRICS_DIR", Path(settings.BASE_DIR) / ".metrics"))
+
+
+def enabled():
+    return getattr(settings, "METRICS_ENABLED", False)
+
+
+def record_cache(cache_name, hit):
+    """Count an application cache lookup (reported as a hit ratio per cache)."""
+    if enabled():
+        registry.inc("pqms_cache_requests_total", {"cache": cache_name, "result": "hit" if hit else "miss"})
+
+
+# values of exited worker processes, folded together so that counters never go backwards
+RETIRED = "retired.json"
+
+
+def _locked(exclusive):
+    """Serialises pruning against scrapes, so neither sees a value twice or not at all."""
+    directory = metrics_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    lock = open(directory / ".lock", "w")
+    fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    return lock
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # exists, owned by someone else
+        return True
+    return True
+
+
+def _merge(paths):
+    merged_counters = defaultdict(float)
+    merged_histograms = {}
+    for path in paths:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in data["counters"]:
+            merged_counters[(name, tuple(tuple(l) for l in labels))] += value
+        for name, labels, hist in data["histograms"]:
+            key = (name, tuple(tuple(l) for l in labels))
+            target = merged_histograms.setdefault(key, {"buckets": hist["buckets"], "counts": [0] * len(hist["counts"]), "sum": 0.0})
+            target["counts"] = [a + b for a, b in zip(target["counts"], hist["counts"])]
+            target["sum"] += hist["sum"]
+    return merged_counters, merged_histograms
+
+
+def prune_dead(include_own=False):
+    """Fold the files of exited worker processes into RETIRED and delete them; returns how many.
+
+    Without this, recycled workers leave one file per pid behind forever.
+    """
+    directory = metrics_dir()
+    with _locked(exclusive=True):
+        dead = [
+            path for path in directory.glob("*.json") if path.stem.isdigit()
+            and (not _alive(int(path.stem)) or (include_own and int(path.stem) == os.getpid()))
+        ]
+        if not dead:
+            return 0
+        merged_counters, merged_histograms = _merge([directory / RETIRED] + dead)
+        data = {
+            "counters": [[name, list(labels), value] for (name, labels), value in merged_counters.items()],
+            "histograms": [[name, list(labels), hist] for (name, labels), hist in merged_histograms.items()],
+        }
+        tmp = directory / f".{RETIRED}.tmp"
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, directory / RETIRED)
+        for path in dead:
+            path.unlink(missing_ok=True)
+    return len(dead)
+
+
+def collect():
+    """Merge the files of all worker processes (and of retired ones) with this process's live values."""
+    registry.flush(force=True)
+    with _locked(exclusive=False):
+        return _merge(metrics_dir().glob("*.json"))
+
+
+def _labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+def render():
+    merged_counters, merged_histograms = collect()
+    lines = []
+    names = sorted({name for name, _ in merged_counters} | {name for name, _ in merged_histograms})
+    for name in names:
+        kind, text = HELP.get(name, ("untyped", name))
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+        for (metric, labels), value in sorted(merged_counters.items()):
+            if metric == name:
+                lines.append(f"{name}{_labels(labels)} {value:g}")
+        for (metric, labels), hist in sorted(merged_histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(hist["buckets"] + ["+Inf"], hist["counts"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {hist['sum']:g}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+
+    # domain gauges come from counters maintained on write: one indexed lookup per scrape
+    today = counters.daily("ng_items")
+    domain = counters.values("executions_running", today, "upload_bytes")
+    for name, kind, text, value in [
+        ("pqms_executions_running", "gauge", "Executions currently in running status.", domain["executions_running"]),
+        ("pqms_ng_items_today", "gauge", "Item results judged NG today (local time).", domain[today]),
+        ("pqms_upload_bytes_total", "counter", "Bytes of execution photos uploaded.", domain["upload_bytes"]),
+    ]:
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Record request latency and query counts per view (METRICS_ENABLED)."""
+
+    def __init__(self, get_response):
+        if not enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = _QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(queries))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name or match.route) if match else "unmatched"
+        if view != "metrics":
+            labels = {"view": view, "method": request.method}
+            registry.observe("pqms_http_request_duration_seconds", labels, elapsed, LATENCY_BUCKETS)
+            registry.observe("pqms_db_queries_per_request", labels, queries.count, QUERY_BUCKETS)
+            registry.inc("pqms_http_requests_total", dict(labels, status=f"{response.status_code // 100}xx"))
+            registry.flush()
+        return response
+
+
+def reconcile():
+    """Recompute the domain counters from the tables (drift repair; not used on the scrape path)."""
+    from executions.models import Execution, ExecutionItemResult, ExecutionPhoto
+
+    today = timezone.localdate()
+    counters.set_value("executions_running", Execution.objects.filter(status="running").count())
+    counters.set_value(counters.daily("ng_items", today), ExecutionItemResult.objects.filter(
+        status="NG", created_at__date=today).count())
+    total = 0
+    for name in ExecutionPhoto.objects.exclude(image="").values_list("image", flat=True).iterator():
+        try:
+            total += ExecutionPhoto._meta.get_field("image").storage.size(name)
+        except OSError:
+            continue
+    counters.set_value("upload_bytes", total)
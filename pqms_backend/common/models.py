@@ -12,3 +12,18 @@ class OwnedModel(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="%(class)s_owned")
     class Meta:
         abstract = True
+
+class Counter(models.Model):
+    """Named running total maintained on write, so dashboards and /metrics never COUNT(*) big tables."""
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    def __str__(self): return f"{self.name}={self.value}"
+
+class Tombstone(models.Model):
+    """Deletion log for delta sync: which row of which model disappeared, and when."""
+    model = models.CharField(max_length=100)  # app_label.model_name
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    class Meta:
+        indexes = [models.Index(fields=["model","deleted_at"])]
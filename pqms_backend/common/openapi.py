@@ -0,0 +1,17 @@
+"""drf-spectacular schema generator; imported only while a schema is built (see common/schema.py).
+
+REST_FRAMEWORK's DEFAULT_SCHEMA_CLASS is DRF's base ``ViewInspector``. The router looks up every
+viewset's ``schema`` while building the URLs, and pointing the setting at drf-spectacular would
+import it on every start. This generator gives each view drf-spectacular's ``AutoSchema`` instead.
+Views that need ``@extend_schema`` should set ``schema = AutoSchema()`` themselves.
+"""
+from drf_spectacular.generators import SchemaGenerator as BaseSchemaGenerator
+from drf_spectacular.openapi import AutoSchema
+
+
+class SchemaGenerator(BaseSchemaGenerator):
+    def create_view(self, callback, method, request=None):
+        view = super().create_view(callback, method, request)
+        if not isinstance(view.schema, AutoSchema):
+            self._set_schema_to_view(view, AutoSchema())
+        return view
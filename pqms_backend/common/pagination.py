@@ -0,0 +1,147 @@
+"""Page-number pagination with cheaper counts.
+
+``PageNumberPagination`` runs an exact ``COUNT(*)`` with every filter for every page. Here the count
+mode is chosen per viewset (``pagination_count = "estimate"``), per request (``?count=``) or by
+PAGINATION_COUNT_MODE:
+
+- ``exact``: plain COUNT(*), as before;
+- ``cached``: COUNT(*) cached per query (SQL and parameters) for PAGINATION_COUNT_CACHE_SECONDS;
+- ``estimate``: the planner's row estimate (PostgreSQL) or the primary-key span of an unfiltered
+  table (SQLite). Small results (below PAGINATION_ESTIMATE_THRESHOLD) and queries that cannot be
+  estimated fall back to ``cached``.
+
+Responses carry ``count_is_approximate``. When it is true, pages are not checked against the
+count: a page is fetched with one extra row to tell whether there is a next one.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from . import metrics
+
+COUNT_MODES = ("exact", "cached", "estimate")
+
+
+def _cached_count(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha1(f"{queryset.db}\n{sql}\n{params!r}".encode()).hexdigest()
+    key = f"page_count:{digest}"
+    count = cache.get(key)
+    metrics.record_cache("page_count", count is not None)
+    if count is not None:
+        return count, True
+    count = queryset.count()
+    cache.set(key, count, settings.PAGINATION_COUNT_CACHE_SECONDS)
+    return count, False
+
+
+def _estimated_count(queryset):
+    """Row estimate without scanning, or None when the database cannot give one cheaply."""
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        plan = json.loads(queryset.explain(format="json"))
+        # a list of one plan, or the plan itself depending on the driver (psycopg 3 decodes the json)
+        plan = plan[0] if isinstance(plan, list) else plan
+        return int(plan["Plan"]["Plan Rows"])
+    if vendor == "sqlite" and not queryset.query.where and not queryset.query.distinct:
+        # both ends of the rowid b-tree; deleted rows make this an over-estimate
+        span = queryset.model._default_manager.using(queryset.db).aggregate(low=Min("pk"), high=Max("pk"))
+        return span["high"] - span["low"] + 1 if span["high"] is not None else 0
+    return None
+
+
+class _ApproximatePage(Page):
+    def __init__(self, object_list, number, paginator, more):
+        super().__init__(object_list, number, paginator)
+        self.more = more
+
+    def has_next(self):
+        return self.more
+
+    # the count may be off, so neighbours are not validated against it
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class CountingPaginator(Paginator):
+    def __init__(self, object_list, per_page, count_mode="exact", **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_mode = count_mode
+        self.count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        if self.count_mode == "exact" or not hasattr(self.object_list, "query"):
+            return super().count
+        queryset = self.object_list.order_by()
+        if self.count_mode == "estimate":
+            estimate = _estimated_count(queryset)
+            if estimate is not None and estimate >= settings.PAGINATION_ESTIMATE_THRESHOLD:
+                self.count_is_approximate = True
+                return estimate
+        count, self.count_is_approximate = _cached_count(queryset)
+        return count
+
+    def page(self, number):
+        self.count  # decides whether the count is approximate
+        if not self.count_is_approximate:
+            return super().page(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return _ApproximatePage(rows[:self.per_page], number, self, more=len(rows) > self.per_page)
+
+
+class EstimatedCountPaginator(CountingPaginator):
+    """For ``ModelAdmin.paginator``: admin change lists of large tables without a full COUNT(*)."""
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True):
+        super().__init__(object_list, per_page, count_mode="estimate", orphans=orphans,
+                         allow_empty_first_page=allow_empty_first_page)
+
+
+class CountingPagination(PageNumberPagination):
+    """Default pagination: adds ``?count=exact|cached|estimate`` and ``count_is_approximate``."""
+    count_query_param = "count"
+
+    def django_paginator_class(self, object_list, per_page, **kwargs):
+        return CountingPaginator(object_list, per_page, count_mode=self.count_mode, **kwargs)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        mode = request.query_params.get(self.count_query_param)
+        if mode not in COUNT_MODES:
+            mode = getattr(view, "pagination_count", None) or settings.PAGINATION_COUNT_MODE
+        self.count_mode = mode
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.page.paginator.count,
+            "count_is_approximate": self.page.paginator.count_is_approximate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["count_is_approximate"] = {"type": "boolean", "example": False}
+        return schema
@@ -0,0 +1,86 @@
+import cProfile
+import json
+import random
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+
+def profile_dir():
+    return Path(getattr(settings, "PROFILE_DIR", Path(settings.BASE_DIR) / "profiles"))
+
+
+def stored_profiles():
+    """Metadata of the saved profiles, newest first."""
+    entries = []
+    for meta in profile_dir().glob("*.json"):
+        try:
+            entries.append(json.loads(meta.read_text()))
+        except (OSError, ValueError):
+            continue
+    return sorted(entries, key=lambda e: e["timestamp"], reverse=True)
+
+
+class ProfilingMiddleware:
+    """Run selected requests under cProfile and save the stats with request metadata (PROFILING_ENABLED).
+
+    Only staff users are profiled: on demand with ``X-Profile: 1`` / ``?_profile=1``, or at random
+    with PROFILE_SAMPLE_RATE. Profiles go to PROFILE_DIR; inspect them with ``manage.py profiles``.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        # DRF replaces request.user during the view, so remember who asked for the profile
+        username = request.user.get_username()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+
+        profile_id = f"{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(directory / f"{profile_id}.prof"))
+        match = getattr(request, "resolver_match", None)
+        (directory / f"{profile_id}.json").write_text(json.dumps({
+            "id": profile_id,
+            "timestamp": timezone.now().isoformat(),
+            "method": request.method,
+            "path": request.path,
+            "query_string": request.META.get("QUERY_STRING", ""),
+            "route": match.route if match else None,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 1),
+            "user": username,
+            "trigger": trigger,
+        }, ensure_ascii=False))
+        response["X-Profile-Id"] = profile_id
+        return response
+
+    def _trigger(self, request):
+        user = getattr(request, "user", None)
+        if user is None or not user.is_staff:
+            return None
+        if request.headers.get("X-Profile") == "1" or request.GET.get("_profile") == "1":
+            return "request"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
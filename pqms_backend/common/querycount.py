@@ -0,0 +1,88 @@
+from contextlib import ExitStack
+
+from django.db import connections
+from django.test import Client
+
+from common import datagen
+from common.timing import RequestMetrics
+from executions.models import ExecutionItemResult, ExecutionPhoto
+from jobs.models import Job
+
+
+def discover_endpoints():
+    """Yield (label, kind, viewset, url_template) for every GET endpoint registered on the API router.
+
+    ``url_template`` contains ``{pk}`` for detail routes.
+    """
+    from pqms.urls import router
+
+    for prefix, viewset, basename in router.registry:
+        base = f"/api/{prefix}/"
+        if hasattr(viewset, "list"):
+            yield f"{basename}-list", "list", viewset, base + getattr(viewset, "querycount_params", "")
+        if hasattr(viewset, "retrieve"):
+            yield f"{basename}-detail", "detail", viewset, base + "{pk}/"
+        for extra in viewset.get_extra_actions():
+            if "get" not in extra.mapping:
+                continue
+            if extra.detail:
+                yield f"{basename}-{extra.url_path}", "detail", viewset, base + "{pk}/" + extra.url_path + "/"
+            else:
+                yield f"{basename}-{extra.url_path}", "list", viewset, base + extra.url_path + "/"
+
+
+def seed_round(size, seed):
+    """Add a batch of rows to every table; later rounds also have larger nested collections."""
+    datagen.generate(
+        seed=seed, users=1, categories=size, check_items=size * 5, checklists=size, items_per_checklist=size * 2,
+        process_sheets=size, executions=size * 2, tasks=size,
+    )
+    item_ids = ExecutionItemResult.objects.order_by("-id").values_list("id", flat=True)[:size * 3]
+    ExecutionPhoto.objects.bulk_create(
+        ExecutionPhoto(item_result_id=item_id, image=f"execution_photos/qc-{item_id}.jpg") for item_id in item_ids
+    )
+    Job.objects.bulk_create(Job(name="querycount.seed", payload={"n": n}) for n in range(size))
+
+
+def latest_pk(viewset):
+    return viewset.queryset.model.objects.order_by("-pk").values_list("pk", flat=True).first()
+
+
+def measure(client, url):
+    metrics = RequestMetrics()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(metrics))
+        response = client.get(url)
+    return response.status_code, metrics
+
+
+def check(rounds=(2, 6), only=None):
+    """Measure every endpoint after each seeding round.
+
+    Returns a list of dicts with the per-round query counts. ``ok`` is False when the query count
+    grew with the number of rows.
+    """
+    client = Client()
+    endpoints = [e for e in discover_endpoints() if not only or any(o in e[0] for o in only)]
+    measurements = {label: [] for label, *_ in endpoints}
+    for n, size in enumerate(rounds):
+        seed_round(size, seed=1000 + n)
+        for label, kind, viewset, template in endpoints:
+            url = template.format(pk=latest_pk(viewset))
+            status, metrics = measure(client, url)
+            measurements[label].append((status, metrics))
+
+    report = []
+    for label, kind, viewset, template in endpoints:
+        statuses = {status for status, _ in measurements[label]}
+        counts = [metrics.queries for _, metrics in measurements[label]]
+        entry = {"endpoint": label, "url": template, "statuses": sorted(statuses), "queries": counts}
+        if statuses != {200}:
+            entry.update(ok=None, skipped=f"HTTP {sorted(statuses)}")
+        else:
+            entry["ok"] = counts[-1] <= counts[0]
+            if not entry["ok"]:
+                entry["repeated_sql"] = measurements[label][-1][1].top_statements(limit=5)
+        report.append(entry)
+    return report
@@ -0,0 +1,28 @@
+import orjson
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+_default = JSONEncoder().default
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer on top of orjson, producing the same output as DRF's encoder.
+
+    Datetimes, Decimals, lazy translation strings etc. go through DRF's ``JSONEncoder.default``,
+    so they render exactly as before. Indented output (browsable API, ``; indent=`` media type
+    parameter) falls back to the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder still handles
+            return super().render(data, accepted_media_type, renderer_context)
+        # same \u2028/\u2029 escaping as JSONRenderer, so the output stays a JavaScript subset
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
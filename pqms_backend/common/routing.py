@@ -0,0 +1,87 @@
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_ALIAS = "replica"
+PIN_COOKIE = "pqms_primary_until"
+
+_route = ContextVar("pqms_db_route", default=None)
+
+
+def replica_available():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+class ReplicaRouter:
+    """Send reads to the replica only while a designated read-only view is running."""
+
+    def db_for_read(self, model, **hints):
+        if _route.get() == REPLICA_ALIAS and replica_available():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """Route safe requests of views listed in ``replica_actions`` to the replica.
+
+    Viewsets opt in per action, e.g. ``replica_actions = {"list", "progress"}``. After a client
+    writes, its reads stay on the primary for REPLICA_STICKY_SECONDS (read-your-writes), and
+    ``X-Read-From: primary`` / ``?read_from=primary`` forces the primary for a single request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+
+    def __call__(self, request):
+        token = _route.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _route.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_available():
+            self._pin(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in SAFE_METHODS or not replica_available():
+            return None
+        actions = getattr(view_func, "actions", None) or {}
+        action = actions.get(request.method.lower())
+        replica_actions = getattr(getattr(view_func, "cls", None), "replica_actions", ())
+        if action in replica_actions and not self._wants_primary(request):
+            _route.set(REPLICA_ALIAS)
+        return None
+
+    def _wants_primary(self, request):
+        if "primary" in (request.headers.get("X-Read-From", ""), request.GET.get("read_from", "")):
+            return True
+        now = time.time()
+        try:
+            if float(request.COOKIES.get(PIN_COOKIE, 0)) > now:
+                return True
+        except ValueError:
+            pass
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return (cache.get(f"replica:pin:{user.pk}") or 0) > now
+        return False
+
+    def _pin(self, request, response):
+        until = time.time() + self.sticky_seconds
+        response.set_cookie(PIN_COOKIE, f"{until:.3f}", max_age=self.sticky_seconds, httponly=True, samesite="Lax")
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            cache.set(f"replica:pin:{user.pk}", until, self.sticky_seconds)
@@ -0,0 +1,136 @@
+"""OpenAPI schema served from a file instead of being generated per request.
+
+drf-spectacular introspects every viewset and serializer to build the schema, and importing it
+pulls in a large part of its package. Both now happen at most once per code version:
+``python manage.py build_schema`` writes the schema at deploy time, and the first request after a
+code change builds it otherwise. The files live in SCHEMA_DIR, named after ``code_version()``, a
+hash of the Python sources of the project package and its apps, the drf-spectacular version and
+SPECTACULAR_SETTINGS.
+``/api/schema/`` answers with an ETag for that version, so unchanged schemas are ``304``s.
+
+drf-spectacular is only imported inside ``build()`` and ``docs_view``, never at startup (see
+common/openapi.py).
+"""
+import hashlib
+import os
+import tempfile
+from importlib.metadata import version as package_version
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition, require_GET
+
+# ?format= -> (file suffix, content type); YAML stays the default as with SpectacularAPIView
+FORMATS = {
+    "yaml": ("yaml", "application/vnd.oai.openapi; charset=utf-8"),
+    "json": ("json", "application/vnd.oai.openapi+json; charset=utf-8"),
+}
+SKIP_DIRS = {"migrations", "media", "static", "node_modules", "__pycache__"}
+
+_version = None
+_files = {}  # (version, format) -> bytes
+_docs = None
+
+
+def _source_roots(base):
+    """The project package and the installed apps under BASE_DIR; virtualenvs and other checkouts
+    lying around in BASE_DIR are not part of the code."""
+    roots = {base / settings.ROOT_URLCONF.split(".")[0]}
+    roots.update(Path(config.path) for config in apps.get_app_configs() if Path(config.path).is_relative_to(base))
+    return sorted(roots)
+
+
+def code_version():
+    """Digest of everything the schema depends on; computed once per process."""
+    global _version
+    if _version is None:
+        digest = hashlib.sha256()
+        digest.update(package_version("drf-spectacular").encode())
+        digest.update(repr(sorted(settings.SPECTACULAR_SETTINGS.items())).encode())
+        base = Path(settings.BASE_DIR)
+        for root in _source_roots(base):
+            for directory, dirs, files in os.walk(root):
+                dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+                for filename in sorted(files):
+                    if filename.endswith(".py"):
+                        path = Path(directory) / filename
+                        digest.update(path.relative_to(base).as_posix().encode())
+                        digest.update(path.read_bytes())
+        _version = digest.hexdigest()[:16]
+    return _version
+
+
+def schema_path(fmt):
+    return Path(settings.SCHEMA_DIR) / f"openapi-{code_version()}.{FORMATS[fmt][0]}"
+
+
+def build():
+    """Generate the schema in every format for the current code version; returns the paths."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=True)
+    rendered = {
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+        "json": OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+    directory = Path(settings.SCHEMA_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for fmt, content in rendered.items():
+        path = schema_path(fmt)
+        # write and rename, so that other processes never read a half-written file
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as f:
+            f.write(content)
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, path)
+        paths.append(path)
+    for old in directory.glob("openapi-*"):
+        if old not in paths:
+            old.unlink(missing_ok=True)
+    return paths
+
+
+def schema_bytes(fmt):
+    key = (code_version(), fmt)
+    if key not in _files:
+        path = schema_path(fmt)
+        if not path.exists():
+            build()
+        _files[key] = path.read_bytes()
+    return _files[key]
+
+
+def _format(request):
+    fmt = request.GET.get("format")
+    if fmt in FORMATS:
+        return fmt
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+def _etag(request):
+    return f'"{code_version()}-{_format(request)}"'
+
+
+@require_GET
+@condition(etag_func=_etag)
+def schema_view(request):
+    fmt = _format(request)
+    response = HttpResponse(schema_bytes(fmt), content_type=FORMATS[fmt][1])
+    # clients keep their copy and revalidate it with If-None-Match
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+def docs_view(request, *args, **kwargs):
+    """Swagger UI for ``/api/schema/``, importing drf-spectacular on first use."""
+    global _docs
+    if _docs is None:
+        from drf_spectacular.views import SpectacularSwaggerView
+
+        _docs = SpectacularSwaggerView.as_view(url_name="schema")
+    return _docs(request, *args, **kwargs)
@@ -0,0 +1,41 @@
+"""Generation stamps for cached results.
+
+Writers ``bump()`` a stamp when the data behind it changes; readers put ``current()`` into their
+cache keys, so entries computed before the change are simply never read again (and expire).
+Stamps live in the ``stamps`` cache, which must be shared between worker processes and must not
+evict entries (see CACHES in settings).
+
+A bump stores a new random value rather than incrementing, so a stamp never returns to a value
+that older cache keys were built with, even if it was lost in between or two processes bump it at
+the same time. A missing stamp reads as ``None``, meaning "do not use cached results": it is set to
+a fresh value on that read, so the next read can cache again.
+"""
+import uuid
+
+from django.core.cache import caches
+from django.db import transaction
+
+
+def _key(name):
+    return f"stamp:{name}"
+
+
+def _bump(names):
+    caches["stamps"].set_many({_key(name): uuid.uuid4().hex for name in names}, None)
+
+
+def bump(*names):
+    """Advance the given stamps once the surrounding transaction commits."""
+    names = set(names)
+    if names:
+        transaction.on_commit(lambda: _bump(names))
+
+
+def current(*names):
+    """The stamps of ``names``, ``None`` for each one that was missing."""
+    cache = caches["stamps"]
+    found = cache.get_many([_key(name) for name in names])
+    missing = [name for name in names if _key(name) not in found]
+    for name in missing:
+        cache.add(_key(name), uuid.uuid4().hex, None)
+    return tuple(found.get(_key(name)) for name in names)
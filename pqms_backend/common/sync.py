@@ -0,0 +1,117 @@
+"""Delta sync of master data for tablets.
+
+``GET /api/sync/master/?sync_token=<token>`` returns the rows of every synced model whose
+``updated_at`` is newer than the token, plus the ids deleted since then (from ``Tombstone``),
+and a new token for the next call. Without a token, or with one older than the tombstone
+retention, the full dataset is returned with ``"full": true`` and the client replaces its copy.
+
+Only active process sheets are synced: a sheet that moved to ``done`` is reported as deleted.
+The token is a timestamp taken a few seconds before the queries run, so rows committed by a
+transaction that was still open at that moment are sent again next time rather than missed;
+clients upsert by id, so the overlap is harmless.
+"""
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.db.models.signals import post_delete, pre_delete
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import permissions, serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Tombstone
+
+# response key -> (model label, fields, filter for rows the tablet keeps)
+SYNCED = {
+    "categories": ("master.Category", ["id", "name", "description", "updated_at"], None),
+    "check_items": ("master.CheckItem", [
+        "id", "name", "type", "category_id", "required", "unit", "description", "options", "tags",
+        "min_value", "max_value", "decimal_places", "default_value", "error_message", "allow_handwriting",
+        "reference_image", "updated_at",
+    ], None),
+    "checklists": ("checklists.Checklist", ["id", "name", "description", "category_id", "updated_at"], None),
+    "checklist_items": ("checklists.ChecklistItem", [
+        "id", "checklist_id", "check_item_id", "order", "required", "instruction", "unit", "options", "updated_at",
+    ], None),
+    "process_sheets": ("processes.ProcessSheet", [
+        "id", "name", "project_name", "status", "priority", "assignee", "planned_start", "planned_end",
+        "checklist_id", "notes", "lot_number", "inspector", "progress", "updated_at",
+    ], {"status__in": ["planning", "preparing", "running"]}),
+}
+
+OVERLAP = timedelta(seconds=5)
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def record_deletion(sender, instance, **kwargs):
+    Tombstone.objects.create(model=_label(sender), object_id=instance.pk)
+
+
+def touch_dependents(sender, instance, **kwargs):
+    # SET_NULL is a plain UPDATE that leaves updated_at alone; bump it so the change is synced
+    labels = {label.lower() for label, _, _ in SYNCED.values()}
+    for rel in sender._meta.related_objects:
+        if rel.on_delete is models.SET_NULL and _label(rel.related_model) in labels:
+            rel.related_model.objects.filter(**{rel.field.name: instance}).update(updated_at=timezone.now())
+
+
+def connect_signals():
+    for label, _, _ in SYNCED.values():
+        model = apps.get_model(label)
+        pre_delete.connect(touch_dependents, sender=model, dispatch_uid=f"sync-touch:{label}")
+        post_delete.connect(record_deletion, sender=model, dispatch_uid=f"tombstone:{label}")
+
+
+def retention():
+    return timedelta(days=getattr(settings, "SYNC_TOMBSTONE_RETENTION_DAYS", 90))
+
+
+def prune_tombstones():
+    return Tombstone.objects.filter(deleted_at__lt=timezone.now() - retention()).delete()[0]
+
+
+def changes_since(since=None):
+    token = timezone.now() - OVERLAP
+    full = since is None or since < timezone.now() - retention()
+    changes, deleted = {}, {}
+    for key, (label, fields, active) in SYNCED.items():
+        model = apps.get_model(label)
+        rows = model.objects.order_by("id")
+        if not full:
+            rows = rows.filter(updated_at__gt=since)
+        if active:
+            if not full:
+                # rows that changed and are no longer active leave the tablet like deleted ones
+                deleted[key] = list(rows.exclude(**active).values_list("id", flat=True))
+            rows = rows.filter(**active)
+        changes[key] = list(rows.values(*fields))
+        if not full:
+            deleted[key] = deleted.get(key, []) + list(
+                Tombstone.objects.filter(model=_label(model), deleted_at__gt=since)
+                .order_by("object_id").values_list("object_id", flat=True).distinct()
+            )
+    return {"sync_token": token.isoformat().replace("+00:00", "Z"), "full": full, "changes": changes, "deleted": deleted}
+
+
+class MasterSyncView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        raw = request.query_params.get("sync_token") or request.query_params.get("updated_since")
+        since = None
+        if raw:
+            try:
+                since = parse_datetime(raw)
+            except ValueError:  # well formed but out of range, e.g. month 13
+                since = None
+            if since is None:
+                raise serializers.ValidationError({"sync_token": "日時の形式が正しくありません。"})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        return Response(changes_since(since))
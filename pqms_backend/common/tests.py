@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import benchmark, metrics, querycount
+
+# computed reports must not leak into (or come from) the shared file cache
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "stamps": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "stamps"},
+}
+
+
+class MasterSyncTokenTests(TestCase):
+    def test_invalid_tokens_are_rejected(self):
+        client = APIClient()
+        for token in ("yesterday", "2026-13-45T00:00:00"):
+            response = client.get("/api/sync/master/", {"sync_token": token})
+            self.assertEqual(response.status_code, 400, token)
+
+    def test_valid_token_returns_changes(self):
+        token = (timezone.now() - timedelta(days=1)).isoformat()
+        response = APIClient().get("/api/sync/master/", {"sync_token": token})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["full"])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class QueryCountTests(TestCase):
+    def test_query_counts_do_not_grow_with_rows(self):
+        report = querycount.check(rounds=[1, 3])
+        growing = [entry["endpoint"] for entry in report if entry["ok"] is False]
+        self.assertEqual(growing, [])
+        self.assertTrue(any(entry["ok"] for entry in report))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProjectionTests(TestCase):
+    def test_projections_match_their_serializers(self):
+        querycount.seed_round(3, seed=1)
+        out = StringIO()
+        # raises CommandError when a projection differs from its serializer
+        call_command("check_projections", "--current-db", "--rows", "20", "--repeat", "1", stdout=out)
+        self.assertIn("OK", out.getvalue())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class BenchmarkScenarioTests(TestCase):
+    def test_every_scenario_answers(self):
+        querycount.seed_round(2, seed=1)
+        ids = benchmark.scenario_ids()
+        for name, template in benchmark.SCENARIOS:
+            with self.subTest(name):
+                # raises unless the endpoint answers 200
+                result = benchmark.run_client(template.format(**ids), repeat=1, warmup=0)
+                self.assertGreater(result["bytes"], 0)
+
+
+class MetricsPruneTests(TestCase):
+    def test_files_of_exited_workers_are_folded(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=Path(directory)):
+            exited = subprocess.Popen(["true"])
+            exited.wait()
+            for pid, value in ((exited.pid, 2), (os.getppid(), 3)):
+                (Path(directory) / f"{pid}.json").write_text(json.dumps({
+                    "counters": [["pqms_http_requests_total", [["view", "x"]], value]], "histograms": [],
+                }))
+            def files():
+                return metrics._merge(Path(directory).glob("*.json"))[0]
+
+            before = files()
+
+            self.assertEqual(metrics.prune_dead(), 1)
+            self.assertFalse((Path(directory) / f"{exited.pid}.json").exists())
+            self.assertTrue((Path(directory) / f"{os.getppid()}.json").exists())
+            self.assertEqual(files(), before)
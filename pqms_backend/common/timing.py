@@ -0,0 +1,147 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger("pqms.slow_requests")
+
+_current = ContextVar("pqms_request_metrics", default=None)
+
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Normalise a statement so that the same query with different parameters groups together."""
+    sql = _IN_LIST.sub("(...)", sql)
+    sql = _LITERAL.sub("?", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def current_metrics():
+    return _current.get()
+
+
+class RequestMetrics:
+    """Per-request counters, also installed as an execute_wrapper on every database connection."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def top_statements(self, limit=5):
+        grouped = Counter()
+        for sql, count in self.statements.items():
+            grouped[fingerprint(sql)] += count
+        return [{"sql": sql, "count": count} for sql, count in grouped.most_common(limit) if count > 1]
+
+
+def _instrument_serializers():
+    """Accumulate time spent in ``serializer.data`` (nested serializers included) on the current request."""
+    original = BaseSerializer.data.fget
+    if getattr(original, "_pqms_timed", False):
+        return
+
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing:
+            return original(self)
+        metrics.serializing = True
+        started = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            metrics.serialize_time += time.perf_counter() - started
+            metrics.serializing = False
+
+    data._pqms_timed = True
+    BaseSerializer.data = property(data)
+
+
+class RequestTimingMiddleware:
+    """Opt-in (REQUEST_TIMING_ENABLED) query count and timing headers plus a slow-request log.
+
+    Adds ``Server-Timing`` and ``X-Query-Count`` to every response and logs requests slower than
+    SLOW_REQUEST_MS or issuing more than SLOW_REQUEST_QUERIES queries to ``pqms.slow_requests``.
+    When disabled the middleware removes itself at startup, so it costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_TIMING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "SLOW_REQUEST_MS", 500)
+        self.slow_queries = getattr(settings, "SLOW_REQUEST_QUERIES", 50)
+        _instrument_serializers()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        request._timing_marks = {}
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        marks = request._timing_marks
+        view = marks.get("view_end", started + total) - marks.get("view_start", started)
+        render = started + total - marks["view_end"] if "view_end" in marks else 0.0
+        response["X-Query-Count"] = str(metrics.queries)
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+            f"serialize;dur={metrics.serialize_time * 1000:.1f}",
+            f"view;dur={view * 1000:.1f}",
+            f"render;dur={render * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ])
+
+        if total * 1000 >= self.slow_ms or metrics.queries >= self.slow_queries:
+            match = getattr(request, "resolver_match", None)
+            logger.warning(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "route": match.route if match else None,
+                "status": response.status_code,
+                "total_ms": round(total * 1000, 1),
+                "view_ms": round(view * 1000, 1),
+                "render_ms": round(render * 1000, 1),
+                "db_ms": round(metrics.db_time * 1000, 1),
+                "serialize_ms": round(metrics.serialize_time * 1000, 1),
+                "queries": metrics.queries,
+                "top_repeated_sql": metrics.top_statements(),
+            }, ensure_ascii=False))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._timing_marks["view_start"] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this hook, so view and render time can be told apart
+        request._timing_marks["view_end"] = time.perf_counter()
+        return response
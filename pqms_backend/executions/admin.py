@@ -1,13 +1,94 @@
 
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import Case, When
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+
+from common.pagination import EstimatedCountPaginator
+from . import review
+from .archive import archived_progress_results
 from .models import Execution, ExecutionItemResult, ExecutionPhoto
 
-class ExecutionItemInline(admin.TabularInline):
-    model = ExecutionItemResult
-    extra = 0
+# change pages show at most this many item results; the rest is one click away in the item result list
+SUMMARY_ROWS = 50
 
 @admin.register(Execution)
 class ExecutionAdmin(admin.ModelAdmin):
-    inlines = [ExecutionItemInline]
-    list_display = ("id","checklist","process_sheet","executor","status","result","created_at")
-admin.site.register(ExecutionPhoto)
+    list_display = ("id","checklist","process_sheet","executor","status","result","archived_at","created_at")
+    list_select_related = ("checklist","process_sheet","executor")
+    # indexed columns only (status, archived_at); FK filters would load every option
+    list_filter = ("status", ("archived_at", admin.EmptyFieldListFilter))
+    search_fields = ("=id", "process_sheet__lot_number__exact")
+    ordering = ("-id",)
+    raw_id_fields = ("checklist","process_sheet","executor")
+    readonly_fields = ("client_uuid","archived_at","item_results_summary","created_at","updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["approve", "rejudge"]
+
+    @admin.display(description="項目結果")
+    def item_results_summary(self, obj):
+        if obj.pk is None:
+            return "-"
+        # NG first, so problems are visible without scrolling (and never cut off by SUMMARY_ROWS)
+        if obj.archived_at:
+            rows = archived_progress_results(obj)
+            total = len(rows)
+            rows = sorted(rows, key=lambda r: r["status"] != "NG")[:SUMMARY_ROWS]
+        else:
+            results = obj.item_results.select_related("checklist_item__check_item").order_by(
+                Case(When(status="NG", then=0), default=1), "id")
+            total = results.count()
+            rows = [
+                {"item_result_id": r.id, "item_name": r.checklist_item.check_item.name, "status": r.status,
+                 "value": r.value, "note": r.note}
+                for r in results[:SUMMARY_ROWS]
+            ]
+        table = format_html_join(
+            "", "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>",
+            ((r["item_result_id"], r["item_name"], r["status"], r["value"], r["note"]) for r in rows),
+        )
+        link = ""
+        if not obj.archived_at:
+            url = reverse("admin:executions_executionitemresult_changelist") + f"?execution__id__exact={obj.pk}"
+            link = format_html('<p><a href="{}">すべての項目結果 ({} 件)</a></p>', url, total)
+        return format_html("<table><tr><th>ID</th><th>項目</th><th>状態</th><th>値</th><th>備考</th></tr>{}</table>{}", table, link)
+
+    def _bulk(self, request, queryset, action, done):
+        changed, jobs = review.run_or_enqueue(action, queryset)
+        if jobs:
+            self.message_user(request, f"{jobs} 件のジョブに分けて実行します。", messages.INFO)
+        else:
+            self.message_user(request, f"{changed} 件を{done}しました。", messages.SUCCESS)
+
+    @admin.action(description="選択した実行を承認")
+    def approve(self, request, queryset):
+        self._bulk(request, queryset, "approve", "承認")
+
+    @admin.action(description="選択した実行の判定をやり直す")
+    def rejudge(self, request, queryset):
+        self._bulk(request, queryset, "rejudge", "再判定")
+
+
+@admin.register(ExecutionItemResult)
+class ExecutionItemResultAdmin(admin.ModelAdmin):
+    list_display = ("id","execution_id","checklist_item","status","value","created_at")
+    list_select_related = ("checklist_item__check_item",)
+    list_filter = ("status",)  # (status, created_at) index
+    search_fields = ("=id", "=execution__id")
+    ordering = ("-id",)
+    raw_id_fields = ("execution","checklist_item")
+    readonly_fields = ("client_uuid","created_at","updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(ExecutionPhoto)
+class ExecutionPhotoAdmin(admin.ModelAdmin):
+    list_display = ("id","item_result_id","image","created_at")
+    search_fields = ("=id", "=item_result__id")
+    ordering = ("-id",)
+    raw_id_fields = ("item_result",)
+    readonly_fields = ("client_uuid","created_at","updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
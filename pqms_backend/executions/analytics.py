@@ -0,0 +1,164 @@
+"""NG/SKIP Pareto analysis of item results.
+
+``pareto()`` groups NG and SKIP item results of a period by one dimension (check item, checklist,
+category, inspector or process sheet) in SQL and returns the top groups with cumulative
+percentages. Two queries per computation: the top groups and the overall totals. Both are served
+by the (status, created_at) index on ExecutionItemResult, since only NG/SKIP rows of the period are
+read.
+
+Results are cached per parameter set. The cache key contains a generation stamp per month of the
+period, and every write that adds, changes or removes an NG/SKIP result bumps the stamp of that
+result's month (``results_changed``), so a new NG today invalidates this month's reports but
+leaves last year's cached. Changing an execution's executor, checklist or process sheet is only
+picked up when PARETO_CACHE_SECONDS expire.
+
+Archived executions are not included: their results live in ExecutionArchive payloads. When the
+period has archived executions with results of the metric, the report says so with ``partial``,
+the number of those executions and ``archived_until``, the last day with archived executions.
+"""
+import hashlib
+import json
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from common import metrics, stamps
+from .models import Execution, ExecutionItemResult
+
+PARETO_STATUSES = ("NG", "SKIP")
+
+# dimension -> (group id, label)
+DIMENSIONS = {
+    "check_item": ("checklist_item__check_item_id", "checklist_item__check_item__name"),
+    "checklist": ("execution__checklist_id", "execution__checklist__name"),
+    "category": ("checklist_item__check_item__category_id", "checklist_item__check_item__category__name"),
+    "inspector": ("execution__executor_id", "execution__executor__username"),
+    "process": ("execution__process_sheet_id", "execution__process_sheet__name"),
+}
+
+# query parameter -> lookup
+FILTERS = {
+    "check_item": "checklist_item__check_item_id",
+    "checklist": "execution__checklist_id",
+    "category": "checklist_item__check_item__category_id",
+    "inspector": "execution__executor_id",
+    "process_sheet": "execution__process_sheet_id",
+}
+
+
+def _month_stamp(day):
+    return f"ng_results:{day:%Y-%m}"
+
+
+def _months(start, end):
+    """Month stamps of the local dates ``start`` .. ``end`` (inclusive)."""
+    names, day = [], start.replace(day=1)
+    while day <= end:
+        names.append(_month_stamp(day))
+        day = (day + timedelta(days=32)).replace(day=1)
+    return names
+
+
+def results_changed(results, created=False):
+    """Invalidate cached Pareto reports covering ``results`` (call before ``ng_delta`` resets them)."""
+    months = set()
+    for r in results:
+        before = None if created else getattr(r, "_initial_status", None)
+        if r.status in PARETO_STATUSES or before in PARETO_STATUSES:
+            months.add(_month_stamp(timezone.localdate(r.created_at) if r.created_at else timezone.localdate()))
+    stamps.bump(*months)
+
+
+def _bounds(start, end):
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+def pareto(by, start, end, metric="ng", top=20, filters=None):
+    """Top ``top`` groups by ``metric`` ("ng" or "skip") of results created on ``start`` .. ``end``."""
+    filters = {k: v for k, v in (filters or {}).items() if v is not None}
+    params = {"by": by, "date_from": start.isoformat(), "date_to": end.isoformat(), "metric": metric, "top": top,
+              "filters": filters}
+    generations = stamps.current(*_months(start, end))
+    if None in generations:
+        # a lost stamp: cached reports of those months cannot be trusted
+        metrics.record_cache("ng_pareto", False)
+        return {**params, **_compute(by, start, end, metric, top, filters)}
+    digest = hashlib.sha1(json.dumps([params, generations], sort_keys=True).encode()).hexdigest()
+    key = f"ng_pareto:{digest}"
+    report = cache.get(key)
+    metrics.record_cache("ng_pareto", report is not None)
+    if report is None:
+        report = {**params, **_compute(by, start, end, metric, top, filters)}
+        cache.set(key, report, settings.PARETO_CACHE_SECONDS)
+    return report
+
+
+def _archived(since, until, metric, filters):
+    """Executions of the period whose results are archived and therefore missing from the report.
+
+    Goes by the execution's creation time; filters on check items or categories cannot be applied
+    to archives, so those reports are flagged whenever an archived execution might match.
+    """
+    execution_filters = {
+        FILTERS[name][len("execution__"):]: value for name, value in filters.items()
+        if FILTERS[name].startswith("execution__")
+    }
+    archived = Execution.objects.filter(
+        archived_at__isnull=False, created_at__gte=since, created_at__lt=until,
+        **{f"archive__{metric}_count__gt": 0}, **execution_filters,
+    ).aggregate(n=Count("pk"), last=Max("created_at"))
+    return {
+        "partial": bool(archived["n"]),
+        "archived_executions": archived["n"],
+        "archived_until": timezone.localdate(archived["last"]) if archived["last"] else None,
+    }
+
+
+def _compute(by, start, end, metric, top, filters):
+    group_id, label = DIMENSIONS[by]
+    since, until = _bounds(start, end)
+    status = metric.upper()
+    results = ExecutionItemResult.objects.filter(
+        status__in=PARETO_STATUSES, created_at__gte=since, created_at__lt=until,
+        **{FILTERS[name]: value for name, value in filters.items()},
+    )
+    totals = results.aggregate(
+        ng=Count("pk", filter=Q(status="NG")),
+        skip=Count("pk", filter=Q(status="SKIP")),
+        groups=Count(group_id, filter=Q(status=status), distinct=True),
+    )
+    rows = (
+        results.values(group_id, label)
+        .annotate(ng=Count("pk", filter=Q(status="NG")), skip=Count("pk", filter=Q(status="SKIP")))
+        .filter(**{f"{metric}__gt": 0})
+        .order_by(f"-{metric}", group_id)[:top]
+    )
+    total = totals[metric]
+    running = 0
+    groups = []
+    for row in rows:
+        running += row[metric]
+        groups.append({
+            "id": row[group_id],
+            "label": row[label],
+            "ng": row["ng"],
+            "skip": row["skip"],
+            "percent": round(row[metric] * 100 / total, 1),
+            "cumulative_percent": round(running * 100 / total, 1),
+        })
+    return {
+        **_archived(since, until, metric, filters),
+        "total_ng": totals["ng"],
+        "total_skip": totals["skip"],
+        "group_count": totals["groups"],
+        "results": groups,
+        # everything below the top groups, for the last Pareto bar
+        "other": total - running,
+    }
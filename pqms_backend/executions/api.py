@@ -1,31 +1,65 @@
 # executions/api.py
-from rest_framework import viewsets, routers
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, OuterRef, Subquery
+from django.utils import timezone
+from rest_framework import viewsets, routers, serializers, status
 from rest_framework.permissions import AllowAny
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
+from common import counters
+from common.db import is_postgres
+from common.projection import ProjectedListMixin
+from processes.models import ProcessSheet
+from processes.progress import touch
+from . import analytics
 from .models import Execution, ExecutionItemResult, ExecutionPhoto
+from .archive import archived_progress_results
+from .signals import ng_delta
+from .prepare import prepare
+from .sync import KeyReused, apply_batch
+from .trace import lot_filter, trace
 from .serializers import (
     ExecutionSerializer,
     ExecutionItemResultReadSerializer,
     ExecutionPhotoSerializer,
+    ExecutionAutosaveSerializer,
+    SyncBatchSerializer,
+    ParetoQuerySerializer,
+    ExecutionPrepareSerializer,
 )
 
 class ExecutionViewSet(viewsets.ModelViewSet):
     queryset = (
         Execution.objects
-        .select_related("checklist", "process_sheet", "executor")
-        .prefetch_related("item_results__photos")
+        .select_related("checklist__category", "process_sheet__checklist__category", "executor", "archive")
+        .prefetch_related(
+            "item_results__photos",
+            "item_results__checklist_item__check_item__category",
+            "checklist__items__check_item__category",
+            "process_sheet__checklist__items__check_item__category",
+        )
         .all()
         .order_by("-updated_at")
     )
     serializer_class = ExecutionSerializer
+    replica_actions = {"list", "progress", "stats", "latest"}
+    # large table: approximate counts for list pages (common/pagination.py)
+    pagination_count = "estimate"
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["status", "result", "checklist", "process_sheet", "executor"]
     search_fields = ["comment"]
 
+    def get_queryset(self):
+        # progress/autosave only need the execution row, not the nested serializer prefetches
+        if self.action in ("progress", "autosave"):
+            return Execution.objects.select_related("checklist", "archive")
+        return super().get_queryset()
+
     # NEW: execution-level progress & details
     @action(detail=True, methods=["get"])
     def progress(self, request, pk=None):
@@ -33,6 +67,11 @@ class ExecutionViewSet(viewsets.ModelViewSet):
         checklist = execution.checklist
         total_items = checklist.items.count() if checklist else 0
 
+        if execution.archived_at:
+            detailed_results = archived_progress_results(execution)
+            completed = sum(1 for r in detailed_results if r["status"] not in ExecutionItemResult.NOT_COMPLETED)
+            return self._progress_response(execution, completed, total_items, detailed_results)
+
         results = (
             execution.item_results
             .select_related("checklist_item__check_item")
@@ -40,11 +79,11 @@ class ExecutionViewSet(viewsets.ModelViewSet):
             .all()
         )
 
-        completed = results.exclude(status="SKIP").count()
-        progress = int(completed * 100 / total_items) if total_items else 0
-
         detailed_results = []
+        completed = 0
         for r in results:
+            if r.status not in ExecutionItemResult.NOT_COMPLETED:
+                completed += 1
             detailed_results.append(
                 {
                     "item_result_id": r.id,
@@ -57,6 +96,10 @@ class ExecutionViewSet(viewsets.ModelViewSet):
                 }
             )
 
+        return self._progress_response(execution, completed, total_items, detailed_results)
+
+    def _progress_response(self, execution, completed, total_items, detailed_results):
+        progress = int(completed * 100 / total_items) if total_items else 0
         return Response(
             {
                 "execution_id": execution.id,
@@ -69,15 +112,150 @@ class ExecutionViewSet(viewsets.ModelViewSet):
             }
         )
 
+    # Counts per status/result in one aggregate query (FILTER (WHERE ...) on Postgres).
+    @action(detail=False, methods=["get"])
+    def stats(self, request):
+        queryset = self.filter_queryset(Execution.objects.all())
+        aggregates = {"total": Count("id")}
+        for value, _ in Execution.STATUS_CHOICES:
+            aggregates[f"status_{value}"] = Count("id", filter=Q(status=value))
+        for value, _ in Execution.RESULT_CHOICES:
+            aggregates[f"result_{value}"] = Count("id", filter=Q(result=value))
+        counts = queryset.aggregate(**aggregates)
+        return Response(
+            {
+                "total": counts["total"],
+                "status": {value: counts[f"status_{value}"] for value, _ in Execution.STATUS_CHOICES},
+                "result": {value: counts[f"result_{value}"] for value, _ in Execution.RESULT_CHOICES},
+            }
+        )
+
+    # Latest execution of every process sheet (tracking boards).
+    @action(detail=False, methods=["get"])
+    def latest(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).filter(process_sheet__isnull=False)
+        if is_postgres(queryset.db):
+            queryset = queryset.order_by("process_sheet_id", "-updated_at", "-id").distinct("process_sheet_id")
+        else:
+            newest = (
+                Execution.objects
+                .filter(process_sheet=OuterRef("process_sheet"))
+                .order_by("-updated_at", "-id")
+                .values("pk")[:1]
+            )
+            queryset = queryset.filter(pk=Subquery(newest)).order_by("process_sheet_id")
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    # Coalesced autosave: the tablet sends only the items that changed since the last save.
+    # Repeated edits of the same item collapse to the last one and everything is written in
+    # a single short transaction, instead of PATCH replacing every item row.
+    @action(detail=True, methods=["patch"])
+    def autosave(self, request, pk=None):
+        execution = self.get_object()
+        if execution.archived_at:
+            raise serializers.ValidationError("アーカイブ済みの実行は変更できません。")
+        serializer = ExecutionAutosaveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-class ExecutionItemResultViewSet(viewsets.ReadOnlyModelViewSet):
+        changes = {}
+        for item in serializer.validated_data["items"]:
+            changes.setdefault(item.pop("checklist_item_id"), {}).update(item)
+        valid_ids = set(
+            execution.checklist.items.filter(id__in=list(changes)).values_list("id", flat=True)
+        )
+        unknown = sorted(set(changes) - valid_ids)
+        if unknown:
+            raise serializers.ValidationError({"items": f"チェックリストに含まれない項目です: {unknown}"})
+
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    return Response(self._autosave(execution, changes))
+            except IntegrityError:
+                # a concurrent autosave inserted one of the new items first; the retry updates it
+                if attempt:
+                    raise
+
+    def _autosave(self, execution, changes):
+        now = timezone.now()
+        # concurrent autosaves of one execution take turns (PostgreSQL); the unique constraint covers the rest
+        list(Execution.objects.select_for_update().filter(pk=execution.pk).values_list("pk", flat=True))
+        existing = {
+            r.checklist_item_id: r
+            for r in execution.item_results.filter(checklist_item_id__in=list(changes))
+        }
+        to_update, to_create = [], []
+        for checklist_item_id, fields in changes.items():
+            result = existing.get(checklist_item_id)
+            if result is None:
+                to_create.append(ExecutionItemResult(execution=execution, checklist_item_id=checklist_item_id, **fields))
+                continue
+            for name, value in fields.items():
+                setattr(result, name, value)
+            result.updated_at = now
+            to_update.append(result)
+        if to_update:
+            ExecutionItemResult.objects.bulk_update(to_update, ["status", "value", "note", "updated_at"])
+        if to_create:
+            ExecutionItemResult.objects.bulk_create(to_create)
+        # bulk writes bypass the signals that keep the NG counter and Pareto cache up to date
+        analytics.results_changed(to_update)
+        analytics.results_changed(to_create, created=True)
+        counters.bump(counters.daily("ng_items"), ng_delta(to_update) + ng_delta(to_create, created=True))
+        Execution.objects.filter(pk=execution.pk).update(updated_at=now)
+        touch(execution_ids=[execution.pk])
+        return {"execution_id": execution.id, "updated": len(to_update), "created": len(to_create), "updated_at": now}
+
+    # Shift start: executions plus PENDING item rows for many process sheets at once (executions/prepare.py).
+    @action(detail=False, methods=["post"])
+    def prepare(self, request):
+        serializer = ExecutionPrepareSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = request.user if request.user and not request.user.is_anonymous else None
+        executions = prepare(**serializer.validated_data, user=user)
+        return Response({"created": len(executions), "executions": executions}, status=status.HTTP_201_CREATED)
+
+    # Offline batch upload from tablets (see executions/sync.py). The idempotency key comes from
+    # the Idempotency-Key header or the body; a replayed batch answers 200 instead of 201.
+    @action(detail=False, methods=["post"])
+    def sync(self, request):
+        serializer = SyncBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        key = request.headers.get("Idempotency-Key") or serializer.validated_data.get("idempotency_key")
+        if not key:
+            raise serializers.ValidationError({"idempotency_key": "Idempotency-Key ヘッダーまたは idempotency_key が必要です。"})
+        user = request.user if request.user and not request.user.is_anonymous else None
+        try:
+            response, replayed = apply_batch(key[:100], serializer.validated_data["executions"], user)
+        except KeyReused:
+            return Response({"detail": "この Idempotency-Key は別の内容のバッチで使用済みです。"}, status=status.HTTP_409_CONFLICT)
+        return Response(response, status=status.HTTP_200_OK if replayed else status.HTTP_201_CREATED)
+
+
+class ExecutionItemResultViewSet(ProjectedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ExecutionItemResult.objects.select_related(
-        "execution", "checklist_item"
-    ).all()
+        "execution", "checklist_item__check_item__category"
+    ).prefetch_related("photos").all()
     serializer_class = ExecutionItemResultReadSerializer
+    replica_actions = {"list", "pareto"}
+    pagination_count = "estimate"
     permission_classes = [AllowAny]
     filterset_fields = ["execution", "checklist_item", "status"]
 
+    # NG/SKIP Pareto by check item, checklist, category, inspector or process (see executions/analytics.py).
+    @action(detail=False, methods=["get"])
+    def pareto(self, request):
+        params = ParetoQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        filters = {name: data.get(name) for name in analytics.FILTERS}
+        return Response(analytics.pareto(
+            data["by"], data["date_from"], data["date_to"], metric=data["metric"], top=data["top"], filters=filters,
+        ))
+
 
 class ExecutionPhotoViewSet(viewsets.ModelViewSet):
     queryset = ExecutionPhoto.objects.select_related("item_result").all()
@@ -85,6 +263,43 @@ class ExecutionPhotoViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
     filterset_fields = ["item_result"]
 
+    def create(self, request, *args, **kwargs):
+        # photos synced from a tablet carry a client_uuid; a retried upload returns the stored photo
+        client_uuid = request.data.get("client_uuid")
+        if client_uuid:
+            try:
+                photo = ExecutionPhoto.objects.filter(client_uuid=client_uuid).first()
+            except DjangoValidationError:
+                photo = None
+            if photo is not None:
+                return Response(self.get_serializer(photo).data, status=status.HTTP_200_OK)
+        return super().create(request, *args, **kwargs)
+
+
+class TraceViewSet(viewsets.GenericViewSet):
+    """``GET /api/trace/?lot=L1,L2&lot_prefix=L2026-&lot_from=..&lot_to=..``: see executions/trace.py."""
+    queryset = ProcessSheet.objects.all()
+    replica_actions = {"list"}
+    permission_classes = [AllowAny]
+    # used by check_query_counts (datagen lot numbers start with "L")
+    querycount_params = "?lot_prefix=L"
+
+    def list(self, request):
+        params = request.query_params
+        lots = [lot.strip() for value in params.getlist("lot") for lot in value.split(",") if lot.strip()]
+        query = lot_filter(
+            lots=[lot for lot in lots if not lot.endswith("*")],
+            prefixes=[lot[:-1] for lot in lots if lot.endswith("*")] + [p for p in params.getlist("lot_prefix") if p],
+            lot_from=params.get("lot_from"), lot_to=params.get("lot_to"),
+        )
+        if query is None:
+            raise serializers.ValidationError({"lot": "lot, lot_prefix, lot_from, lot_to のいずれかを指定してください。"})
+        try:
+            limit = min(int(params.get("limit", settings.TRACE_MAX_SHEETS)), settings.TRACE_MAX_SHEETS)
+        except ValueError:
+            raise serializers.ValidationError({"limit": "整数で指定してください。"})
+        return Response(trace(query, limit=max(limit, 1)))
+
 
 router = routers.DefaultRouter()
 router.register(r"executions", ExecutionViewSet, basename="execution")
@@ -98,3 +313,4 @@ router.register(
     ExecutionPhotoViewSet,
     basename="executionphoto",
 )
+router.register(r"trace", TraceViewSet, basename="trace")
@@ -1,2 +1,7 @@
 from django.apps import AppConfig
-class ExecutionsConfig(AppConfig): name = 'executions'
+
+class ExecutionsConfig(AppConfig):
+    name = 'executions'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,167 @@
+"""Archival of old approved executions.
+
+Item results and photo records of an archived execution are packed into one compressed
+ExecutionArchive row and deleted from the hot tables; the Execution row stays as the summary.
+Photo files are left in MEDIA_ROOT. The detail and progress endpoints read archived executions
+back from the payload, so clients see the same response shape as before.
+"""
+import json
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from checklists.serializers import ChecklistItemReadSerializer
+from processes.progress import touch
+from . import analytics
+from .models import Execution, ExecutionArchive, ExecutionItemResult, ExecutionPhoto
+from .serializers import ExecutionPhotoSerializer
+
+PAYLOAD_VERSION = 1
+
+
+def _pack(data):
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(), 6)
+
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(bytes(blob)))
+
+
+def build_payload(execution):
+    results = (
+        execution.item_results
+        .select_related("checklist_item__check_item__category")
+        .prefetch_related("photos")
+        .order_by("id")
+    )
+    items = []
+    for r in results:
+        items.append({
+            "id": r.id,
+            "checklist_item_id": r.checklist_item_id,
+            # snapshot: checklist items can be replaced once no hot row protects them
+            "checklist_item": ChecklistItemReadSerializer(r.checklist_item).data,
+            "status": r.status,
+            "value": r.value,
+            "note": r.note,
+            "created_at": r.created_at.isoformat(),
+            "updated_at": r.updated_at.isoformat(),
+            "photos": [
+                {"id": p.id, "image": p.image.name, "annotation": p.annotation,
+                 "created_at": p.created_at.isoformat(), "updated_at": p.updated_at.isoformat()}
+                for p in r.photos.all()
+            ],
+        })
+    return {"version": PAYLOAD_VERSION, "item_results": items}
+
+
+def archive_execution(execution):
+    with transaction.atomic():
+        execution = Execution.objects.select_for_update().get(pk=execution.pk)
+        if execution.archived_at:
+            return False
+        payload = build_payload(execution)
+        items = payload["item_results"]
+        ExecutionArchive.objects.create(
+            execution=execution, payload=_pack(payload), item_count=len(items),
+            ng_count=sum(1 for i in items if i["status"] == "NG"),
+            skip_count=sum(1 for i in items if i["status"] == "SKIP"),
+            pending_count=sum(1 for i in items if i["status"] == "PENDING"),
+            photo_count=sum(len(i["photos"]) for i in items),
+        )
+        ExecutionPhoto.objects.filter(item_result__execution=execution).delete()
+        ExecutionItemResult.objects.filter(execution=execution).delete()
+        Execution.objects.filter(pk=execution.pk).update(archived_at=timezone.now())
+    return True
+
+
+def due_for_archive(older_than_days=None):
+    days = older_than_days if older_than_days is not None else settings.EXECUTION_ARCHIVE_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=days)
+    return Execution.objects.filter(status="approved", archived_at__isnull=True, updated_at__lt=cutoff)
+
+
+def archive_due(older_than_days=None, limit=None, progress=None):
+    ids = list(due_for_archive(older_than_days).order_by("id").values_list("id", flat=True)[:limit])
+    archived = 0
+    for n, execution_id in enumerate(ids, 1):
+        archived += archive_execution(Execution(pk=execution_id))
+        if progress and n % 100 == 0:
+            progress(n * 100 // len(ids))
+    return archived
+
+
+def restore_execution(execution):
+    """Move an archived execution back into the hot tables (e.g. before re-judging it)."""
+    with transaction.atomic():
+        archive = ExecutionArchive.objects.select_for_update().get(execution=execution)
+        payload = _unpack(archive.payload)
+        results, photos = [], []
+        for item in payload["item_results"]:
+            results.append(ExecutionItemResult(
+                id=item["id"], execution_id=archive.execution_id, checklist_item_id=item["checklist_item_id"],
+                status=item["status"], value=item["value"], note=item["note"],
+            ))
+            photos += [ExecutionPhoto(id=p["id"], item_result_id=item["id"], image=p["image"], annotation=p["annotation"])
+                       for p in item["photos"]]
+        ExecutionItemResult.objects.bulk_create(results)
+        ExecutionPhoto.objects.bulk_create(photos)
+        # auto_now_add overwrote the original timestamps (delta sync and date-based reports go by them)
+        originals = payload["item_results"] + [p for item in payload["item_results"] for p in item["photos"]]
+        for row, original in zip(results + photos, originals):
+            row.created_at, row.updated_at = parse_datetime(original["created_at"]), parse_datetime(original["updated_at"])
+        ExecutionItemResult.objects.bulk_update(results, ["created_at", "updated_at"])
+        ExecutionPhoto.objects.bulk_update(photos, ["created_at", "updated_at"])
+        Execution.objects.filter(pk=archive.execution_id).update(archived_at=None)
+        archive.delete()
+        # bulk_create skips the signals that keep the process sheet and Pareto cache in sync
+        touch(execution_ids=[execution.pk])
+        analytics.results_changed(results, created=True)
+
+
+def payload_items(payload):
+    return _unpack(payload)["item_results"]
+
+
+def archived_items(execution):
+    return payload_items(execution.archive.payload)
+
+
+def _photo(p):
+    return ExecutionPhoto(id=p["id"], image=p["image"], annotation=p["annotation"],
+                          created_at=parse_datetime(p["created_at"]), updated_at=parse_datetime(p["updated_at"]))
+
+
+def archived_item_results(execution, context):
+    """Archived item results in the ExecutionItemResultReadSerializer representation."""
+    return [
+        {
+            "id": item["id"],
+            "checklist_item": item["checklist_item"],
+            "status": item["status"],
+            "value": item["value"],
+            "note": item["note"],
+            "photos": ExecutionPhotoSerializer([_photo(p) for p in item["photos"]], many=True, context=context).data,
+        }
+        for item in archived_items(execution)
+    ]
+
+
+def archived_progress_results(execution):
+    """Archived item results in the shape of ExecutionViewSet.progress."""
+    return [
+        {
+            "item_result_id": item["id"],
+            "checklist_item_id": item["checklist_item_id"],
+            "item_name": item["checklist_item"]["check_item"]["name"],
+            "status": item["status"],
+            "value": item["value"],
+            "note": item["note"],
+            "photos": [_photo(p).image.url for p in item["photos"]],
+        }
+        for item in archived_items(execution)
+    ]
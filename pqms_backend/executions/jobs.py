@@ -0,0 +1,22 @@
+from jobs.registry import job
+
+from . import review
+from .archive import archive_due
+
+
+@job("executions.archive")
+def archive_executions(job):
+    older_than_days = job.payload.get("older_than_days")
+    limit = job.payload.get("limit")
+    archived = archive_due(older_than_days, limit, progress=job.set_progress)
+    return {"archived": archived}
+
+
+@job("executions.approve")
+def approve_executions(job):
+    return {"approved": review.run("approve", job.payload["ids"], progress=job.set_progress)}
+
+
+@job("executions.rejudge")
+def rejudge_executions(job):
+    return {"changed": review.run("rejudge", job.payload["ids"], progress=job.set_progress)}
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from executions.archive import archive_due, due_for_archive, restore_execution
+from executions.models import Execution
+
+
+class Command(BaseCommand):
+    help = "Move approved executions older than EXECUTION_ARCHIVE_AFTER_DAYS into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=None,
+                            help=f"default: EXECUTION_ARCHIVE_AFTER_DAYS ({settings.EXECUTION_ARCHIVE_AFTER_DAYS})")
+        parser.add_argument("--limit", type=int, default=None)
+        parser.add_argument("--dry-run", action="store_true", help="only count the executions that are due")
+        parser.add_argument("--restore", type=int, nargs="+", metavar="EXECUTION_ID",
+                            help="move the given archived executions back into the hot tables")
+
+    def handle(self, *args, older_than_days, limit, dry_run, restore, **options):
+        if restore:
+            for execution in Execution.objects.filter(pk__in=restore, archived_at__isnull=False):
+                restore_execution(execution)
+                self.stdout.write(f"restored execution {execution.pk}")
+            return
+        if dry_run:
+            self.stdout.write(f"{due_for_archive(older_than_days).count()} executions due for archive")
+            return
+        archived = archive_due(older_than_days, limit)
+        self.stdout.write(self.style.SUCCESS(f"archived {archived} executions"))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("checklists", "0002_checklistitem_options_gin"),
+        ("executions", "0001_initial"),
+        ("processes", "0002_processsheet_inspector_processsheet_lot_number_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                condition=models.Q(("status", "approved"), _negated=True),
+                fields=["status", "updated_at"],
+                name="execution_open_status_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("executions", "0002_execution_open_status_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExecutionArchive",
+            fields=[
+                (
+                    "execution",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="archive",
+                        serialize=False,
+                        to="executions.execution",
+                    ),
+                ),
+                ("payload", models.BinaryField()),
+                ("item_count", models.PositiveIntegerField(default=0)),
+                ("ng_count", models.PositiveIntegerField(default=0)),
+                ("photo_count", models.PositiveIntegerField(default=0)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="execution",
+            name="archived_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:16
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+def count_skips(apps, schema_editor):
+    ExecutionArchive = apps.get_model("executions", "ExecutionArchive")
+    for archive in ExecutionArchive.objects.iterator():
+        items = json.loads(zlib.decompress(bytes(archive.payload)))["item_results"]
+        archive.skip_count = sum(1 for i in items if i["status"] == "SKIP")
+        archive.save(update_fields=["skip_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("executions", "0004_syncbatch_execution_client_uuid"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="executionarchive",
+            name="skip_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_skips, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("checklists", "0003_checklist_checklists__updated_4e4efa_idx_and_more"),
+        ("executions", "0005_executionarchive_skip_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="executionitemresult",
+            index=models.Index(
+                fields=["status", "created_at"], name="itemresult_status_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("executions", "0006_itemresult_status_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="executionarchive",
+            name="pending_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="executionitemresult",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("OK", "OK"),
+                    ("NG", "NG"),
+                    ("SKIP", "スキップ"),
+                    ("PENDING", "未入力"),
+                ],
+                default="OK",
+                max_length=10,
+            ),
+        ),
+    ]
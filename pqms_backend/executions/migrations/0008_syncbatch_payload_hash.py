@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("executions", "0007_itemresult_pending"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncbatch",
+            name="payload_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:56
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def drop_duplicates(apps, schema_editor):
+    # keep the newest result per item; photos of the older ones move to it
+    ExecutionItemResult = apps.get_model("executions", "ExecutionItemResult")
+    ExecutionPhoto = apps.get_model("executions", "ExecutionPhoto")
+    groups = (
+        ExecutionItemResult.objects.values("execution_id", "checklist_item_id")
+        .annotate(n=Count("id"), keep=Max("id")).filter(n__gt=1)
+    )
+    for group in groups.iterator():
+        older = ExecutionItemResult.objects.filter(
+            execution_id=group["execution_id"], checklist_item_id=group["checklist_item_id"], id__lt=group["keep"],
+        )
+        ExecutionPhoto.objects.filter(item_result__in=older).update(item_result_id=group["keep"])
+        older.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("checklists", "0003_checklist_checklists__updated_4e4efa_idx_and_more"),
+        ("executions", "0008_syncbatch_payload_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="executionitemresult",
+            constraint=models.UniqueConstraint(
+                fields=("execution", "checklist_item"),
+                name="itemresult_execution_item_uniq",
+            ),
+        ),
+    ]
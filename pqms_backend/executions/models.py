@@ -8,6 +8,7 @@ from processes.models import ProcessSheet
 class Execution(TimeStampedModel):
     RESULT_CHOICES = [("pass","合格"),("fail","不合格"),("warn","要注意")]
     STATUS_CHOICES = [("draft","下書き"),("running","実行中"),("completed","完了"),("approved","承認済み"),("rejected","差戻し")]
+    FINAL_STATUSES = ("approved",)
     process_sheet = models.ForeignKey(ProcessSheet, on_delete=models.CASCADE, related_name="executions", null=True, blank=True)
     checklist = models.ForeignKey(Checklist, on_delete=models.PROTECT, related_name="executions")
     executor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
@@ -16,15 +17,65 @@ class Execution(TimeStampedModel):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="draft")
     result = models.CharField(max_length=10, choices=RESULT_CHOICES, blank=True)
     comment = models.TextField(blank=True)
+    # generated on the tablet so offline work can be synced (and retried) without duplicates
+    client_uuid = models.UUIDField(null=True, blank=True, unique=True)
+    # set once item results and photos have been moved to ExecutionArchive
+    archived_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # tracking boards only look at open executions; approved rows are the bulk of the table
+            models.Index(fields=["status","updated_at"], condition=~models.Q(status="approved"), name="execution_open_status_idx"),
+        ]
 
 class ExecutionItemResult(TimeStampedModel):
+    STATUS_CHOICES = [("OK","OK"),("NG","NG"),("SKIP","スキップ"),("PENDING","未入力")]
+    # neither counts as a completed item (PENDING rows come from executions/prepare.py)
+    NOT_COMPLETED = ("SKIP","PENDING")
+    # what clients may write; PENDING is only set by the server
+    CLIENT_STATUSES = ("OK","NG","SKIP")
     execution = models.ForeignKey(Execution, on_delete=models.CASCADE, related_name="item_results")
     checklist_item = models.ForeignKey(ChecklistItem, on_delete=models.PROTECT)
-    status = models.CharField(max_length=10, choices=[("OK","OK"),("NG","NG"),("SKIP","スキップ")], default="OK")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="OK")
     value = models.CharField(max_length=255, blank=True)
     note = models.TextField(blank=True)
+    client_uuid = models.UUIDField(null=True, blank=True, unique=True)
+
+    class Meta:
+        indexes = [
+            # NG/SKIP Pareto reads only the NG/SKIP rows of a period (executions/analytics.py)
+            models.Index(fields=["status","created_at"], name="itemresult_status_created_idx"),
+        ]
+        constraints = [
+            # autosave and sync insert concurrently; one result per item and execution
+            models.UniqueConstraint(fields=["execution","checklist_item"], name="itemresult_execution_item_uniq"),
+        ]
 
 class ExecutionPhoto(TimeStampedModel):
     item_result = models.ForeignKey(ExecutionItemResult, on_delete=models.CASCADE, related_name="photos")
     image = models.ImageField(upload_to="execution_photos/")
     annotation = models.TextField(blank=True)
+    client_uuid = models.UUIDField(null=True, blank=True, unique=True)
+
+class SyncBatch(TimeStampedModel):
+    """An applied offline sync batch; a retry with the same key gets the stored response back."""
+    key = models.CharField(max_length=100, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    execution_count = models.PositiveIntegerField(default=0)
+    # sha256 of the canonical batch; a key reused for a different batch is refused, not replayed
+    payload_hash = models.CharField(max_length=64, blank=True)
+    response = models.JSONField(default=dict)
+
+class ExecutionArchive(models.Model):
+    """Item results and photo records of an archived execution, as zlib-compressed JSON.
+
+    The Execution row itself stays in place as the summary; see executions/archive.py.
+    """
+    execution = models.OneToOneField(Execution, on_delete=models.CASCADE, primary_key=True, related_name="archive")
+    payload = models.BinaryField()
+    item_count = models.PositiveIntegerField(default=0)
+    ng_count = models.PositiveIntegerField(default=0)
+    skip_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    photo_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,77 @@
+"""Batch start of inspections (shift change).
+
+``prepare()`` creates one execution per process sheet together with a PENDING item result for
+every item of its checklist, pre-filled with ``CheckItem.default_value`` for number items. Everything
+is bulk-inserted in one transaction, so a line starting 100 inspections issues a handful of queries
+and the tablet's later saves are in-place updates of existing rows (see ``autosave``).
+
+PENDING results do not count as completed, so prepared executions do not move progress.
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from checklists.models import Checklist, ChecklistItem
+from common import counters
+from processes.models import ProcessSheet
+from processes.progress import touch
+from .models import Execution, ExecutionItemResult
+
+
+def default_value(check_type, value, decimal_places):
+    if check_type != "number" or value is None:
+        return ""
+    return f"{value:.{decimal_places}f}"
+
+
+def prepare(process_sheet_ids, checklist_id=None, status="draft", user=None):
+    """Returns ``[{"id", "process_sheet_id", "items": {checklist_item_id: item_result_id}}]``."""
+    sheets = dict(ProcessSheet.objects.filter(pk__in=process_sheet_ids).values_list("pk", "checklist_id"))
+    missing = sorted(set(process_sheet_ids) - set(sheets))
+    if missing:
+        raise serializers.ValidationError({"process_sheet_ids": f"工程表が存在しません: {missing}"})
+    if checklist_id is not None:
+        if not Checklist.objects.filter(pk=checklist_id).exists():
+            raise serializers.ValidationError({"checklist_id": f"チェックリストが存在しません: {checklist_id}"})
+        sheets = {pk: checklist_id for pk in sheets}
+    without = sorted(pk for pk, checklist in sheets.items() if checklist is None)
+    if without:
+        raise serializers.ValidationError({"process_sheet_ids": f"チェックリストが設定されていない工程表です: {without}"})
+
+    items = {}
+    for row in (
+        ChecklistItem.objects.filter(checklist_id__in=set(sheets.values()))
+        .order_by("order", "id")
+        .values("id", "checklist_id", "check_item__type", "check_item__default_value", "check_item__decimal_places")
+    ):
+        items.setdefault(row["checklist_id"], []).append(row)
+
+    now = timezone.now()
+    with transaction.atomic():
+        # in the order the sheets were asked for (duplicates start one execution each)
+        executions = Execution.objects.bulk_create(
+            Execution(
+                process_sheet_id=pk, checklist_id=sheets[pk], executor=user, status=status,
+                started_at=now if status == "running" else None,
+            )
+            for pk in process_sheet_ids
+        )
+        results = ExecutionItemResult.objects.bulk_create(
+            ExecutionItemResult(
+                execution_id=execution.pk, checklist_item_id=item["id"], status="PENDING",
+                value=default_value(item["check_item__type"], item["check_item__default_value"],
+                                    item["check_item__decimal_places"]),
+            )
+            for execution in executions for item in items.get(execution.checklist_id, [])
+        )
+        # bulk inserts bypass the signals that maintain /metrics and the process sheets
+        counters.bump("executions_running", sum(e.status == "running" for e in executions))
+        touch(sheet_ids=sheets)
+
+    by_execution = {}
+    for r in results:
+        by_execution.setdefault(r.execution_id, {})[r.checklist_item_id] = r.pk
+    return [
+        {"id": e.pk, "process_sheet_id": e.process_sheet_id, "items": by_execution.get(e.pk, {})}
+        for e in executions
+    ]
@@ -0,0 +1,89 @@
+"""Bulk approval and re-judging of executions (admin actions and the matching background jobs).
+
+Both work on id chunks with set-based UPDATEs, so thousands of executions take a few queries per
+chunk instead of a save() each. Selections larger than INLINE_LIMIT are handed to the job queue.
+"""
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from common import counters
+from jobs.registry import enqueue
+from processes.progress import touch
+from .models import Execution, ExecutionArchive, ExecutionItemResult
+
+CHUNK_SIZE = 1000
+INLINE_LIMIT = 1000
+
+
+def verdict(ng, incomplete):
+    # same rule as the result confirmation screen: any NG fails, any SKIP/PENDING needs attention
+    return "fail" if ng else "warn" if incomplete else "pass"
+
+
+def approve(execution_ids):
+    """Mark executions approved; returns how many changed."""
+    with transaction.atomic():
+        pending = Execution.objects.filter(pk__in=execution_ids).exclude(status="approved")
+        running = pending.filter(status="running").count()
+        changed = pending.update(status="approved", updated_at=timezone.now())
+        # a queryset update bypasses the signals behind /metrics and the process sheets
+        counters.bump("executions_running", -running)
+        touch(execution_ids=execution_ids)
+    return changed
+
+
+def rejudge(execution_ids):
+    """Recompute ``result`` from the item results (or archive counts); returns how many changed."""
+    verdicts = {}
+    for row in (
+        ExecutionItemResult.objects.filter(execution_id__in=execution_ids)
+        .values("execution_id")
+        .annotate(
+            ng=Count("pk", filter=Q(status="NG")),
+            incomplete=Count("pk", filter=Q(status__in=ExecutionItemResult.NOT_COMPLETED)),
+        )
+    ):
+        verdicts[row["execution_id"]] = verdict(row["ng"], row["incomplete"])
+    for execution_id, ng, skip, pending in ExecutionArchive.objects.filter(execution_id__in=execution_ids).values_list(
+            "execution_id", "ng_count", "skip_count", "pending_count"):
+        verdicts[execution_id] = verdict(ng, skip + pending)
+
+    by_result = {}
+    for execution_id, result in verdicts.items():
+        by_result.setdefault(result, []).append(execution_id)
+    changed = 0
+    now = timezone.now()
+    with transaction.atomic():
+        for result, ids in by_result.items():
+            changed += (
+                Execution.objects.filter(pk__in=ids).exclude(result=result).update(result=result, updated_at=now)
+            )
+    return changed
+
+
+ACTIONS = {"approve": approve, "rejudge": rejudge}
+
+
+def run(action, execution_ids, progress=None):
+    changed = 0
+    for start in range(0, len(execution_ids), CHUNK_SIZE):
+        changed += ACTIONS[action](execution_ids[start:start + CHUNK_SIZE])
+        if progress:
+            progress(min(100, (start + CHUNK_SIZE) * 100 // len(execution_ids)))
+    return changed
+
+
+def run_or_enqueue(action, queryset):
+    """Run ``action`` on a small selection right away; queue jobs for a large one.
+
+    Returns ``(changed, jobs)``: the number of executions changed, or the number of queued jobs.
+    """
+    ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+    if len(ids) <= INLINE_LIMIT:
+        return run(action, ids), 0
+    jobs = 0
+    for start in range(0, len(ids), CHUNK_SIZE * 10):
+        enqueue(f"executions.{action}", {"ids": ids[start:start + CHUNK_SIZE * 10]})
+        jobs += 1
+    return 0, jobs
@@ -1,4 +1,9 @@
 
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Execution, ExecutionItemResult, ExecutionPhoto
 from checklists.serializers import ChecklistSerializer, ChecklistItemReadSerializer
@@ -7,9 +12,10 @@ from processes.serializers import ProcessSheetSerializer
 from processes.models import ProcessSheet
 
 class ExecutionPhotoSerializer(serializers.ModelSerializer):
+    item_result = serializers.PrimaryKeyRelatedField(queryset=ExecutionItemResult.objects.all(), write_only=True)
     class Meta:
         model = ExecutionPhoto
-        fields = ["id","image","annotation","created_at","updated_at"]
+        fields = ["id","item_result","image","annotation","client_uuid","created_at","updated_at"]
 
 class ExecutionItemResultWriteSerializer(serializers.ModelSerializer):
     checklist_item_id = serializers.PrimaryKeyRelatedField(source="checklist_item", queryset=ChecklistItem.objects.all())
@@ -17,6 +23,7 @@ class ExecutionItemResultWriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = ExecutionItemResult
         fields = ["id","checklist_item_id","status","value","note","photos"]
+        extra_kwargs = {"status": {"choices": ExecutionItemResult.CLIENT_STATUSES}}
 
 class ExecutionItemResultReadSerializer(serializers.ModelSerializer):
     checklist_item = ChecklistItemReadSerializer()
@@ -35,9 +42,25 @@ class ExecutionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Execution
-        fields = ["id","process_sheet","process_sheet_id","checklist","checklist_id","executor","started_at","finished_at","status","result","comment","item_results","item_results_write","created_at","updated_at"]
-        read_only_fields = ["executor"]
+        fields = ["id","process_sheet","process_sheet_id","checklist","checklist_id","executor","started_at","finished_at","status","result","comment","client_uuid","item_results","item_results_write","archived_at","created_at","updated_at"]
+        read_only_fields = ["executor","client_uuid","archived_at"]
+
+    def validate_item_results_write(self, items):
+        # one result per checklist item (unique together with the execution)
+        counts = Counter(item["checklist_item"].pk for item in items)
+        duplicates = sorted(i for i, n in counts.items() if n > 1)
+        if duplicates:
+            raise serializers.ValidationError(f"同じ項目が複数回指定されています: {duplicates}")
+        return items
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.archived_at:
+            from .archive import archived_item_results
+            data["item_results"] = archived_item_results(instance, self.context)
+        return data
+
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop("item_results_write", [])
         request = self.context.get("request")
@@ -47,7 +70,10 @@ class ExecutionSerializer(serializers.ModelSerializer):
         self._upsert_items(execution, items_data)
         return execution
 
+    @transaction.atomic
     def update(self, instance, validated_data):
+        if instance.archived_at:
+            raise serializers.ValidationError("アーカイブ済みの実行は変更できません。")
         items_data = validated_data.pop("item_results_write", None)
         execution = super().update(instance, validated_data)
         if items_data is not None:
@@ -58,3 +84,67 @@ class ExecutionSerializer(serializers.ModelSerializer):
     def _upsert_items(self, execution, items_data):
         for item in items_data:
             ExecutionItemResult.objects.create(execution=execution, **item)
+
+class ExecutionItemAutosaveSerializer(serializers.Serializer):
+    checklist_item_id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=ExecutionItemResult.CLIENT_STATUSES, required=False)
+    value = serializers.CharField(max_length=255, allow_blank=True, required=False)
+    note = serializers.CharField(allow_blank=True, required=False)
+
+class ExecutionAutosaveSerializer(serializers.Serializer):
+    items = ExecutionItemAutosaveSerializer(many=True, max_length=1000)
+
+class ExecutionPrepareSerializer(serializers.Serializer):
+    process_sheet_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=500)
+    # defaults to each sheet's own checklist
+    checklist_id = serializers.IntegerField(allow_null=True, default=None)
+    status = serializers.ChoiceField(choices=["draft","running"], default="draft")
+
+# Offline sync batch. Foreign keys are plain integers and checked in bulk by executions/sync.py,
+# so a whole shift of work validates with a handful of queries instead of one per item.
+class SyncPhotoSerializer(serializers.Serializer):
+    client_uuid = serializers.UUIDField()
+
+class SyncItemResultSerializer(serializers.Serializer):
+    client_uuid = serializers.UUIDField()
+    checklist_item_id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=ExecutionItemResult.CLIENT_STATUSES, default="OK")
+    value = serializers.CharField(max_length=255, allow_blank=True, default="")
+    note = serializers.CharField(allow_blank=True, default="")
+    photos = SyncPhotoSerializer(many=True, default=list)
+
+class SyncExecutionSerializer(serializers.Serializer):
+    client_uuid = serializers.UUIDField()
+    checklist_id = serializers.IntegerField()
+    process_sheet_id = serializers.IntegerField(allow_null=True, default=None)
+    started_at = serializers.DateTimeField(allow_null=True, default=None)
+    finished_at = serializers.DateTimeField(allow_null=True, default=None)
+    status = serializers.ChoiceField(choices=Execution.STATUS_CHOICES, default="draft")
+    result = serializers.ChoiceField(choices=Execution.RESULT_CHOICES, allow_blank=True, default="")
+    comment = serializers.CharField(allow_blank=True, default="")
+    item_results = SyncItemResultSerializer(many=True, default=list)
+
+class SyncBatchSerializer(serializers.Serializer):
+    idempotency_key = serializers.CharField(max_length=100, required=False)
+    executions = SyncExecutionSerializer(many=True, allow_empty=False)
+
+
+class ParetoQuerySerializer(serializers.Serializer):
+    """Query parameters of /api/execution-item-results/pareto/ (period defaults to the last 30 days)."""
+    by = serializers.ChoiceField(choices=["check_item","checklist","category","inspector","process"], default="check_item")
+    metric = serializers.ChoiceField(choices=["ng","skip"], default="ng")
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    top = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    check_item = serializers.IntegerField(required=False)
+    checklist = serializers.IntegerField(required=False)
+    category = serializers.IntegerField(required=False)
+    inspector = serializers.IntegerField(required=False)
+    process_sheet = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("date_to", timezone.localdate())
+        attrs.setdefault("date_from", attrs["date_to"] - timedelta(days=29))
+        if attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError({"date_from": "date_from は date_to 以前の日付を指定してください。"})
+        return attrs
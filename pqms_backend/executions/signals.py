@@ -0,0 +1,62 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from common import counters
+from . import analytics
+from .models import Execution, ExecutionItemResult, ExecutionPhoto
+
+
+@receiver(post_init, sender=Execution)
+@receiver(post_init, sender=ExecutionItemResult)
+def remember_status(sender, instance, **kwargs):
+    # __dict__ so that deferred status fields are not loaded just for this
+    instance._initial_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=Execution)
+def count_running(sender, instance, created, **kwargs):
+    before = None if created else instance._initial_status
+    counters.bump("executions_running", (instance.status == "running") - (before == "running"))
+    instance._initial_status = instance.status
+
+
+@receiver(post_delete, sender=Execution)
+def uncount_running(sender, instance, **kwargs):
+    if instance.status == "running":
+        counters.bump("executions_running", -1)
+
+
+def ng_delta(results, created=False):
+    """Change of today's NG count caused by saving ``results`` (also used after bulk writes)."""
+    today = timezone.localdate()
+    delta = 0
+    for r in results:
+        if r.created_at and timezone.localdate(r.created_at) != today:
+            continue
+        before = None if created else r._initial_status
+        delta += (r.status == "NG") - (before == "NG")
+        r._initial_status = r.status
+    return delta
+
+
+@receiver(post_save, sender=ExecutionItemResult)
+def count_ng(sender, instance, created, **kwargs):
+    analytics.results_changed([instance], created)
+    counters.bump(counters.daily("ng_items"), ng_delta([instance], created))
+
+
+@receiver(post_delete, sender=ExecutionItemResult)
+def uncount_ng(sender, instance, **kwargs):
+    analytics.results_changed([instance], created=True)
+    if instance.status == "NG" and timezone.localdate(instance.created_at) == timezone.localdate():
+        counters.bump(counters.daily("ng_items"), -1)
+
+
+@receiver(post_save, sender=ExecutionPhoto)
+def count_upload(sender, instance, created, **kwargs):
+    if created and instance.image:
+        try:
+            counters.bump("upload_bytes", instance.image.size)
+        except OSError:
+            pass
@@ -0,0 +1,182 @@
+"""Offline-first batch sync for tablets.
+
+A tablet records executions without a connection and uploads the whole batch later in one
+request. Every execution, item result and photo carries a client-generated UUID, and the batch
+carries an idempotency key:
+
+- a retried batch (same key and same content) gets the stored response of the first attempt back;
+  the same key with different content is refused (``KeyReused``, 409) so nothing is dropped silently;
+- an execution whose UUID already exists is not inserted again, but still shows up in the mapping,
+  so overlapping batches are safe as well;
+- a new execution whose item UUIDs are already stored (under another execution) is rejected with 400.
+
+Everything is written in one transaction with bulk inserts. Photo files are uploaded afterwards to
+``/api/execution-photos/`` with the ``item_result`` id from the mapping and the photo's
+``client_uuid``; a repeated upload with the same UUID returns the existing photo.
+"""
+import hashlib
+import json
+from collections import Counter
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from checklists.models import ChecklistItem
+from common import counters
+from processes.models import ProcessSheet
+from processes.progress import touch
+from . import analytics
+from .models import Execution, ExecutionItemResult, SyncBatch
+from .signals import ng_delta
+
+
+class KeyReused(Exception):
+    """The idempotency key belongs to a batch with different content."""
+
+
+def payload_hash(executions):
+    canonical = json.dumps(executions, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _stored(key, digest):
+    stored = SyncBatch.objects.filter(key=key).values_list("response", "payload_hash").first()
+    if stored is None:
+        return None
+    response, stored_digest = stored
+    # batches stored before payload_hash existed have none and are replayed as before
+    if stored_digest and stored_digest != digest:
+        raise KeyReused(key)
+    return response
+
+
+def _validate_references(executions):
+    checklist_ids = {e["checklist_id"] for e in executions}
+    allowed = set(
+        ChecklistItem.objects.filter(checklist_id__in=checklist_ids).values_list("checklist_id", "id")
+    )
+    known_checklists = {checklist_id for checklist_id, _ in allowed}
+    sheet_ids = {e["process_sheet_id"] for e in executions if e["process_sheet_id"]}
+    known_sheets = set(ProcessSheet.objects.filter(id__in=sheet_ids).values_list("id", flat=True))
+
+    errors = {}
+    for n, e in enumerate(executions):
+        problems = []
+        if e["checklist_id"] not in known_checklists:
+            problems.append(f"チェックリストが存在しないか項目がありません: {e['checklist_id']}")
+        if e["process_sheet_id"] and e["process_sheet_id"] not in known_sheets:
+            problems.append(f"工程表が存在しません: {e['process_sheet_id']}")
+        unknown = sorted({
+            i["checklist_item_id"] for i in e["item_results"]
+            if (e["checklist_id"], i["checklist_item_id"]) not in allowed
+        })
+        if unknown:
+            problems.append(f"チェックリストに含まれない項目です: {unknown}")
+        per_item = Counter({i["client_uuid"]: i["checklist_item_id"] for i in e["item_results"]}.values())
+        repeated = sorted(i for i, n in per_item.items() if n > 1)
+        if repeated:
+            problems.append(f"同じ項目に複数の結果があります: {repeated}")
+        if problems:
+            errors[str(n)] = problems
+    if errors:
+        raise serializers.ValidationError({"executions": errors})
+
+
+def _check_item_uuids(executions, fresh):
+    """Item UUIDs of new executions must be new as well (stored ones belong to another execution)."""
+    owners = {}
+    for n, e in enumerate(executions):
+        if e["client_uuid"] in fresh:
+            for uuid in {i["client_uuid"] for i in e["item_results"]}:
+                owners.setdefault(uuid, set()).add(e["client_uuid"])
+    taken = set(ExecutionItemResult.objects.filter(client_uuid__in=list(owners)).values_list("client_uuid", flat=True))
+    taken |= {uuid for uuid, execution_uuids in owners.items() if len(execution_uuids) > 1}
+    errors = {}
+    for n, e in enumerate(executions):
+        if e["client_uuid"] in fresh:
+            clash = sorted(str(i["client_uuid"]) for i in e["item_results"] if i["client_uuid"] in taken)
+            if clash:
+                errors[str(n)] = [f"他の実施で使用済みの項目UUIDです: {clash}"]
+    if errors:
+        raise serializers.ValidationError({"executions": errors})
+
+
+def _apply(key, digest, executions, user):
+    batch = SyncBatch.objects.create(key=key, user=user, execution_count=len(executions), payload_hash=digest)
+
+    # the last occurrence wins if a UUID appears twice in the same batch
+    incoming = {e["client_uuid"]: e for e in executions}
+    existing = dict(Execution.objects.filter(client_uuid__in=list(incoming)).values_list("client_uuid", "id"))
+    fresh = [e for uuid, e in incoming.items() if uuid not in existing]
+    _check_item_uuids(executions, {e["client_uuid"] for e in fresh})
+
+    rows = [
+        Execution(
+            client_uuid=e["client_uuid"], checklist_id=e["checklist_id"], process_sheet_id=e["process_sheet_id"],
+            executor=user, started_at=e["started_at"], finished_at=e["finished_at"],
+            status=e["status"], result=e["result"], comment=e["comment"],
+        )
+        for e in fresh
+    ]
+    Execution.objects.bulk_create(rows)
+    execution_ids = {**existing, **{row.client_uuid: row.pk for row in rows}}
+
+    results = []
+    for e in fresh:
+        items = {i["client_uuid"]: i for i in e["item_results"]}
+        results += [
+            ExecutionItemResult(
+                client_uuid=uuid, execution_id=execution_ids[e["client_uuid"]],
+                checklist_item_id=i["checklist_item_id"], status=i["status"], value=i["value"], note=i["note"],
+            )
+            for uuid, i in items.items()
+        ]
+    ExecutionItemResult.objects.bulk_create(results)
+
+    item_uuids = [i["client_uuid"] for e in incoming.values() for i in e["item_results"]]
+    item_ids = dict(
+        ExecutionItemResult.objects.filter(client_uuid__in=item_uuids).values_list("client_uuid", "id")
+    )
+    photos = {
+        str(p["client_uuid"]): item_ids[i["client_uuid"]]
+        for e in incoming.values() for i in e["item_results"] for p in i["photos"]
+        if i["client_uuid"] in item_ids
+    }
+
+    # bulk inserts bypass the signals that maintain the /metrics counters
+    counters.bump("executions_running", sum(row.status == "running" for row in rows))
+    analytics.results_changed(results, created=True)
+    counters.bump(counters.daily("ng_items"), ng_delta(results, created=True))
+    touch(sheet_ids=[row.process_sheet_id for row in rows])
+
+    batch.response = {
+        "idempotency_key": key,
+        "created": len(rows),
+        "skipped": len(existing),
+        "executions": {str(uuid): pk for uuid, pk in execution_ids.items()},
+        "item_results": {str(uuid): pk for uuid, pk in item_ids.items()},
+        "photos": photos,
+    }
+    batch.save(update_fields=["response", "updated_at"])
+    return batch.response
+
+
+def apply_batch(key, executions, user=None):
+    """Apply a validated batch; returns ``(response, replayed)``, raises ``KeyReused``."""
+    digest = payload_hash(executions)
+    stored = _stored(key, digest)
+    if stored is not None:
+        return stored, True
+    _validate_references(executions)
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                return _apply(key, digest, executions, user), False
+        except IntegrityError:
+            # a concurrent request committed the same key or some of the same UUIDs first
+            stored = _stored(key, digest)
+            if stored is not None:
+                return stored, True
+            if attempt:
+                raise
@@ -0,0 +1,99 @@
+import uuid
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from checklists.models import Checklist, ChecklistItem
+from master.models import CheckItem
+from .archive import archive_execution
+from .models import Execution, ExecutionItemResult
+
+
+class SyncIdempotencyTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.checklist = Checklist.objects.create(name="外観検査")
+        self.item = ChecklistItem.objects.create(checklist=self.checklist, check_item=CheckItem.objects.create(name="傷"))
+
+    def batch(self):
+        return {"executions": [{
+            "client_uuid": str(uuid.uuid4()), "checklist_id": self.checklist.pk, "status": "completed",
+            "item_results": [{"client_uuid": str(uuid.uuid4()), "checklist_item_id": self.item.pk, "status": "NG"}],
+        }]}
+
+    def sync(self, batch, key):
+        return self.client.post("/api/executions/sync/", batch, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_the_stored_response(self):
+        batch = self.batch()
+        first = self.sync(batch, "k1")
+        self.assertEqual(first.status_code, 201)
+        retry = self.sync(batch, "k1")
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(Execution.objects.count(), 1)
+
+    def test_key_reused_for_another_batch_is_refused(self):
+        self.assertEqual(self.sync(self.batch(), "k1").status_code, 201)
+        response = self.sync(self.batch(), "k1")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Execution.objects.count(), 1)
+
+    def test_item_uuid_of_another_execution_is_refused(self):
+        first = self.batch()
+        self.assertEqual(self.sync(first, "k1").status_code, 201)
+        second = self.batch()
+        second["executions"][0]["item_results"] = first["executions"][0]["item_results"]
+        self.assertEqual(self.sync(second, "k2").status_code, 400)
+        self.assertEqual(ExecutionItemResult.objects.count(), 1)
+
+
+class AutosaveTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        checklist = Checklist.objects.create(name="外観検査")
+        self.item = ChecklistItem.objects.create(checklist=checklist, check_item=CheckItem.objects.create(name="傷"))
+        self.execution = Execution.objects.create(checklist=checklist)
+        self.url = f"/api/executions/{self.execution.pk}/autosave/"
+
+    def test_body_must_be_an_object(self):
+        for body in ([{"checklist_item_id": self.item.pk}], "items"):
+            response = self.client.patch(self.url, body, format="json")
+            self.assertEqual(response.status_code, 400)
+
+    def test_repeated_saves_keep_one_row_per_item(self):
+        for status in ("NG", "OK"):
+            response = self.client.patch(self.url, {"items": [
+                {"checklist_item_id": self.item.pk, "status": "SKIP"},
+                {"checklist_item_id": self.item.pk, "status": status},
+            ]}, format="json")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.execution.item_results.values_list("status", flat=True)), ["OK"])
+
+    def test_pending_is_not_writable(self):
+        response = self.client.patch(self.url, {"items": [{"checklist_item_id": self.item.pk, "status": "PENDING"}]}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class ParetoArchiveTests(TestCase):
+    def setUp(self):
+        checklist = Checklist.objects.create(name="外観検査")
+        item = ChecklistItem.objects.create(checklist=checklist, check_item=CheckItem.objects.create(name="傷"))
+        self.executions = [Execution.objects.create(checklist=checklist, status="approved") for _ in range(2)]
+        for execution in self.executions:
+            ExecutionItemResult.objects.create(execution=execution, checklist_item=item, status="NG")
+
+    def pareto(self):
+        return APIClient().get("/api/execution-item-results/pareto/").data
+
+    def test_archived_results_are_flagged(self):
+        report = self.pareto()
+        self.assertEqual((report["total_ng"], report["partial"]), (2, False))
+
+        archive_execution(self.executions[0])
+        report = self.pareto()
+        self.assertEqual(report["total_ng"], 1)
+        self.assertTrue(report["partial"])
+        self.assertEqual(report["archived_executions"], 1)
+        self.assertEqual(report["archived_until"], timezone.localdate())
@@ -0,0 +1,131 @@
+"""Lot traceability: everything recorded for one or many lot numbers in one response.
+
+``trace()`` answers "what happened to lot X" with at most five queries regardless of how many
+lots, executions or items match: sheets, executions, NG/SKIP item results, their photos, and the
+archive payloads of archived executions. Lots are selected by exact number, prefix or range, all
+of which use the index on ``ProcessSheet.lot_number``.
+"""
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from common.db import is_postgres
+from processes.models import ProcessSheet
+from .archive import payload_items
+from .models import Execution, ExecutionArchive, ExecutionItemResult, ExecutionPhoto
+
+TRACED_STATUSES = ("NG", "SKIP")
+
+SHEET_FIELDS = ["id", "lot_number", "name", "project_name", "status", "progress", "planned_start", "planned_end",
+                "inspector", "checklist_id", "checklist__name"]
+EXECUTION_FIELDS = ["id", "process_sheet_id", "status", "result", "started_at", "finished_at", "executor__username",
+                    "comment", "archived_at"]
+ITEM_FIELDS = ["id", "execution_id", "checklist_item_id", "checklist_item__check_item__name", "status", "value", "note"]
+
+
+def prefix_filter(prefix):
+    if is_postgres():
+        # LIKE 'prefix%' is served by the varchar_pattern_ops index Django adds next to the plain one
+        return Q(lot_number__startswith=prefix)
+    # SQLite never uses an index for LIKE ... ESCAPE; a range over the (binary) index does the same job
+    return Q(lot_number__gte=prefix, lot_number__lt=prefix + "\U0010ffff")
+
+
+def lot_filter(lots=(), prefixes=(), lot_from=None, lot_to=None):
+    """OR of the given criteria; None when nothing was asked for."""
+    criteria = []
+    if lots:
+        criteria.append(Q(lot_number__in=lots))
+    criteria += [prefix_filter(p) for p in prefixes]
+    if lot_from or lot_to:
+        bounds = {}
+        if lot_from:
+            bounds["lot_number__gte"] = lot_from
+        if lot_to:
+            bounds["lot_number__lte"] = lot_to
+        criteria.append(Q(**bounds))
+    if not criteria:
+        return None
+    query = criteria[0]
+    for q in criteria[1:]:
+        query |= q
+    return query
+
+
+def _photo_url(name):
+    return ExecutionPhoto._meta.get_field("image").storage.url(name)
+
+
+def _local(value):
+    # same representation as the serializers' DateTimeField (current time zone)
+    return timezone.localtime(value) if value else None
+
+
+def trace(query, limit=None):
+    """Sheets matching ``query`` (ordered by lot number), each with executions, NG/SKIP items and photos."""
+    limit = limit or settings.TRACE_MAX_SHEETS
+    sheets = list(ProcessSheet.objects.filter(query).order_by("lot_number", "id").values(*SHEET_FIELDS)[:limit + 1])
+    truncated = len(sheets) > limit
+    sheets = sheets[:limit]
+
+    executions = []
+    if sheets:
+        executions = list(
+            Execution.objects.filter(process_sheet_id__in=[s["id"] for s in sheets])
+            .order_by("started_at", "id").values(*EXECUTION_FIELDS)
+        )
+    live = [e["id"] for e in executions if not e["archived_at"]]
+    archived = [e["id"] for e in executions if e["archived_at"]]
+
+    items = []
+    if live:
+        items = list(
+            ExecutionItemResult.objects.filter(execution_id__in=live, status__in=TRACED_STATUSES)
+            .order_by("id").values(*ITEM_FIELDS)
+        )
+    photos = {}
+    if live:
+        traced_photos = ExecutionPhoto.objects.filter(
+            item_result__execution_id__in=live, item_result__status__in=TRACED_STATUSES)
+        for p in traced_photos.order_by("id").values("id", "item_result_id", "image", "annotation"):
+            photos.setdefault(p["item_result_id"], []).append(
+                {"id": p["id"], "url": _photo_url(p["image"]), "annotation": p["annotation"]})
+
+    by_execution = {}
+    for i in items:
+        by_execution.setdefault(i["execution_id"], []).append({
+            "id": i["id"], "checklist_item_id": i["checklist_item_id"],
+            "item_name": i["checklist_item__check_item__name"], "status": i["status"], "value": i["value"],
+            "note": i["note"], "photos": photos.get(i["id"], []),
+        })
+    if archived:
+        for execution_id, payload in ExecutionArchive.objects.filter(execution_id__in=archived).values_list(
+                "execution_id", "payload"):
+            by_execution[execution_id] = [
+                {
+                    "id": i["id"], "checklist_item_id": i["checklist_item_id"],
+                    "item_name": i["checklist_item"]["check_item"]["name"], "status": i["status"],
+                    "value": i["value"], "note": i["note"],
+                    "photos": [{"id": p["id"], "url": _photo_url(p["image"]), "annotation": p["annotation"]}
+                               for p in i["photos"]],
+                }
+                for i in payload_items(payload) if i["status"] in TRACED_STATUSES
+            ]
+
+    by_sheet = {}
+    for e in executions:
+        by_sheet.setdefault(e["process_sheet_id"], []).append({
+            "id": e["id"], "status": e["status"], "result": e["result"], "started_at": _local(e["started_at"]),
+            "finished_at": _local(e["finished_at"]), "executor": e["executor__username"], "comment": e["comment"],
+            "archived": e["archived_at"] is not None, "items": by_execution.get(e["id"], []),
+        })
+    results = [
+        {
+            "id": s["id"], "lot_number": s["lot_number"], "name": s["name"], "project_name": s["project_name"],
+            "status": s["status"], "progress": s["progress"], "planned_start": s["planned_start"],
+            "planned_end": s["planned_end"], "inspector": s["inspector"], "checklist_id": s["checklist_id"],
+            "checklist_name": s["checklist__name"], "executions": by_sheet.get(s["id"], []),
+        }
+        for s in sheets
+    ]
+    return {"count": len(results), "truncated": truncated, "results": results}
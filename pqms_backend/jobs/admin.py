@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id","name","status","progress","attempts","run_after","finished_at")
+    list_filter = ("status","name")
+    readonly_fields = ("locked_by","locked_at","started_at","finished_at")
@@ -0,0 +1,44 @@
+from django.utils import timezone
+from rest_framework import viewsets, routers, status
+from rest_framework.permissions import AllowAny
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+def job_accepted(job):
+    """202 response returned by endpoints that hand their work to the job queue."""
+    return Response({"job_id": job.id, "status": job.status}, status=status.HTTP_202_ACCEPTED)
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Job.objects.all().order_by("-created_at")
+    serializer_class = JobSerializer
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["name","status"]
+
+    @action(detail=True, methods=["post"])
+    def cancel(self, request, pk=None):
+        job = self.get_object()
+        if not Job.objects.filter(pk=job.pk, status="queued").update(status="cancelled", finished_at=timezone.now(), updated_at=timezone.now()):
+            return Response({"detail": "待機中のジョブのみキャンセルできます。"}, status=status.HTTP_409_CONFLICT)
+        job.refresh_from_db()
+        return Response(self.get_serializer(job).data)
+
+    @action(detail=True, methods=["post"])
+    def retry(self, request, pk=None):
+        job = self.get_object()
+        if not Job.objects.filter(pk=job.pk, status__in=["failed","cancelled"]).update(
+            status="queued", attempts=0, error="", run_after=timezone.now(), finished_at=None, updated_at=timezone.now()
+        ):
+            return Response({"detail": "失敗またはキャンセルされたジョブのみ再実行できます。"}, status=status.HTTP_409_CONFLICT)
+        job.refresh_from_db()
+        return Response(self.get_serializer(job).data)
+
+
+router = routers.DefaultRouter()
+router.register(r"jobs", JobViewSet, basename="job")
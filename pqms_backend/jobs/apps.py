@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+class JobsConfig(AppConfig):
+    name = 'jobs'
+
+    def ready(self):
+        # 各アプリの jobs.py に定義されたハンドラを登録する
+        autodiscover_modules("jobs")
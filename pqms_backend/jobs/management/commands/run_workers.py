@@ -0,0 +1,102 @@
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs import registry
+
+
+def _init_worker():
+    # spawn 方式の環境でも子プロセスで Django を使えるようにする
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pqms.settings")
+    django.setup()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the database queue using a local process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=getattr(settings, "JOB_WORKER_CONCURRENCY", 2))
+        parser.add_argument("--poll-interval", type=float, default=getattr(settings, "JOB_POLL_INTERVAL", 1.0))
+        parser.add_argument("--lock-timeout", type=int, default=getattr(settings, "JOB_LOCK_TIMEOUT", 3600))
+        parser.add_argument("--once", action="store_true", help="Drain the currently due jobs and exit.")
+
+    def handle(self, *args, concurrency, poll_interval, lock_timeout, once, **options):
+        owner = registry.worker_id()
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        # 親プロセスの接続を fork 先に持ち込まない
+        connections.close_all()
+        running = {}
+        # well inside lock_timeout, and rare enough not to disturb an online SQLite backup
+        heartbeat_every = lock_timeout / 4
+        last_heartbeat = time.monotonic()
+        self.stdout.write(f"Job worker {owner} started (concurrency={concurrency})")
+        pool = self._pool(concurrency)
+        try:
+            while not self._stopping:
+                done = [f for f in running if f.done()]
+                broken = None
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        self.stdout.write(f"Job {job_id}: {future.result()}")
+                    except Exception as exc:  # the child itself crashed (OOM kill, segfault)
+                        self.stderr.write(f"Job {job_id}: worker error {exc!r}")
+                        # give the job back now instead of waiting for requeue_stale
+                        registry.release([job_id], owner, f"worker process died: {exc!r}")
+                        if isinstance(exc, BrokenProcessPool):
+                            broken = exc
+                if broken:
+                    pool = self._replace(pool, concurrency, running, owner, broken)
+
+                if running and time.monotonic() - last_heartbeat >= heartbeat_every:
+                    registry.heartbeat(list(running.values()), owner)
+                    last_heartbeat = time.monotonic()
+                registry.requeue_stale(lock_timeout)
+                registry.run_schedulers()
+                free = concurrency - len(running)
+                claimed = registry.claim(free, owner) if free > 0 else []
+                for job_id in claimed:
+                    try:
+                        future = pool.submit(registry.run_job, job_id)
+                    except BrokenProcessPool as exc:  # a child died since the last poll
+                        pool = self._replace(pool, concurrency, running, owner, exc)
+                        future = pool.submit(registry.run_job, job_id)
+                    running[future] = job_id
+                connections.close_all()
+
+                if once and not running and not claimed:
+                    break
+                if running:
+                    wait(list(running), timeout=poll_interval, return_when=FIRST_COMPLETED)
+                else:
+                    time.sleep(poll_interval)
+            wait(list(running))
+        finally:
+            pool.shutdown()
+        self.stdout.write(f"Job worker {owner} stopped")
+
+    def _pool(self, concurrency):
+        return ProcessPoolExecutor(max_workers=concurrency, initializer=_init_worker)
+
+    def _replace(self, pool, concurrency, running, owner, exc):
+        """A broken pool fails every job it still has; release them all at once and start a new pool."""
+        self.stderr.write(f"Worker pool broken ({len(running)} job(s) released); starting a new one")
+        pool.shutdown(wait=False, cancel_futures=True)
+        registry.release(list(running.values()), owner, f"worker process died: {exc!r}")
+        running.clear()
+        connections.close_all()
+        return self._pool(concurrency)
+
+    def _stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,40 @@
+from django.db import models
+from django.utils import timezone
+from common.models import TimeStampedModel
+
+class Job(TimeStampedModel):
+    STATUS_CHOICES = [
+        ("queued","待機中"),
+        ("running","実行中"),
+        ("succeeded","成功"),
+        ("failed","失敗"),
+        ("cancelled","キャンセル"),
+    ]
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    progress = models.PositiveSmallIntegerField(default=0)  # 0–100 %
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status","run_after"])]
+
+    def __str__(self): return f"{self.name} #{self.pk} ({self.get_status_display()})"
+
+    def set_progress(self, progress, message=""):
+        """Persist progress from inside a running handler without touching other fields (also a heartbeat)."""
+        self.progress = max(0, min(100, int(progress)))
+        self.progress_message = message[:255]
+        now = timezone.now()
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress, progress_message=self.progress_message, locked_at=now, updated_at=now
+        )
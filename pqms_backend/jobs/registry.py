@@ -0,0 +1,140 @@
+import socket
+import os
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+_handlers = {}
+_schedulers = []
+
+
+def job(name):
+    """Register ``func(job)`` as the handler for jobs called ``name``."""
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def scheduler(func):
+    """Register ``func()`` to be called on every worker poll so it can enqueue periodic jobs."""
+    _schedulers.append(func)
+    return func
+
+
+def get_handler(name):
+    return _handlers.get(name)
+
+
+def enqueue(name, payload=None, *, max_attempts=None, run_after=None):
+    if name not in _handlers:
+        raise KeyError(f"Unknown job: {name}")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        max_attempts=max_attempts or getattr(settings, "JOB_MAX_ATTEMPTS", 3),
+        run_after=run_after or timezone.now(),
+    )
+
+
+def run_schedulers():
+    for func in _schedulers:
+        func()
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(limit, owner):
+    """Atomically move up to ``limit`` due jobs from queued to running and return their ids.
+
+    The conditional UPDATE is the lock, so this works on SQLite without SELECT ... FOR UPDATE.
+    """
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(status="queued", run_after__lte=now)
+        .order_by("run_after","id")
+        .values_list("id", flat=True)[:limit]
+    )
+    claimed = []
+    for job_id in candidates:
+        updated = Job.objects.filter(pk=job_id, status="queued").update(
+            status="running", locked_by=owner, locked_at=now, started_at=now,
+            attempts=F("attempts") + 1, updated_at=now,
+        )
+        if updated:
+            claimed.append(job_id)
+    return claimed
+
+
+def heartbeat(job_ids, owner):
+    """Refresh the lock of jobs this worker is still running, so that ``requeue_stale`` leaves them alone."""
+    now = timezone.now()
+    return Job.objects.filter(pk__in=job_ids, status="running", locked_by=owner).update(locked_at=now, updated_at=now)
+
+
+def requeue_stale(timeout):
+    """Give jobs whose worker died mid-run (no heartbeat for ``timeout``) back to the queue.
+
+    Jobs that have used up their attempts are failed instead of being run once more.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status="running", locked_at__lt=now - timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status="failed", error="worker lost (no heartbeat)", finished_at=now,
+        locked_by="", locked_at=None, updated_at=now,
+    )
+    return failed + stale.update(status="queued", locked_by="", locked_at=None, updated_at=now)
+
+
+def backoff_delay(attempts):
+    base = getattr(settings, "JOB_RETRY_BACKOFF", 10)
+    cap = getattr(settings, "JOB_RETRY_BACKOFF_MAX", 3600)
+    return min(cap, base * 2 ** max(0, attempts - 1))
+
+
+def _retry_or_fail(job_obj, error, retry=True):
+    """Queue the job again after a backoff, or fail it once it is out of attempts; returns the new status."""
+    now = timezone.now()
+    fields = {"error": error, "locked_by": "", "locked_at": None, "updated_at": now}
+    if retry and job_obj.attempts < job_obj.max_attempts:
+        fields.update(status="queued", run_after=now + timedelta(seconds=backoff_delay(job_obj.attempts)))
+    else:
+        fields.update(status="failed", finished_at=now)
+    Job.objects.filter(pk=job_obj.pk, status="running").update(**fields)
+    return fields["status"]
+
+
+def release(job_ids, owner, error):
+    """Jobs of this worker whose process died without reporting back (OOM kill, segfault)."""
+    jobs = Job.objects.filter(pk__in=job_ids, status="running", locked_by=owner).only("pk", "attempts", "max_attempts")
+    return [_retry_or_fail(job_obj, error) for job_obj in jobs]
+
+
+def run_job(job_id):
+    """Execute one claimed job. Runs inside a worker process."""
+    try:
+        job_obj = Job.objects.get(pk=job_id)
+        handler = get_handler(job_obj.name)
+        try:
+            if handler is None:
+                raise KeyError(f"Unknown job: {job_obj.name}")
+            result = handler(job_obj)
+            now = timezone.now()
+            # storing the result can fail too (not JSON-serialisable); that is a failed attempt as well
+            Job.objects.filter(pk=job_id).update(
+                status="succeeded", progress=100, result=result, error="",
+                finished_at=now, locked_by="", locked_at=None, updated_at=now,
+            )
+        except Exception:
+            return _retry_or_fail(job_obj, traceback.format_exc(), retry=handler is not None)
+        return "succeeded"
+    finally:
+        connections.close_all()
@@ -0,0 +1,31 @@
+from django.test import TransactionTestCase
+
+from . import registry
+from .models import Job
+
+
+@registry.job("tests.unserialisable")
+def unserialisable(job):
+    return {"value": object()}
+
+
+class JobFailureTests(TransactionTestCase):
+    def claim(self, name, max_attempts):
+        job = registry.enqueue(name, max_attempts=max_attempts)
+        self.assertEqual(registry.claim(1, "test-worker"), [job.pk])
+        return job
+
+    def test_unstorable_result_fails_the_attempt(self):
+        job = self.claim("tests.unserialisable", max_attempts=1)
+        self.assertEqual(registry.run_job(job.pk), "failed")
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIn("not JSON serializable", job.error)
+
+    def test_released_jobs_are_retried_until_out_of_attempts(self):
+        retried = self.claim("tests.unserialisable", max_attempts=2)
+        spent = self.claim("tests.unserialisable", max_attempts=1)
+        registry.release([retried.pk, spent.pk], "test-worker", "worker process died")
+        statuses = dict(Job.objects.values_list("pk", "status"))
+        self.assertEqual(statuses, {retried.pk: "queued", spent.pk: "failed"})
+        self.assertEqual(set(Job.objects.values_list("error", flat=True)), {"worker process died"})
@@ -1,8 +1,18 @@
 from django.contrib import admin
 from .models import Category, CheckItem, SystemSettings
 
-admin.site.register(Category)
-admin.site.register(CheckItem)
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("id","name","updated_at")
+    search_fields = ("name",)
+
+@admin.register(CheckItem)
+class CheckItemAdmin(admin.ModelAdmin):
+    list_display = ("id","name","type","category","required","updated_at")
+    list_select_related = ("category",)
+    list_filter = ("type","required")
+    search_fields = ("name","tags")
+    autocomplete_fields = ("category",)
 
 @admin.register(SystemSettings)
 class SystemSettingsAdmin(admin.ModelAdmin):
@@ -5,7 +5,10 @@ from rest_framework.response import Response
 from rest_framework import permissions
 from django_filters.rest_framework import DjangoFilterBackend
 
+from common.projection import ProjectedListMixin
+
 from .models import Category, CheckItem, SystemSettings
+from .system import system_settings
 from .serializers import (
     CategorySerializer,
     CheckItemSerializer,
@@ -19,7 +22,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
     search_fields = ["name","description"]
 
-class CheckItemViewSet(viewsets.ModelViewSet):
+class CheckItemViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = CheckItem.objects.select_related("category").all().order_by("-updated_at")
     serializer_class = CheckItemSerializer
     permission_classes = [AllowAny]
@@ -38,8 +41,8 @@ class SystemSettingsView(APIView):
         return obj
 
     def get(self, request, *args, **kwargs):
-        settings_obj = self.get_object()
-        serializer = SystemSettingsSerializer(settings_obj)
+        # 読み取りはプロセス内キャッシュから (master/system.py)
+        serializer = SystemSettingsSerializer(system_settings())
         return Response(serializer.data)
 
     def put(self, request, *args, **kwargs):
@@ -1,2 +1,7 @@
 from django.apps import AppConfig
-class MasterConfig(AppConfig): name = 'master'
+
+class MasterConfig(AppConfig):
+    name = 'master'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,14 @@
+from django.utils.functional import SimpleLazyObject
+
+from .system import system_settings
+
+
+class SystemSettingsMiddleware:
+    """Sets ``request.system_settings`` (a ``SystemConfig``), loaded only if the request uses it."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.system_settings = SimpleLazyObject(system_settings)
+        return self.get_response(request)
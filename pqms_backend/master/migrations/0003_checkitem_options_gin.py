@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from common.db import VendorRunSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("master", "0002_checkitem_allow_handwriting_checkitem_decimal_places_and_more"),
+    ]
+
+    operations = [
+        # Postgres only: GIN index for containment lookups such as options__contains=["NG"].
+        VendorRunSQL(
+            "postgresql",
+            "CREATE INDEX IF NOT EXISTS master_checkitem_options_gin ON master_checkitem USING gin (options jsonb_path_ops)",
+            "DROP INDEX IF EXISTS master_checkitem_options_gin",
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("master", "0003_checkitem_options_gin"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SystemSettings",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "system_name",
+                    models.CharField(default="工程・品質管理システム", max_length=200),
+                ),
+                ("language", models.CharField(default="ja", max_length=10)),
+                ("timezone", models.CharField(default="Asia/Tokyo", max_length=50)),
+                ("date_format", models.CharField(default="YYYY/MM/DD", max_length=20)),
+                ("user_name", models.CharField(default="山田太郎", max_length=100)),
+                (
+                    "email",
+                    models.EmailField(default="yamada@example.com", max_length=254),
+                ),
+                ("role", models.CharField(default="admin", max_length=50)),
+                ("email_notifications", models.BooleanField(default=True)),
+                ("task_notifications", models.BooleanField(default=True)),
+                ("report_notifications", models.BooleanField(default=False)),
+                ("system_alerts", models.BooleanField(default=True)),
+                ("two_factor_auth", models.BooleanField(default=False)),
+                ("session_timeout", models.PositiveIntegerField(default=60)),
+                ("password_expiry", models.PositiveIntegerField(default=90)),
+                ("auto_backup", models.BooleanField(default=True)),
+                (
+                    "backup_frequency",
+                    models.CharField(
+                        choices=[
+                            ("hourly", "Hourly"),
+                            ("daily", "Daily"),
+                            ("weekly", "Weekly"),
+                            ("monthly", "Monthly"),
+                        ],
+                        default="daily",
+                        max_length=20,
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["updated_at"], name="master_cate_updated_2ae593_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="checkitem",
+            index=models.Index(
+                fields=["updated_at"], name="master_chec_updated_264450_idx"
+            ),
+        ),
+    ]
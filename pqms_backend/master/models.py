@@ -5,6 +5,8 @@ from common.models import TimeStampedModel
 class Category(TimeStampedModel):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]  # delta sync
     def __str__(self): return self.name
 
 class CheckItem(TimeStampedModel):
@@ -31,6 +33,8 @@ class CheckItem(TimeStampedModel):
     allow_handwriting = models.BooleanField(default=False)
     # base64 画像 or URL を保存するためのフィールド
     reference_image = models.TextField(blank=True)
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
     def __str__(self): return self.name
 
 
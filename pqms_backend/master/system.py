@@ -0,0 +1,85 @@
+"""Read access to the SystemSettings singleton without a query per request.
+
+``system_settings()`` returns a frozen ``SystemConfig`` kept in process memory. A shared generation
+stamp (``common.stamps``) is bumped whenever the row is saved or deleted, and every process compares
+its copy against the stamp at most every SYSTEM_SETTINGS_CHECK_SECONDS, one cache lookup. A change
+made in one worker is therefore seen by all others within that delay, and by the saving process
+right away. Queryset ``update()`` calls bypass the signals and are not picked up until the next save
+(or restart); change the settings through the API, the admin or ``save()``.
+"""
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+
+from common import stamps
+from .models import SystemSettings
+
+STAMP = "system_settings"
+
+
+@dataclass(frozen=True)
+class SystemConfig:
+    id: int
+    system_name: str
+    language: str
+    timezone: str
+    date_format: str
+    user_name: str
+    email: str
+    role: str
+    email_notifications: bool
+    task_notifications: bool
+    report_notifications: bool
+    system_alerts: bool
+    two_factor_auth: bool
+    session_timeout: int  # minutes
+    password_expiry: int  # days
+    auto_backup: bool
+    backup_frequency: str
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_model(cls, obj):
+        return cls(**{f.name: getattr(obj, f.name) for f in fields(cls)})
+
+
+_cached = None  # (config, stamp, checked at)
+
+
+def load():
+    # the singleton: pk=1, created with the model defaults on first use
+    obj, _ = SystemSettings.objects.get_or_create(pk=1)
+    return SystemConfig.from_model(obj)
+
+
+def system_settings():
+    """The current settings, at most SYSTEM_SETTINGS_CHECK_SECONDS behind changes made elsewhere."""
+    global _cached
+    cached = _cached
+    now = time.monotonic()
+    if cached and now - cached[2] < settings.SYSTEM_SETTINGS_CHECK_SECONDS:
+        return cached[0]
+    (stamp,) = stamps.current(STAMP)
+    # a missing stamp (None) never matches: the change it recorded may have been lost
+    if cached and stamp is not None and cached[1] == stamp:
+        _cached = (cached[0], stamp, now)
+        return cached[0]
+    # the stamp is read before the row: a change committed in between bumps it again
+    config = load()
+    _cached = (config, stamp, now)
+    return config
+
+
+def forget():
+    global _cached
+    _cached = None
+
+
+def changed():
+    """Called when the row changes: other processes via the stamp, this one right away."""
+    stamps.bump(STAMP)
+    transaction.on_commit(forget)
@@ -30,15 +30,23 @@ INSTALLED_APPS = [
     "processes",
     "executions",
     "tasks",
+    "jobs",
+    "backups",
 ]
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "common.compression.CompressionMiddleware",
+    "common.timing.RequestTimingMiddleware",
+    "common.metrics.MetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "common.profiling.ProfilingMiddleware",
+    "common.routing.ReplicaRoutingMiddleware",
+    "master.middleware.SystemSettingsMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -63,13 +71,69 @@ ROOT_URLCONF = "pqms.urls"
 WSGI_APPLICATION = "pqms.wsgi.application"
 ASGI_APPLICATION = "pqms.asgi.application"
 
+# SQLite high-concurrency mode (PQMS_SQLITE_CONCURRENT=1).
+# WAL lets readers run alongside the writer, and BEGIN IMMEDIATE takes the write lock up front so
+# concurrent writers wait up to busy_timeout instead of failing with "database is locked".
+SQLITE_CONCURRENT = os.environ.get("PQMS_SQLITE_CONCURRENT", "0") == "1"
+SQLITE_CONCURRENT_OPTIONS = {
+    "timeout": int(os.environ.get("PQMS_SQLITE_BUSY_TIMEOUT", "20")),  # seconds (busy_timeout)
+    "transaction_mode": "IMMEDIATE",
+    "init_command": ";".join([
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA mmap_size=%d" % int(os.environ.get("PQMS_SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+        "PRAGMA cache_size=-%d" % int(os.environ.get("PQMS_SQLITE_CACHE_KB", 64 * 1024)),
+        "PRAGMA temp_store=MEMORY",
+    ]),
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("PQMS_SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+        "OPTIONS": SQLITE_CONCURRENT_OPTIONS if SQLITE_CONCURRENT else {},
     }
 }
 
+# PostgreSQL (PQMS_DB_ENGINE=postgres). Requires requirements-postgres.txt.
+# PQMS_DB_POOL=1 uses psycopg's connection pool; otherwise connections are kept for CONN_MAX_AGE seconds.
+if os.environ.get("PQMS_DB_ENGINE", "sqlite") == "postgres":
+    DB_POOL = os.environ.get("PQMS_DB_POOL", "1") == "1"
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("POSTGRES_DB", "pqms"),
+        "USER": os.environ.get("POSTGRES_USER", "pqms"),
+        "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+        "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+        "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.environ.get("PQMS_DB_CONN_MAX_AGE", "600")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.environ.get("PQMS_DB_POOL_MIN", "2")),
+                "max_size": int(os.environ.get("PQMS_DB_POOL_MAX", "10")),
+                "timeout": int(os.environ.get("PQMS_DB_POOL_TIMEOUT", "10")),
+            },
+        } if DB_POOL else {},
+    }
+
+# Read replica for reporting/tracking traffic. Set PQMS_REPLICA_SQLITE_PATH (local testing with a second
+# SQLite file) or POSTGRES_REPLICA_HOST; safe reads of the views listed in each viewset's replica_actions
+# are then served from the "replica" alias.
+if os.environ.get("PQMS_REPLICA_SQLITE_PATH") and DATABASES["default"]["ENGINE"].endswith("sqlite3"):
+    DATABASES["replica"] = {**DATABASES["default"], "NAME": os.environ["PQMS_REPLICA_SQLITE_PATH"]}
+elif os.environ.get("POSTGRES_REPLICA_HOST") and DATABASES["default"]["ENGINE"].endswith("postgresql"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["POSTGRES_REPLICA_HOST"],
+        "PORT": os.environ.get("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "NAME": os.environ.get("POSTGRES_REPLICA_DB", DATABASES["default"]["NAME"]),
+    }
+if "replica" in DATABASES:
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["common.routing.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.environ.get("PQMS_REPLICA_STICKY_SECONDS", "5"))
+
 AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
@@ -83,8 +147,18 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "common.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # drf-spectacular's AutoSchema is attached by common.openapi.SchemaGenerator, so that it is not imported at startup
+    "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.inspectors.ViewInspector",
+    "DEFAULT_PAGINATION_CLASS": "common.pagination.CountingPagination",
     "PAGE_SIZE": 20,
 }
 
@@ -93,8 +167,12 @@ SPECTACULAR_SETTINGS = {
     "TITLE": "PQMS API",
     "DESCRIPTION": "Process & Quality Management System API",
     "VERSION": "1.0.0",
+    "DEFAULT_GENERATOR_CLASS": "common.openapi.SchemaGenerator",
 }
 
+# Pre-built OpenAPI schema files (python manage.py build_schema), one per code version
+SCHEMA_DIR = os.environ.get("PQMS_SCHEMA_DIR", str(BASE_DIR / ".schema"))
+
 LANGUAGE_CODE = "ja"
 TIME_ZONE = "Asia/Tokyo"
 USE_I18N = True
@@ -107,10 +185,97 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ["Server-Timing", "X-Query-Count"]
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
 
+# Response compression (brotli when the brotli package is installed, otherwise gzip)
+COMPRESSION_ENABLED = os.environ.get("PQMS_COMPRESSION", "1") == "1"
+COMPRESSION_MIN_BYTES = int(os.environ.get("PQMS_COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 4
+
+# Request instrumentation (Server-Timing / X-Query-Count headers and slow-request log)
+REQUEST_TIMING_ENABLED = os.environ.get("PQMS_REQUEST_TIMING", "0") == "1"
+SLOW_REQUEST_MS = int(os.environ.get("PQMS_SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERIES = int(os.environ.get("PQMS_SLOW_REQUEST_QUERIES", "50"))
+
+# Prometheus /metrics (per-process values are merged through files in METRICS_DIR)
+METRICS_ENABLED = os.environ.get("PQMS_METRICS", "0") == "1"
+METRICS_DIR = Path(os.environ.get("PQMS_METRICS_DIR", BASE_DIR / ".metrics"))
+METRICS_FLUSH_INTERVAL = 1.0  # seconds
+METRICS_TOKEN = os.environ.get("PQMS_METRICS_TOKEN", "")
+
+# Request profiling for staff users (X-Profile: 1 or ?_profile=1, plus random sampling)
+PROFILING_ENABLED = os.environ.get("PQMS_PROFILING", "0") == "1"
+PROFILE_SAMPLE_RATE = float(os.environ.get("PQMS_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = Path(os.environ.get("PQMS_PROFILE_DIR", BASE_DIR / "profiles"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "slow_requests": (
+            {"class": "logging.handlers.WatchedFileHandler", "filename": os.environ["PQMS_SLOW_REQUEST_LOG"]}
+            if os.environ.get("PQMS_SLOW_REQUEST_LOG") else {"class": "logging.StreamHandler"}
+        ),
+    },
+    "loggers": {
+        "pqms.slow_requests": {"handlers": ["slow_requests"], "level": "WARNING", "propagate": False},
+    },
+}
+
+# Shared cache (replica pins, analytics results). File-based so that all worker processes see the
+# same entries; PQMS_CACHE_BACKEND/PQMS_CACHE_LOCATION switch to e.g. Redis.
+CACHE_BACKEND = os.environ.get("PQMS_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache")
+CACHE_LOCATION = os.environ.get("PQMS_CACHE_LOCATION", str(BASE_DIR / ".cache"))
+CACHES = {
+    "default": {"BACKEND": CACHE_BACKEND, "LOCATION": CACHE_LOCATION},
+    # generation stamps (common/stamps.py): kept apart from the default cache so that culling never evicts them
+    "stamps": {"BACKEND": CACHE_BACKEND, "LOCATION": CACHE_LOCATION, "KEY_PREFIX": "stamps", "TIMEOUT": None},
+}
+if CACHE_BACKEND.endswith("FileBasedCache"):
+    CACHES["stamps"].update(LOCATION=os.path.join(CACHE_LOCATION, "stamps"), OPTIONS={"MAX_ENTRIES": 10 ** 9})
+
+# List counts (common/pagination.py): "exact", "cached" or "estimate"; viewsets and ?count= can override
+PAGINATION_COUNT_MODE = os.environ.get("PQMS_PAGINATION_COUNT", "exact")
+PAGINATION_COUNT_CACHE_SECONDS = int(os.environ.get("PQMS_PAGINATION_COUNT_CACHE_SECONDS", "30"))
+PAGINATION_ESTIMATE_THRESHOLD = int(os.environ.get("PQMS_PAGINATION_ESTIMATE_THRESHOLD", "10000"))
+
+# NG Pareto results are cached per parameter set until results in the period change (or this many seconds)
+PARETO_CACHE_SECONDS = int(os.environ.get("PQMS_PARETO_CACHE_SECONDS", "3600"))
+
+# Background jobs (python manage.py run_workers)
+JOB_WORKER_CONCURRENCY = int(os.environ.get("PQMS_JOB_CONCURRENCY", "2"))
+JOB_POLL_INTERVAL = float(os.environ.get("PQMS_JOB_POLL_INTERVAL", "1.0"))
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BACKOFF = 10  # seconds, doubled on every retry
+JOB_RETRY_BACKOFF_MAX = 3600
+JOB_LOCK_TIMEOUT = 3600  # running jobs without a heartbeat for this long are requeued (or failed after max_attempts)
+
+# Each process re-checks its in-memory SystemSettings against the shared stamp this often
+SYSTEM_SETTINGS_CHECK_SECONDS = float(os.environ.get("PQMS_SYSTEM_SETTINGS_CHECK_SECONDS", "5"))
+
+# Online backups (backups/engine.py), scheduled from SystemSettings.auto_backup/backup_frequency
+BACKUP_DIR = os.environ.get("PQMS_BACKUP_DIR", str(BASE_DIR / ".backups"))
+BACKUP_RETENTION = int(os.environ.get("PQMS_BACKUP_RETENTION", "7"))  # successful backups kept
+BACKUP_WINDOW = os.environ.get("PQMS_BACKUP_WINDOW", "22-6")  # local hours scheduled runs may start in; "" = any time
+BACKUP_SQLITE_PAGES = int(os.environ.get("PQMS_BACKUP_SQLITE_PAGES", "256"))  # pages copied per step
+BACKUP_STEP_SLEEP = float(os.environ.get("PQMS_BACKUP_STEP_SLEEP", "0.05"))  # seconds between steps
+BACKUP_MAX_RESTARTS = 3  # then the SQLite copy is finished in one step
+BACKUP_GZIP_LEVEL = int(os.environ.get("PQMS_BACKUP_GZIP_LEVEL", "6"))
+
+# Deletion log kept for master-data delta sync; older tokens get a full resync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("PQMS_SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
+# Upper bound on process sheets returned by one /api/trace/ request
+TRACE_MAX_SHEETS = int(os.environ.get("PQMS_TRACE_MAX_SHEETS", "500"))
+
+# Approved executions untouched for this many days are moved to ExecutionArchive
+EXECUTION_ARCHIVE_AFTER_DAYS = int(os.environ.get("PQMS_ARCHIVE_AFTER_DAYS", "365"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
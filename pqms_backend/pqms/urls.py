@@ -4,7 +4,6 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework import routers
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 from accounts.api import router as accounts_router
 from master.api import router as master_router, SystemSettingsView
@@ -12,17 +11,24 @@ from checklists.api import router as checklists_router
 from processes.api import router as processes_router
 from executions.api import router as executions_router
 from tasks.api import router as tasks_router
+from common.metrics import metrics_view
+from common.schema import docs_view, schema_view
+from common.sync import MasterSyncView
+from jobs.api import router as jobs_router
+from backups.api import router as backups_router
 
 router = routers.DefaultRouter()
-for r in [accounts_router, master_router, checklists_router, processes_router, executions_router, tasks_router]:
+for r in [accounts_router, master_router, checklists_router, processes_router, executions_router, tasks_router, jobs_router, backups_router]:
     for prefix, viewset, basename in getattr(r, 'registry', []):
         router.register(prefix, viewset, basename=basename)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema')),
+    path('metrics', metrics_view, name='metrics'),
+    path('api/schema/', schema_view, name='schema'),
+    path('api/docs/', docs_view),
     path('api/', include(router.urls)),
     path('api/auth/', include('accounts.auth_urls')),
     path('api/system-settings/', SystemSettingsView.as_view(), name='system-settings'),
+    path('api/sync/master/', MasterSyncView.as_view(), name='master-sync'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -8,4 +8,5 @@ class ProcessSheetAdmin(admin.ModelAdmin):
         "assignee", "status", "progress", "planned_end"
     )
     list_filter = ("status", "priority")
+    raw_id_fields = ("checklist",)
     search_fields = ("name", "project_name", "lot_number", "inspector", "assignee")
@@ -1,27 +1,49 @@
 # processes/api.py
-from rest_framework import viewsets, routers
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import viewsets, routers, status
 from rest_framework.permissions import AllowAny
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import ProcessSheet
-from .serializers import ProcessSheetSerializer
+from .progress import completed_items, recompute, touch
+from .serializers import ProcessSheetSerializer, ProcessSheetBulkUpdateSerializer, ProcessSheetBulkCreateSerializer
 from executions.models import Execution  # NEW
 
 class ProcessSheetViewSet(viewsets.ModelViewSet):
     queryset = (
         ProcessSheet.objects
-        .select_related("checklist")
+        .select_related("checklist__category")
+        .prefetch_related("checklist__items__check_item__category")
         .all()
         .order_by("-updated_at")
     )
     serializer_class = ProcessSheetSerializer
+    replica_actions = {"list", "progress"}
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["status", "assignee", "priority", "checklist"]
     search_fields = ["name", "project_name", "notes", "assignee"]
 
+    # progress and status are recomputed on save; answer with the stored values, not the request's
+    def perform_create(self, serializer):
+        self._save_derived(serializer)
+
+    def perform_update(self, serializer):
+        self._save_derived(serializer)
+
+    def _save_derived(self, serializer):
+        sheet = serializer.save()
+        recompute([sheet.pk])
+        sheet.refresh_from_db(fields=["status", "progress", "updated_at"])
+
+    def get_queryset(self):
+        if self.action == "progress":
+            return ProcessSheet.objects.select_related("checklist")
+        return super().get_queryset()
+
     # NEW: project-level progress (combined view)
     @action(detail=True, methods=["get"])
     def progress(self, request, pk=None):
@@ -30,20 +52,19 @@ class ProcessSheetViewSet(viewsets.ModelViewSet):
 
         total_items = checklist.items.count() if checklist else 0
 
-        # all executions linked to this process sheet
+        # all executions linked to this process sheet, with finished items (anything that
+        # is not SKIP or PENDING, archived ones included) counted in the same query
         executions = (
             Execution.objects
             .filter(process_sheet=process_sheet)
-            .prefetch_related("item_results__photos")
+            .annotate(completed=completed_items())
         )
 
         execution_summaries = []
         max_progress = 0
 
         for exe in executions:
-            results = exe.item_results.all()
-            # count finished items (anything that is not SKIP)
-            completed = results.exclude(status="SKIP").count()
+            completed = exe.completed
             progress = int(completed * 100 / total_items) if total_items else 0
             max_progress = max(max_progress, progress)
 
@@ -70,6 +91,37 @@ class ProcessSheetViewSet(viewsets.ModelViewSet):
             }
         )
 
+    # Compact rows returned by the bulk actions (no nested checklist).
+    BULK_FIELDS = ["id", "name", "lot_number", "status", "priority", "assignee", "planned_start", "planned_end", "progress", "updated_at"]
+
+    # Apply the same changes to many sheets in one UPDATE ... WHERE id IN (...).
+    @action(detail=False, methods=["post"], url_path="bulk-update")
+    def bulk_update(self, request):
+        serializer = ProcessSheetBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = set(serializer.validated_data["ids"])
+        changes = serializer.validated_data["changes"]
+        with transaction.atomic():
+            sheets = ProcessSheet.objects.filter(pk__in=ids)
+            found = set(sheets.values_list("pk", flat=True))
+            updated = sheets.update(**changes, updated_at=timezone.now())
+            # sheets with executions get their derived status back; the rows below show what is stored
+            if "status" in changes:
+                recompute(found)
+        rows = ProcessSheet.objects.filter(pk__in=found).order_by("pk").values(*self.BULK_FIELDS)
+        return Response({"updated": updated, "missing": sorted(ids - found), "results": list(rows)})
+
+    # Create many sheets at once, e.g. one per lot number: {"defaults": {...}, "lot_numbers": [...]}.
+    @action(detail=False, methods=["post"], url_path="bulk-create")
+    def bulk_create(self, request):
+        serializer = ProcessSheetBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            sheets = ProcessSheet.objects.bulk_create(ProcessSheet(**row) for row in serializer.validated_data)
+            touch(sheet_ids=[sheet.pk for sheet in sheets])
+        rows = ProcessSheet.objects.filter(pk__in=[s.pk for s in sheets]).order_by("pk").values(*self.BULK_FIELDS)
+        return Response({"created": len(sheets), "results": list(rows)}, status=status.HTTP_201_CREATED)
+
 
 router = routers.DefaultRouter()
 router.register(r"process-sheets", ProcessSheetViewSet, basename="processsheet")
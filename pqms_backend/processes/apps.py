@@ -1,2 +1,7 @@
 from django.apps import AppConfig
-class ProcessesConfig(AppConfig): name = 'processes'
+
+class ProcessesConfig(AppConfig):
+    name = 'processes'
+
+    def ready(self):
+        from . import signals  # noqa: F401
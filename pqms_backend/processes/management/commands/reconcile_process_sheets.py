@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from processes.models import ProcessSheet
+from processes.progress import derive, derived, recompute
+
+
+class Command(BaseCommand):
+    help = "Recompute ProcessSheet.progress and status from executions and report the sheets that had drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="only list the sheets that differ")
+
+    def handle(self, *args, chunk_size, dry_run, **options):
+        ids = list(ProcessSheet.objects.order_by("pk").values_list("pk", flat=True))
+        drifted = 0
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            if not dry_run:
+                drifted += recompute(chunk)
+                continue
+            for sheet in derived(ProcessSheet.objects.filter(pk__in=chunk)):
+                progress, status = derive(sheet)
+                if (progress, status) != (sheet.progress, sheet.status):
+                    drifted += 1
+                    self.stdout.write(f"{sheet.pk}: {sheet.status}/{sheet.progress}% -> {status}/{progress}%")
+        verb = "differ" if dry_run else "updated"
+        self.stdout.write(f"{drifted} of {len(ids)} process sheets {verb}")
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("checklists", "0003_checklist_checklists__updated_4e4efa_idx_and_more"),
+        ("processes", "0002_processsheet_inspector_processsheet_lot_number_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="processsheet",
+            index=models.Index(
+                fields=["updated_at"], name="processes_p_updated_96b522_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("processes", "0003_processsheet_processes_p_updated_96b522_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="processsheet",
+            name="lot_number",
+            field=models.CharField(
+                blank=True, db_index=True, default="", max_length=255
+            ),
+        ),
+    ]
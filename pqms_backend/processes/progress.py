@@ -0,0 +1,112 @@
+"""ProcessSheet.progress and ProcessSheet.status derived from the sheet's executions.
+
+Execution and item-result writes call ``touch()`` (from signals, or explicitly after bulk writes).
+Touched sheets are collected per transaction and refreshed once it commits: one aggregate query
+for all of them and one UPDATE per distinct new value among the sheets that actually changed.
+
+- progress: the best execution's completed (not SKIP or PENDING) items over the checklist's item count, the
+  same figure as ``project_progress`` of ``/api/process-sheets/{id}/progress/``
+- status: ``done`` once an execution is approved, ``running`` once an execution has left draft or
+  has results, ``preparing`` while executions exist only as drafts; a sheet without executions
+  keeps whatever status was set by hand (kanban moves)
+"""
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from checklists.models import ChecklistItem
+from executions.models import Execution, ExecutionItemResult
+from .models import ProcessSheet
+
+
+def completed_items():
+    """Per-execution count of completed items, including those moved to the archive."""
+    return (
+        Count("item_results", filter=~Q(item_results__status__in=ExecutionItemResult.NOT_COMPLETED))
+        + Coalesce(F("archive__item_count") - F("archive__skip_count") - F("archive__pending_count"), 0)
+    )
+
+
+def _pending():
+    connection = transaction.get_connection()
+    if not hasattr(connection, "_pqms_sheet_refresh"):
+        connection._pqms_sheet_refresh = {"sheets": set(), "executions": set(), "checklists": set()}
+    return connection._pqms_sheet_refresh
+
+
+def touch(sheet_ids=(), execution_ids=(), checklist_ids=()):
+    """Refresh the sheets affected by a change once the current transaction commits."""
+    pending = _pending()
+    pending["sheets"].update(i for i in sheet_ids if i)
+    pending["executions"].update(i for i in execution_ids if i)
+    pending["checklists"].update(i for i in checklist_ids if i)
+    # one callback per call; the first one to run takes everything that is pending
+    transaction.on_commit(_flush)
+
+
+def _flush():
+    pending = _pending()
+    sheets, executions, checklists = pending["sheets"], pending["executions"], pending["checklists"]
+    if not (sheets or executions or checklists):
+        return
+    pending.update(sheets=set(), executions=set(), checklists=set())
+    if executions:
+        sheets |= set(Execution.objects.filter(pk__in=executions).values_list("process_sheet_id", flat=True))
+    if checklists:
+        sheets |= set(ProcessSheet.objects.filter(checklist_id__in=checklists).values_list("pk", flat=True))
+    sheets.discard(None)
+    if sheets:
+        recompute(sheets)
+
+
+def derived(queryset):
+    """Annotate ``queryset`` with everything needed to derive progress and status."""
+    executions = Execution.objects.filter(process_sheet=OuterRef("pk"))
+    best = executions.annotate(completed=completed_items()).order_by("-completed").values("completed")[:1]
+    total = (
+        ChecklistItem.objects.filter(checklist=OuterRef("checklist"))
+        .order_by().values("checklist").annotate(n=Count("pk")).values("n")
+    )
+    return queryset.annotate(
+        total_items=Coalesce(Subquery(total), 0),
+        best_completed=Coalesce(Subquery(best), 0),
+        has_executions=Exists(executions),
+        has_final=Exists(executions.filter(status__in=Execution.FINAL_STATUSES)),
+        has_started=Exists(executions.exclude(status="draft")),
+    )
+
+
+def derive(sheet):
+    progress = min(100, sheet.best_completed * 100 // sheet.total_items) if sheet.total_items else 0
+    if sheet.has_final:
+        status = "done"
+    elif sheet.has_started or sheet.best_completed:
+        status = "running"
+    elif sheet.has_executions:
+        status = "preparing"
+    else:
+        status = sheet.status
+    return progress, status
+
+
+def derived_status(sheet_id):
+    """The status the sheet's executions imply, or None when it has none (status is set by hand)."""
+    sheet = derived(ProcessSheet.objects.filter(pk=sheet_id).only("pk", "status", "progress", "checklist")).first()
+    if sheet is None or not sheet.has_executions:
+        return None
+    return derive(sheet)[1]
+
+
+def recompute(sheet_ids):
+    """Bring the given sheets in line with their executions; returns the number of sheets changed."""
+    # one UPDATE per distinct (progress, status), so bulk changes stay a handful of queries
+    changes = {}
+    for sheet in derived(ProcessSheet.objects.filter(pk__in=list(sheet_ids)).only("pk", "status", "progress", "checklist")):
+        values = derive(sheet)
+        if values != (sheet.progress, sheet.status):
+            changes.setdefault(values, []).append(sheet.pk)
+    now = timezone.now()
+    for (progress, status), ids in changes.items():
+        ProcessSheet.objects.filter(pk__in=ids).update(progress=progress, status=status, updated_at=now)
+    return sum(len(ids) for ids in changes.values())
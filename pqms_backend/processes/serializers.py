@@ -1,6 +1,7 @@
 
 from rest_framework import serializers
 from .models import ProcessSheet
+from .progress import derived_status
 from checklists.serializers import ChecklistSerializer
 from checklists.models import Checklist
 
@@ -11,3 +12,63 @@ class ProcessSheetSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProcessSheet
         fields = ["id","name","project_name","status","status_display","priority","assignee","planned_start","planned_end","checklist","checklist_id","notes", "lot_number", "inspector", "progress","created_at","updated_at"]
+        # derived from the sheet's executions (processes/progress.py)
+        read_only_fields = ["progress"]
+
+    def validate_status(self, value):
+        # once a sheet has executions its status follows them; a different value would be overwritten
+        if self.instance is not None and value != self.instance.status:
+            current = derived_status(self.instance.pk)
+            if current is not None and value != current:
+                raise serializers.ValidationError(
+                    f"実行のある工程シートのステータスは実行状況から決まります（現在: {current}）。")
+        return value
+
+
+# Bulk endpoints (kanban moves, re-planning many lots at once)
+BULK_LIMIT = 1000
+
+class ProcessSheetBulkChangesSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=ProcessSheet.STATUS_CHOICES, required=False)
+    priority = serializers.IntegerField(required=False)
+    assignee = serializers.CharField(max_length=100, allow_blank=True, required=False)
+    planned_start = serializers.DateField(allow_null=True, required=False)
+    planned_end = serializers.DateField(allow_null=True, required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("変更する項目を指定してください。")
+        return attrs
+
+class ProcessSheetBulkUpdateSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=BULK_LIMIT)
+    changes = ProcessSheetBulkChangesSerializer()
+
+class ProcessSheetBulkItemSerializer(serializers.ModelSerializer):
+    checklist_id = serializers.IntegerField(allow_null=True, required=False)
+    class Meta:
+        model = ProcessSheet
+        fields = ["name","project_name","status","priority","assignee","planned_start","planned_end","checklist_id","notes","lot_number","inspector"]
+        extra_kwargs = {"name": {"required": False}}
+
+class ProcessSheetBulkCreateSerializer(serializers.Serializer):
+    defaults = ProcessSheetBulkItemSerializer(required=False)
+    items = ProcessSheetBulkItemSerializer(many=True, required=False, max_length=BULK_LIMIT)
+    # shortcut: one sheet per lot number, everything else from defaults
+    lot_numbers = serializers.ListField(child=serializers.CharField(max_length=255), required=False, max_length=BULK_LIMIT)
+
+    def validate(self, attrs):
+        defaults = attrs.get("defaults", {})
+        items = attrs.get("items", []) + [{"lot_number": lot} for lot in attrs.get("lot_numbers", [])]
+        if not items:
+            raise serializers.ValidationError("items または lot_numbers を指定してください。")
+        if len(items) > BULK_LIMIT:
+            raise serializers.ValidationError(f"一度に作成できるのは {BULK_LIMIT} 件までです。")
+        rows = [{**defaults, **item} for item in items]
+        if any(not row.get("name") for row in rows):
+            raise serializers.ValidationError({"name": "name は defaults か各項目で必須です。"})
+        checklist_ids = {row["checklist_id"] for row in rows if row.get("checklist_id")}
+        unknown = checklist_ids - set(Checklist.objects.filter(id__in=checklist_ids).values_list("id", flat=True))
+        if unknown:
+            raise serializers.ValidationError({"checklist_id": f"チェックリストが存在しません: {sorted(unknown)}"})
+        return rows
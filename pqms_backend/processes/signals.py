@@ -0,0 +1,43 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from checklists.models import ChecklistItem
+from executions.models import Execution, ExecutionItemResult
+from .models import ProcessSheet
+from .progress import touch
+
+
+@receiver(post_init, sender=Execution)
+def remember_sheet(sender, instance, **kwargs):
+    instance._initial_sheet = instance.__dict__.get("process_sheet_id")
+
+
+@receiver(post_save, sender=Execution)
+def execution_saved(sender, instance, **kwargs):
+    # an execution moved to another sheet changes both sheets
+    touch(sheet_ids=[instance.process_sheet_id, instance._initial_sheet])
+    instance._initial_sheet = instance.process_sheet_id
+
+
+@receiver(post_delete, sender=Execution)
+def execution_deleted(sender, instance, **kwargs):
+    touch(sheet_ids=[instance.process_sheet_id])
+
+
+@receiver(post_save, sender=ExecutionItemResult)
+@receiver(post_delete, sender=ExecutionItemResult)
+def item_result_changed(sender, instance, **kwargs):
+    touch(execution_ids=[instance.execution_id])
+
+
+@receiver(post_save, sender=ChecklistItem)
+@receiver(post_delete, sender=ChecklistItem)
+def checklist_item_changed(sender, instance, **kwargs):
+    # the item count of the checklist is the denominator of progress
+    touch(checklist_ids=[instance.checklist_id])
+
+
+@receiver(post_save, sender=ProcessSheet)
+def sheet_saved(sender, instance, **kwargs):
+    # a sheet's own progress follows its checklist; status only follows executions once there are any
+    touch(sheet_ids=[instance.pk])
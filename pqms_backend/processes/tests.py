@@ -0,0 +1,84 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from checklists.models import Checklist
+from executions.models import Execution
+from .models import ProcessSheet
+
+
+class DerivedStatusTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.checklist = Checklist.objects.create(name="外観検査")
+        self.sheet = ProcessSheet.objects.create(name="工程A", checklist=self.checklist)
+
+    def patch_status(self, status):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.patch(f"/api/process-sheets/{self.sheet.pk}/", {"status": status}, format="json")
+
+    def test_status_set_by_hand_sticks_without_executions(self):
+        response = self.patch_status("done")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "done")
+        self.sheet.refresh_from_db()
+        self.assertEqual(self.sheet.status, "done")
+
+    def test_status_follows_executions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Execution.objects.create(process_sheet=self.sheet, checklist=self.checklist)
+        self.sheet.refresh_from_db()
+        self.assertEqual(self.sheet.status, "preparing")
+
+        response = self.patch_status("done")
+        self.assertEqual(response.status_code, 400)
+        self.sheet.refresh_from_db()
+        self.assertEqual(self.sheet.status, "preparing")
+
+    def test_bulk_update_returns_stored_status(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Execution.objects.create(process_sheet=self.sheet, checklist=self.checklist)
+        idle = ProcessSheet.objects.create(name="工程B")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/process-sheets/bulk-update/", {
+                "ids": [self.sheet.pk, idle.pk, 0], "changes": {"status": "running"},
+            }, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["missing"], [0])
+        stored = dict(ProcessSheet.objects.values_list("pk", "status"))
+        self.assertEqual(stored, {self.sheet.pk: "preparing", idle.pk: "running"})
+        self.assertEqual({row["id"]: row["status"] for row in response.data["results"]}, stored)
+
+
+class BulkTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_bulk_update_applies_to_found_sheets_and_lists_missing_ids(self):
+        sheets = [ProcessSheet.objects.create(name=f"工程{n}") for n in range(3)]
+        ids = [sheets[0].pk, sheets[2].pk, 9999, 9998]
+        response = self.client.post("/api/process-sheets/bulk-update/", {
+            "ids": ids, "changes": {"assignee": "田中", "priority": 1},
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(response.data["missing"], [9998, 9999])
+        self.assertEqual(
+            dict(ProcessSheet.objects.values_list("pk", "assignee")),
+            {sheets[0].pk: "田中", sheets[1].pk: "", sheets[2].pk: "田中"},
+        )
+
+    def test_bulk_create_checks_every_row_before_inserting(self):
+        checklist = Checklist.objects.create(name="外観検査")
+        response = self.client.post("/api/process-sheets/bulk-create/", {
+            "defaults": {"name": "ロット検査", "checklist_id": checklist.pk},
+            "items": [{"lot_number": "L-2", "checklist_id": 9999}],
+            "lot_numbers": ["L-1"],
+        }, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ProcessSheet.objects.exists())
+
+        response = self.client.post("/api/process-sheets/bulk-create/", {
+            "defaults": {"name": "ロット検査", "checklist_id": checklist.pk}, "lot_numbers": ["L-1", "L-2"],
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row["lot_number"] for row in response.data["results"]], ["L-1", "L-2"])
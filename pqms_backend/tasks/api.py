@@ -2,12 +2,14 @@
 from rest_framework import viewsets, routers
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
+from common.projection import ProjectedListMixin
 from .models import Task
 from .serializers import TaskSerializer
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Task.objects.all().order_by("-updated_at")
     serializer_class = TaskSerializer
+    replica_actions = {"list"}
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["status","priority","assignee"]
@@ -22,7 +22,7 @@ import type {
   ChecklistItem as BackendChecklistItem,
   CheckItem as BackendCheckItem,
   Execution,
-  ItemStatusCode,
+  WritableItemStatusCode,
 } from "../types/backend";
 
 interface ExecutionCheckItem {
@@ -267,7 +267,7 @@ export function CheckSheetExecution({
   const inferItemStatus = (
     item: ExecutionCheckItem,
     value: any
-  ): ItemStatusCode => {
+  ): WritableItemStatusCode => {
     if (value === undefined || value === null || value === "") return "SKIP";
     if (item.type === "select") {
       if (value === "良好") return "OK";
@@ -347,12 +347,32 @@ export function CheckSheetExecution({
     }
   };
 
+  // Save the item just answered, so work survives a reload before the final save.
+  // Failures are only logged: saveAllResults writes every item again at the end.
+  const autosaveItem = (item: ExecutionCheckItem) => {
+    if (!execution) return;
+    const value = responses[item.id];
+    api
+      .patch(`/executions/${execution.id}/autosave/`, {
+        items: [
+          {
+            checklist_item_id: item.checklistItemId,
+            value: value != null ? String(value) : "",
+            note: comments[item.id] ?? "",
+            status: inferItemStatus(item, value),
+          },
+        ],
+      })
+      .catch((err) => console.error(err));
+  };
+
   // ------------------------------
   // Navigation
   // ------------------------------
   const handleNext = async () => {
     if (!currentItem) return;
     if (currentIndex < checkItems.length - 1) {
+      autosaveItem(currentItem);
       setCurrentIndex((prev) => prev + 1);
     } else {
       // last item -> save all & go to result confirmation
@@ -123,9 +123,9 @@ export function Dashboard({ onNavigate }: DashboardProps) {
         (p) => p.status !== "done"
       ).length;
 
-      // items needing attention = NG or SKIP
+      // items needing attention = NG, SKIP or not entered yet (PENDING)
       const alertItemCount = itemResultsData.filter(
-        (i) => i.status === "NG" || i.status === "SKIP"
+        (i) => i.status === "NG" || i.status === "SKIP" || i.status === "PENDING"
       ).length;
 
       // weekly counts (last 7 weeks, simple)
@@ -134,29 +134,33 @@ export function ExecutionResultConfirmation({
     okCount,
     ngCount,
     skipCount,
+    pendingCount,
     overallResultLabel,
     finalResultCode,
   } = useMemo(() => {
     let ok = 0;
     let ng = 0;
     let skip = 0;
+    let pending = 0;
 
     itemResults.forEach((r) => {
       if (r.status === "OK") ok += 1;
       else if (r.status === "NG") ng += 1;
       else if (r.status === "SKIP") skip += 1;
+      else if (r.status === "PENDING") pending += 1;
     });
 
     const label = mapExecutionResultToLabel(execution?.result ?? null, ng > 0);
 
-    // Decide what to write to Execution.result
+    // Decide what to write to Execution.result (same rule as the backend re-judge)
     const code: ExecutionResultCode =
-      ng > 0 ? "fail" : skip > 0 ? "warn" : "pass";
+      ng > 0 ? "fail" : skip + pending > 0 ? "warn" : "pass";
 
     return {
       okCount: ok,
       ngCount: ng,
       skipCount: skip,
+      pendingCount: pending,
       overallResultLabel: label,
       finalResultCode: code,
     };
@@ -202,6 +206,9 @@ export function ExecutionResultConfirmation({
         </>
       );
     }
+    if (status === "PENDING") {
+      return <span className="text-sm text-gray-600">未入力</span>;
+    }
     // SKIP
     return <span className="text-sm text-gray-600">スキップ</span>;
   };
@@ -326,6 +333,7 @@ export function ExecutionResultConfirmation({
                   <span className="text-gray-600 w-32">OK項目:</span>
                   <span className="text-gray-900">
                     {okCount}件 / NG項目: {ngCount}件 / スキップ: {skipCount}件
+                    {pendingCount > 0 && <> / 未入力: {pendingCount}件</>}
                   </span>
                 </div>
               </div>
@@ -19,7 +19,7 @@ interface ExecutionTrackingProps {
 interface ExecutionItemProgress {
   item_id: number;
   item_name: string;
-  status: "OK" | "NG" | "SKIP" | string;
+  status: "OK" | "NG" | "SKIP" | "PENDING" | string;
   photos: string[];
 }
 
@@ -76,12 +76,11 @@ export function ExecutionTracking({ executionId, onBack }: ExecutionTrackingProp
     );
   }
 
-  const completedItems = data.results.filter(
-    (r) => r.status !== "SKIP"
-  );
-  const remainingItems = data.results.filter(
-    (r) => r.status === "SKIP"
-  );
+  // SKIP and PENDING (prepared but not entered yet) are not completed
+  const isRemaining = (r: ExecutionItemProgress) =>
+    r.status === "SKIP" || r.status === "PENDING";
+  const completedItems = data.results.filter((r) => !isRemaining(r));
+  const remainingItems = data.results.filter(isRemaining);
 
   return (
     <div className="p-8 space-y-8">
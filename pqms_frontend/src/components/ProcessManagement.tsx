@@ -285,21 +285,30 @@ export function ProcessManagement({ onTrackProcess }: ProcessManagementProps) {
   }, []);
 
   const handleDrop = async (itemId: number, newStatus: KanbanStatus) => {
-    // optimistic UI update (only status; progress could be managed elsewhere)
-    setProcessSheets((prevSheets) =>
-      prevSheets.map((sheet) =>
-        sheet.id === itemId ? { ...sheet, status: newStatus } : sheet
-      )
-    );
+    const setStatus = (status: KanbanStatus, progress?: number) =>
+      setProcessSheets((prevSheets) =>
+        prevSheets.map((sheet) =>
+          sheet.id === itemId
+            ? { ...sheet, status, progress: progress ?? sheet.progress }
+            : sheet
+        )
+      );
+    const previous = processSheets.find((sheet) => sheet.id === itemId)?.status;
+
+    // optimistic UI update; the response carries the status the backend kept
+    setStatus(newStatus);
 
     try {
       const backendStatus = kanbanToBackendStatus(newStatus);
-      await api.patch(`/process-sheets/${itemId}/`, {
+      const res = await api.patch<BackendProcessSheet>(`/process-sheets/${itemId}/`, {
         status: backendStatus,
       });
+      setStatus(backendToKanbanStatus(res.data.status), res.data.progress);
     } catch (err) {
       console.error(err);
-      setError("ステータス更新に失敗しました。");
+      // refused (sheets with executions follow them) or failed: show what is stored
+      if (previous) setStatus(previous);
+      setError("ステータス更新に失敗しました。実行のある工程シートのステータスは実行状況から決まります。");
     }
   };
   
@@ -122,7 +122,11 @@ export interface ProcessSheet {
   updated_at: string;
 }
 
-export type ItemStatusCode = "OK" | "NG" | "SKIP";
+// PENDING: created by the shift-start batch (/executions/prepare/) and not yet entered
+export type ItemStatusCode = "OK" | "NG" | "SKIP" | "PENDING";
+
+// statuses a client may write (the backend rejects PENDING)
+export type WritableItemStatusCode = Exclude<ItemStatusCode, "PENDING">;
 
 export interface ExecutionItemResult {
   id: number;